@@ -0,0 +1,81 @@
+"""Memory held per Finding, measured on findings built the way the tool parsers build them.
+
+    PYTHONPATH=src python benchmarks/memory.py --findings 100000
+
+Prints a JSON object; bytes_per_finding is the traced heap growth divided by the number of
+findings still alive, so it covers the Finding, Entity, Identifier and Evidence objects, their
+lists and every string they own.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from openfootprint.core.correlate import Correlator
+from openfootprint.sources.tools.maigret import parse_maigret_json
+
+
+def _maigret_report(path: Path, sites: int) -> None:
+    payload = {
+        f"Site{index}": {"status": {"url": f"https://site{index}.example/alice", "status": "Claimed"}}
+        for index in range(sites)
+    }
+    path.write_text(json.dumps(payload), encoding="utf-8")
+
+
+def measure(findings: int, subjects: int = 1, correlate: bool = False) -> dict:
+    """Parse `subjects` maigret reports of `findings // subjects` sites each and keep every finding alive."""
+    per_subject = max(1, findings // subjects)
+    with tempfile.TemporaryDirectory() as tmp:
+        report = Path(tmp) / "maigret.json"
+        _maigret_report(report, per_subject)
+        gc.collect()
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+        started = time.perf_counter()
+        kept = []
+        for _subject in range(subjects):
+            kept.extend(parse_maigret_json(report, "alice", "maigret"))
+        elapsed = time.perf_counter() - started
+        entities = None
+        if correlate:
+            correlator = Correlator()
+            correlator.extend(kept)
+            entities = len(correlator.entities())
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    held = current - baseline
+    result = {
+        "findings": len(kept),
+        "subjects": subjects,
+        "held_bytes": held,
+        "peak_bytes": peak - baseline,
+        "bytes_per_finding": round(held / max(1, len(kept)), 1),
+        "parse_seconds": round(elapsed, 3),
+        "python": sys.version.split()[0],
+    }
+    if entities is not None:
+        result["entities"] = entities
+    return result
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--findings", type=int, default=100_000)
+    parser.add_argument("--subjects", type=int, default=10)
+    parser.add_argument("--correlate", action="store_true", help="Also hold a Correlator over the findings")
+    args = parser.parse_args(argv)
+    print(json.dumps(measure(args.findings, args.subjects, args.correlate), indent=2, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
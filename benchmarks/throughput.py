@@ -0,0 +1,320 @@
+"""End-to-end throughput benchmarks against the local stub web farm, with no outside network.
+
+    PYTHONPATH=src python benchmarks/throughput.py --output results.json
+    PYTHONPATH=src python benchmarks/throughput.py --baseline results.json   # exit 1 on regression
+
+Scenarios:
+  lookup       run_lookup for each subject, each building its own context like the CLI does
+  batch        run_batch over the same subjects, sharing one warm context
+  whatsmyname  whatsmyname_runner.run over a generated site list
+
+Each scenario runs in a fresh process and reports requests/sec, fetch latency percentiles,
+CPU time and peak RSS of that process; the farm runs in a process of its own.
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import json
+import multiprocessing
+import platform
+import resource
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from webfarm import FarmSpec, WebFarm
+
+# Metric -> +1 when bigger is better, -1 when smaller is better.
+DIRECTIONS = {
+    "requests_per_second": 1,
+    "latency_ms.p50": -1,
+    "latency_ms.p95": -1,
+    "latency_ms.p99": -1,
+    "cpu_seconds": -1,
+    "cpu_ms_per_request": -1,
+    "peak_rss_mb": -1,
+}
+
+
+def percentile(values: list[float], share: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = share * (len(ordered) - 1)
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+class Recorder:
+    """Counts HTTP requests reaching the farm and times each fetch made by the code under test."""
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.latencies: list[float] = []
+        self.lock = threading.Lock()
+
+    def timed(self, func):
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - started
+                with self.lock:
+                    self.latencies.append(elapsed)
+
+        return wrapper
+
+    def counted(self, adapter):
+        send = adapter.send
+
+        def wrapper(request, **kwargs):
+            with self.lock:
+                self.requests += 1
+            return send(request, **kwargs)
+
+        adapter.send = wrapper
+        return adapter
+
+
+def _farm_registry(hosts: int):
+    from openfootprint.sources.helpers import make_html_profile_source
+    from openfootprint.sources.registry import SourceRegistry
+
+    return SourceRegistry(
+        [
+            make_html_profile_source(
+                f"farm{index}", f"Farm {index}", "benchmark", f"https://site{index}.farm.test/{{username}}"
+            )
+            for index in range(hosts)
+        ]
+    )
+
+
+def _config(runs_dir: Path, params: dict) -> dict:
+    from openfootprint.core.config import DEFAULT_CONFIG
+
+    config = copy.deepcopy(DEFAULT_CONFIG)
+    config["output"]["runs_dir"] = str(runs_dir)
+    # Measure the pipeline, not politeness sleeps or cache hits.
+    config["rate_limit"]["min_interval_seconds"] = 0
+    config["cache"]["enabled"] = False
+    config["robots"]["persist"] = False
+    config["concurrency"]["max_workers"] = params["workers"]
+    config["batch"]["max_in_flight"] = params["max_in_flight"]
+    return config
+
+
+def _subjects(count: int) -> list[str]:
+    return [f"user{index:05d}" for index in range(count)]
+
+
+def _route_pipeline(config, params, recorder, farm_port) -> None:
+    from webfarm import FarmAdapter
+
+    from openfootprint.core import fetcher
+    from openfootprint.core.transport import shared_transport
+
+    adapter = recorder.counted(FarmAdapter(farm_port, pool_maxsize=params["workers"]))
+    transport = shared_transport(config["http"])
+    transport.session.mount("https://", adapter)
+    transport.session.mount("http://", adapter)
+    fetcher.Fetcher.get = recorder.timed(fetcher.Fetcher.get)
+
+
+def _run_lookup(config, params, recorder, farm_port) -> None:
+    from openfootprint.core.inputs import LookupInputs
+    from openfootprint.core.pipeline import run_lookup
+
+    _route_pipeline(config, params, recorder, farm_port)
+    registry = _farm_registry(params["hosts"])
+    for username in _subjects(params["subjects"]):
+        run_lookup(LookupInputs.from_raw(username, None, None, None), registry, config)
+
+
+def _run_batch(config, params, recorder, farm_port) -> None:
+    from openfootprint.core.batch import run_batch
+
+    _route_pipeline(config, params, recorder, farm_port)
+    path = Path(config["output"]["runs_dir"]) / "subjects.jsonl"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("".join(json.dumps({"username": name}) + "\n" for name in _subjects(params["subjects"])))
+    summary = run_batch(path, _farm_registry(params["hosts"]), config)
+    if summary["failed"]:
+        raise RuntimeError(f"{summary['failed']} batch subjects failed")
+
+
+def _run_whatsmyname(config, params, recorder, farm_port) -> None:
+    from webfarm import FarmAdapter
+
+    from openfootprint.core.transport import HttpTransport
+    from openfootprint.tools import whatsmyname_runner
+
+    root = Path(config["output"]["runs_dir"])
+    root.mkdir(parents=True, exist_ok=True)
+    sites = [
+        {
+            "name": f"site{index}",
+            "uri_check": f"https://wmn{index % params['hosts']}.farm.test/{index}/{{account}}",
+            "e_code": 404,
+            "e_string": "Not here",
+            "m_code": 200,
+            "m_string": "<title>",
+            "cat": "benchmark",
+        }
+        for index in range(params["wmn_sites"])
+    ]
+    data = root / "wmn-data.json"
+    data.write_text(json.dumps({"sites": sites}), encoding="utf-8")
+    transport = HttpTransport(pool_maxsize=params["workers"])
+    adapter = recorder.counted(FarmAdapter(farm_port, pool_maxsize=params["workers"]))
+    transport.session.mount("https://", adapter)
+    whatsmyname_runner.check_compiled_site = recorder.timed(whatsmyname_runner.check_compiled_site)
+    for username in _subjects(max(1, params["subjects"] // 10)):
+        whatsmyname_runner.run(
+            data, username, root / f"{username}.json", 10, transport=transport, workers=params["workers"]
+        )
+
+
+RUNNERS = {"lookup": _run_lookup, "batch": _run_batch, "whatsmyname": _run_whatsmyname}
+
+
+def _scenario(name: str, params: dict, farm_port: int, results) -> None:
+    recorder = Recorder()
+    with tempfile.TemporaryDirectory() as tmp:
+        config = _config(Path(tmp) / "runs", params)
+        before = resource.getrusage(resource.RUSAGE_SELF)
+        started = time.perf_counter()
+        RUNNERS[name](config, params, recorder, farm_port)
+        wall = time.perf_counter() - started
+        after = resource.getrusage(resource.RUSAGE_SELF)
+    cpu = (after.ru_utime - before.ru_utime) + (after.ru_stime - before.ru_stime)
+    # ru_maxrss is KiB on Linux and bytes on macOS.
+    rss_mb = after.ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+    latencies = [value * 1000 for value in recorder.latencies]
+    results.put(
+        {
+            "requests": recorder.requests,
+            "fetches": len(latencies),
+            "wall_seconds": round(wall, 3),
+            "requests_per_second": round(recorder.requests / wall, 1) if wall else 0.0,
+            "latency_ms": {
+                "p50": round(percentile(latencies, 0.50), 2),
+                "p95": round(percentile(latencies, 0.95), 2),
+                "p99": round(percentile(latencies, 0.99), 2),
+            },
+            "cpu_seconds": round(cpu, 3),
+            "cpu_ms_per_request": round(cpu * 1000 / max(1, recorder.requests), 3),
+            "peak_rss_mb": round(rss_mb, 1),
+        }
+    )
+
+
+SCENARIOS = tuple(RUNNERS)
+
+
+def run_benchmarks(scenarios, params: dict, spec: FarmSpec) -> dict:
+    context = multiprocessing.get_context("spawn")
+    results = {}
+    with WebFarm(spec) as farm:
+        for name in scenarios:
+            queue = context.Queue()
+            process = context.Process(target=_scenario, args=(name, params, farm.port, queue))
+            process.start()
+            process.join()
+            if process.exitcode != 0:
+                raise RuntimeError(f"scenario {name} failed with exit code {process.exitcode}")
+            results[name] = queue.get(timeout=5)
+    return {
+        "params": params,
+        "farm": spec.to_dict(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scenarios": results,
+    }
+
+
+def _metric(metrics: dict, name: str):
+    value = metrics
+    for part in name.split("."):
+        value = value.get(part) if isinstance(value, dict) else None
+    return value
+
+
+def compare(current: dict, baseline: dict, tolerance: float = 0.15) -> list[str]:
+    """Regressions of more than `tolerance` (a fraction) against the baseline, one line each."""
+    regressions = []
+    for scenario, metrics in current["scenarios"].items():
+        reference = baseline.get("scenarios", {}).get(scenario)
+        if reference is None:
+            continue
+        for name, direction in DIRECTIONS.items():
+            now, then = _metric(metrics, name), _metric(reference, name)
+            if not now or not then:
+                continue
+            change = (now - then) / then
+            if change * direction < -tolerance:
+                regressions.append(f"{scenario} {name}: {then} -> {now} ({change:+.1%}, tolerance {tolerance:.0%})")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Offline end-to-end throughput benchmarks")
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS, help="Run only these (repeatable)")
+    parser.add_argument("--hosts", type=int, default=50, help="Virtual hosts, one profile source each")
+    parser.add_argument("--subjects", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--max-in-flight", type=int, default=4)
+    parser.add_argument("--wmn-sites", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--body-bytes", type=int, default=32 * 1024)
+    parser.add_argument("--statuses", default='{"404": 0.2, "429": 0.01, "500": 0.01}', help="JSON status mix")
+    parser.add_argument("--robots-disallow", type=float, default=0.05)
+    parser.add_argument("--robots-missing", type=float, default=0.2)
+    parser.add_argument("--output", help="Write results JSON here as well as to stdout")
+    parser.add_argument("--baseline", help="Fail if any metric regressed beyond --tolerance against this file")
+    parser.add_argument("--tolerance", type=float, default=0.15)
+    args = parser.parse_args(argv)
+
+    spec = FarmSpec(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        body_bytes=args.body_bytes,
+        statuses={int(code): float(share) for code, share in json.loads(args.statuses).items()},
+        robots_disallow=args.robots_disallow,
+        robots_missing=args.robots_missing,
+    )
+    params = {
+        "hosts": args.hosts,
+        "subjects": args.subjects,
+        "workers": args.workers,
+        "max_in_flight": args.max_in_flight,
+        "wmn_sites": args.wmn_sites,
+    }
+    results = run_benchmarks(args.scenario or SCENARIOS, params, spec)
+    text = json.dumps(results, indent=2, sort_keys=True)
+    print(text)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        if baseline.get("params") != params or baseline.get("farm") != spec.to_dict():
+            print("warning: baseline was recorded with different parameters", file=sys.stderr)
+        regressions = compare(results, baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            print(f"{len(regressions)} benchmark regressions against {args.baseline}", file=sys.stderr)
+            return 1
+        print(f"No regressions against {args.baseline}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,167 @@
+"""A local stub web farm: one process answering for any number of virtual hosts.
+
+Responses are decided by a hash of (host, path), so every run of a benchmark sees the same
+status codes, body sizes and robots.txt rules. Clients reach the farm through FarmAdapter,
+which sends https://<any host>/<path> to the farm over plain HTTP with the original Host header,
+so the code under test keeps its real URLs, per-host rate limits and robots handling.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import random
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from hashlib import blake2b
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Self
+from urllib.parse import urlsplit
+
+from requests.adapters import HTTPAdapter
+
+
+@dataclass
+class FarmSpec:
+    latency_ms: float = 20.0
+    jitter_ms: float = 10.0
+    body_bytes: int = 32 * 1024
+    body_jitter: float = 0.5
+    # Status code -> share of responses; the rest of the probability mass is 200.
+    statuses: dict[int, float] = field(default_factory=lambda: {404: 0.2, 429: 0.01, 500: 0.01})
+    # Share of hosts whose robots.txt disallows everything, and share that answer robots.txt with 404.
+    robots_disallow: float = 0.05
+    robots_missing: float = 0.2
+    retry_after: int = 1
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["statuses"] = {str(code): share for code, share in self.statuses.items()}
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> FarmSpec:
+        data = dict(data)
+        data["statuses"] = {int(code): float(share) for code, share in (data.get("statuses") or {}).items()}
+        return cls(**data)
+
+
+def _fraction(*parts: str) -> float:
+    digest = blake2b("\0".join(parts).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") / 2**64
+
+
+def _page(host: str, path: str, size: int) -> bytes:
+    head = f"<!doctype html><html><head><title>{path.strip('/') or host} | {host}</title></head><body>"
+    filler = "<p>Lorem ipsum dolor sit amet, consectetur adipiscing elit.</p>\n"
+    body = head + filler * max(0, (size - len(head)) // len(filler)) + "</body></html>"
+    return body.encode("utf-8")
+
+
+class FarmHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    spec: FarmSpec
+
+    def log_message(self, _format, *_args) -> None:
+        return
+
+    def _respond(self, status: int, body: bytes, headers: dict[str, str] | None = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        spec = self.spec
+        host = (self.headers.get("Host") or "farm").split(":")[0]
+        path = self.path
+        delay = max(0.0, spec.latency_ms + random.uniform(-spec.jitter_ms, spec.jitter_ms)) / 1000
+        if delay:
+            time.sleep(delay)
+        if path == "/robots.txt":
+            kind = _fraction(host, "robots")
+            if kind < spec.robots_disallow:
+                self._respond(200, b"User-agent: *\nDisallow: /\n")
+            elif kind < spec.robots_disallow + spec.robots_missing:
+                self._respond(404, b"not found")
+            else:
+                self._respond(200, b"User-agent: *\nAllow: /\n")
+            return
+        roll = _fraction(host, path, "status")
+        status = 200
+        for code, share in sorted(spec.statuses.items()):
+            if roll < share:
+                status = code
+                break
+            roll -= share
+        if status == 429:
+            self._respond(429, b"slow down", {"Retry-After": str(spec.retry_after)})
+        elif status != 200:
+            self._respond(status, b"<html><head><title>Not here</title></head></html>")
+        else:
+            scale = 1 + spec.body_jitter * (2 * _fraction(host, path, "size") - 1)
+            self._respond(200, _page(host, path, int(spec.body_bytes * scale)))
+
+    do_HEAD = do_GET
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        self.do_GET()
+
+
+class FarmServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default listen backlog of 5 makes bursts of new connections wait out a SYN retry.
+    request_queue_size = 1024
+
+    def handle_error(self, request, client_address) -> None:
+        # Clients drop idle keep-alive connections when a scenario process exits; that is not a failure.
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+def _serve(spec_dict: dict, ready) -> None:
+    handler = type("BoundFarmHandler", (FarmHandler,), {"spec": FarmSpec.from_dict(spec_dict)})
+    server = FarmServer(("127.0.0.1", 0), handler)
+    ready.send(server.server_address[1])
+    server.serve_forever()
+
+
+class WebFarm:
+    """Runs the farm in its own process, so its CPU time is not charged to the code under test."""
+
+    def __init__(self, spec: FarmSpec | None = None) -> None:
+        self.spec = spec or FarmSpec()
+        self.process: multiprocessing.Process | None = None
+        self.port: int | None = None
+
+    def __enter__(self) -> Self:
+        context = multiprocessing.get_context("spawn")
+        receiver, sender = context.Pipe(duplex=False)
+        self.process = context.Process(target=_serve, args=(self.spec.to_dict(), sender), daemon=True)
+        self.process.start()
+        self.port = receiver.recv()
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        if self.process is not None:
+            self.process.terminate()
+            self.process.join()
+
+
+class FarmAdapter(HTTPAdapter):
+    def __init__(self, port: int, pool_maxsize: int = 64) -> None:
+        super().__init__(pool_connections=1, pool_maxsize=pool_maxsize, pool_block=False)
+        self.farm = f"http://127.0.0.1:{port}"
+
+    def send(self, request, **kwargs):
+        parts = urlsplit(request.url)
+        request.headers["Host"] = parts.netloc
+        request.url = self.farm + (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        return super().send(request, **kwargs)
@@ -2,76 +2,289 @@ import argparse
 
 from openfootprint.core.config import load_config
 from openfootprint.core.inputs import LookupInputs
-from openfootprint.core.pipeline import run_lookup
-from openfootprint.sources.registry import SourceRegistry
-from openfootprint.sources.developer.github import SOURCE as GITHUB
-from openfootprint.sources.developer.gitlab import SOURCE as GITLAB
-from openfootprint.sources.developer.codeberg import SOURCE as CODEBERG
-from openfootprint.sources.social.reddit import SOURCE as REDDIT
-from openfootprint.sources.social.hackernews import SOURCE as HN
-from openfootprint.sources.social.mastodon import SOURCE as MASTODON
-from openfootprint.sources.blogs.devto import SOURCE as DEVTO
-from openfootprint.sources.blogs.medium import SOURCE as MEDIUM
-from openfootprint.sources.blogs.wordpress import SOURCE as WORDPRESS
-from openfootprint.sources.directories.wikidata import SOURCE as WIKIDATA
-from openfootprint.sources.directories.orcid import SOURCE as ORCID
-from openfootprint.sources.directories.openalex import SOURCE as OPENALEX
-from openfootprint.sources.tools.sherlock import SOURCE as SHERLOCK
-from openfootprint.sources.tools.maigret import SOURCE as MAIGRET
-from openfootprint.sources.tools.whatsmyname import SOURCE as WHATS_MY_NAME
-
-from openfootprint.nameintel.command import run_nameintel
+from openfootprint.sources.registry import SourceRegistry, default_registry
 
 from . import __version__
 
+# Everything else is imported inside the command that needs it: "sources list" and "plan" run
+# often from scripts, and should not pay for HTTP, HTML parsing or the pipeline.
 
-def _registry() -> SourceRegistry:
-    return SourceRegistry(
-        [
-            GITHUB,
-            GITLAB,
-            CODEBERG,
-            REDDIT,
-            HN,
-            MASTODON,
-            DEVTO,
-            MEDIUM,
-            WORDPRESS,
-            WIKIDATA,
-            ORCID,
-            OPENALEX,
-            SHERLOCK,
-            MAIGRET,
-            WHATS_MY_NAME,
-        ]
-    )
+
+def _registry(config: dict | None = None) -> SourceRegistry:
+    return default_registry((config or {}).get("sources"))
 
 
 def _filtered_registry(config: dict) -> SourceRegistry:
     sources_cfg = config.get("sources", {})
     enabled = list(sources_cfg.get("enabled", []))
     disabled = list(sources_cfg.get("disabled", []))
-    return _registry().filtered(enabled, disabled)
+    return _registry(config).filtered(enabled, disabled)
+
+
+def _use_cassette(config: dict, args) -> None:
+    if args.record or args.replay:
+        mode = "record" if args.record else "replay"
+        config["cassette"] = {"mode": mode, "path": args.record or args.replay}
 
 
 def _cmd_lookup(args) -> int:
+    from openfootprint.core.pipeline import stream_lookup
+    from openfootprint.reporting.console import (
+        render_console_header,
+        render_console_line,
+    )
+
     config = load_config(args.config)
     if args.output:
         config["output"]["runs_dir"] = args.output
+    _use_cassette(config, args)
     inputs = LookupInputs.from_raw(args.username, args.email, args.phone, args.name)
-    result = run_lookup(inputs, _filtered_registry(config), config)
-    print(result["console"])
+    stream = stream_lookup(inputs, _filtered_registry(config), config)
+    print(render_console_header(stream.sources, stream.run_id), flush=True)
+    for finding in stream:
+        print(render_console_line(finding), flush=True)
+    return 0
+
+
+def _cmd_batch(args) -> int:
+    from pathlib import Path
+
+    from openfootprint.core.batch import run_batch
+
+    config = load_config(args.config)
+    if args.output:
+        config["output"]["runs_dir"] = args.output
+    _use_cassette(config, args)
+    summary = run_batch(Path(args.input), _filtered_registry(config), config, args.max_in_flight, args.format)
+    print(
+        f"Batch {summary['batch_id']}: {summary['subjects']} subjects "
+        f"({summary['succeeded']} ok, {summary['failed']} failed), "
+        f"{summary['findings']} findings, {summary['subjects_per_second']} subjects/sec"
+    )
+    print(f"Results: {summary['results']}")
+    return 0 if summary["failed"] == 0 else 1
+
+
+def _cmd_search(args) -> int:
+    from openfootprint.storage.index import build_identity_index
+
+    config = load_config(args.config)
+    if args.output:
+        config["output"]["runs_dir"] = args.output
+    config.setdefault("index", {})["enabled"] = True
+    index = build_identity_index(config)
+    assert index is not None  # enabled just above
+    try:
+        if args.reindex:
+            count = index.rebuild()
+            print(f"Indexed {count} runs")
+        rows = index.search(args.value, kind=args.type, source_id=args.source, limit=args.limit)
+    finally:
+        index.close()
+    if not rows:
+        print("No matches")
+        return 1
+    for row in rows:
+        print(f"{row['seen_at']}\t{row['run_id']}\t{row['source_id']}\t{row['kind']}\t{row['value']}")
+    return 0
+
+
+def _run_database(args):
+    from openfootprint.storage.rundb import build_run_database
+
+    config = load_config(args.config)
+    if args.output:
+        config["output"]["runs_dir"] = args.output
+    return build_run_database(config, force=True)
+
+
+def _cmd_runs_list(args) -> int:
+    database = _run_database(args)
+    try:
+        if args.import_dirs:
+            print(f"Imported {database.import_runs()} runs")
+        runs = database.list_runs(
+            source_id=args.source, identifier=args.identifier, since=args.since, limit=args.limit
+        )
+    finally:
+        database.close()
+    for run in runs:
+        inputs = ", ".join(f"{key}={value}" for key, value in sorted(run["inputs"].items()) if value)
+        print(f"{run['run_id']}\t{run['started_at']}\t{run['finding_count']} findings\t{inputs}")
     return 0
 
 
-def _cmd_sources_list(_args) -> int:
-    for source in _registry().list_sources():
+def _cmd_runs_show(args) -> int:
+    database = _run_database(args)
+    try:
+        run = database.get_run(args.run_id)
+    finally:
+        database.close()
+    if run is None:
+        print("Run not found")
+        return 1
+    manifest = run["manifest"]
+    print(f"Run: {run['run_id']}")
+    print(f"Started: {manifest.get('started_at')}  Finished: {manifest.get('finished_at')}")
+    inputs = ", ".join(f"{key}={value}" for key, value in sorted((manifest.get("inputs") or {}).items()) if value)
+    print(f"Inputs: {inputs}")
+    print(f"Findings: {run['finding_count']}")
+    for source_id, count in run["findings_by_source"].items():
+        print(f"  {source_id}\t{count}")
+    print(f"Entities: {len(run['entities'])}")
+    for entity in run["entities"]:
+        urls = ", ".join(entity.get("profile_urls") or [])
+        print(f"  {entity.get('display_name') or entity['entity_id']}\t{urls}")
+    return 0
+
+
+def _cmd_runs_export(args) -> int:
+    from pathlib import Path
+
+    if not args.run_id and not args.all:
+        print("Give a run id or --all")
+        return 1
+    database = _run_database(args)
+    try:
+        run_ids = [run["run_id"] for run in database.list_runs(limit=-1)] if args.all else [args.run_id]
+        for run_id in run_ids:
+            try:
+                print(database.export_run(run_id, Path(args.dest)))
+            except KeyError:
+                print(f"Run not found: {run_id}")
+                return 1
+    finally:
+        database.close()
+    return 0
+
+
+def _cmd_reparse(args) -> int:
+    from pathlib import Path
+
+    from openfootprint.core.reparse import find_run_dir, reparse_runs
+    from openfootprint.storage.runs import iter_run_dirs
+
+    if not args.run_id and not args.all:
+        print("Give a run id or --all")
+        return 1
+    config = load_config(args.config)
+    if args.output:
+        config["output"]["runs_dir"] = args.output
+    runs_dir = Path(config["output"]["runs_dir"])
+    if args.all:
+        run_dirs = list(iter_run_dirs(runs_dir)) if runs_dir.is_dir() else []
+    else:
+        run_dir = find_run_dir(runs_dir, args.run_id)
+        if run_dir is None:
+            print(f"Run not found: {args.run_id}")
+            return 1
+        run_dirs = [run_dir]
+    summary = reparse_runs(run_dirs, config, workers=args.workers)
+    print(f"Reparsed {summary['runs']} runs ({summary['failed']} failed), {summary['findings']} findings")
+    return 0 if summary["failed"] == 0 else 1
+
+
+def _cmd_serve(args) -> int:
+    from openfootprint.service import serve
+
+    config = load_config(args.config)
+    if args.output:
+        config["output"]["runs_dir"] = args.output
+    serve(config, _filtered_registry(config), host=args.host, port=args.port, workers=args.workers)
+    return 0
+
+
+def _job_queue(args):
+    from openfootprint.storage.queue import build_job_queue
+
+    config = load_config(args.config)
+    if args.output:
+        config["output"]["runs_dir"] = args.output
+    if args.queue:
+        config.setdefault("queue", {})["path"] = args.queue
+    return config, build_job_queue(config)
+
+
+def _cmd_queue_add(args) -> int:
+    import json
+    from pathlib import Path
+
+    from openfootprint.core.batch import iter_subjects
+    from openfootprint.core.jobs import validate_job
+
+    _config, queue = _job_queue(args)
+    try:
+        if args.input:
+            subjects = [raw for _index, raw in iter_subjects(Path(args.input), args.format)]
+        else:
+            subjects = [{"username": args.username, "email": args.email, "phone": args.phone, "name": args.name}]
+        added = 0
+        for raw in subjects:
+            params = {key: value for key, value in raw.items() if value}
+            try:
+                if "error" in params:
+                    raise ValueError(params["error"])
+                validate_job("lookup", params)
+            except ValueError as exc:
+                print(f"Skipped {json.dumps(params, sort_keys=True)}: {exc}")
+                continue
+            print(queue.enqueue("lookup", params))
+            added += 1
+    finally:
+        queue.close()
+    print(f"Queued {added} jobs")
+    return 0 if added == len(subjects) else 1
+
+
+def _cmd_queue_status(args) -> int:
+    _config, queue = _job_queue(args)
+    try:
+        stats = queue.stats()
+        jobs = queue.jobs(status=args.status, limit=args.limit) if args.jobs or args.status else []
+    finally:
+        queue.close()
+    print("  ".join(f"{status}={count}" for status, count in stats.items()))
+    for job in jobs:
+        print(
+            f"{job['job_id']}\t{job['status']}\t{job['attempts']}/{job['max_attempts']}\t"
+            f"{job['run_id'] or '-'}\t{job['lease_owner'] or '-'}\t{job['error'] or ''}"
+        )
+    return 0
+
+
+def _cmd_worker(args) -> int:
+    from openfootprint.core.worker import run_worker, worker_config
+
+    config, queue = _job_queue(args)
+    queue_cfg = config.get("queue", {})
+    config = worker_config(config, queue)
+    try:
+        processed = run_worker(
+            queue,
+            _filtered_registry(config),
+            config,
+            worker_id=args.worker_id,
+            lease_seconds=float(args.lease or queue_cfg.get("lease_seconds", 300)),
+            poll_seconds=float(queue_cfg.get("poll_seconds", 2)),
+            max_jobs=args.max_jobs,
+            drain=args.drain,
+        )
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        queue.close()
+    print(f"Processed {processed} jobs")
+    return 0
+
+
+def _cmd_sources_list(args) -> int:
+    for source in _registry(load_config(args.config)).list_sources():
         print(f"{source.source_id}\t{source.name}\t{source.category}")
     return 0
 
 
 def _cmd_sources_info(args) -> int:
-    source = _registry().get(args.source_id)
+    source = _registry(load_config(args.config)).entry(args.source_id)
     if not source:
         print("Source not found")
         return 1
@@ -92,6 +305,8 @@ def _cmd_plan(args) -> int:
 
 
 def _cmd_nameintel(args) -> int:
+    from openfootprint.nameintel.command import run_nameintel
+
     return int(
         run_nameintel(
             first=args.first,
@@ -125,12 +340,97 @@ def build_parser() -> argparse.ArgumentParser:
     lookup.add_argument("--output")
     lookup.set_defaults(func=_cmd_lookup)
 
+    batch = subparsers.add_parser("batch", help="Run lookups for many subjects from a JSONL/CSV file")
+    batch.add_argument("--input", required=True)
+    batch.add_argument("--format", choices=["jsonl", "csv"])
+    batch.add_argument("--max-in-flight", type=int)
+    batch.add_argument("--config")
+    batch.add_argument("--output")
+    batch.set_defaults(func=_cmd_batch)
+    for command in (lookup, batch):
+        cassette = command.add_mutually_exclusive_group()
+        cassette.add_argument("--record", metavar="CASSETTE", help="Record every request and tool run to this file")
+        cassette.add_argument("--replay", metavar="CASSETTE", help="Serve every request and tool run from this file")
+
+    search = subparsers.add_parser("search", help="Find past runs that saw an identifier, URL or entity")
+    search.add_argument("value")
+    search.add_argument("--type", help="Restrict to one kind: username, email, phone, name, url, entity")
+    search.add_argument("--source", help="Restrict to one source id")
+    search.add_argument("--limit", type=int, default=100)
+    search.add_argument("--reindex", action="store_true", help="Index run directories not yet in the index first")
+    search.add_argument("--config")
+    search.add_argument("--output")
+    search.set_defaults(func=_cmd_search)
+
+    serve = subparsers.add_parser("serve", help="Run a local HTTP/JSON job service with warm state")
+    serve.add_argument("--host")
+    serve.add_argument("--port", type=int)
+    serve.add_argument("--workers", type=int)
+    serve.add_argument("--config")
+    serve.add_argument("--output")
+    serve.set_defaults(func=_cmd_serve)
+
+    queue = subparsers.add_parser("queue", help="Add lookups to the shared job queue or show its status")
+    queue_sub = queue.add_subparsers(dest="queue_command")
+    queue_add = queue_sub.add_parser("add", help="Queue one lookup, or one per subject in a JSONL/CSV file")
+    queue_add.add_argument("--username")
+    queue_add.add_argument("--email")
+    queue_add.add_argument("--phone")
+    queue_add.add_argument("--name")
+    queue_add.add_argument("--input")
+    queue_add.add_argument("--format", choices=["jsonl", "csv"])
+    queue_status = queue_sub.add_parser("status", help="Show job counts by status")
+    queue_status.add_argument("--jobs", action="store_true", help="List recent jobs as well")
+    queue_status.add_argument("--status", help="List only jobs with this status")
+    queue_status.add_argument("--limit", type=int, default=50)
+    worker = subparsers.add_parser("worker", help="Run jobs from the shared queue until stopped")
+    worker.add_argument("--worker-id")
+    worker.add_argument("--lease", type=float, help="Lease length in seconds")
+    worker.add_argument("--max-jobs", type=int)
+    worker.add_argument("--drain", action="store_true", help="Exit once the queue has no runnable jobs")
+    for command, handler in ((queue_add, _cmd_queue_add), (queue_status, _cmd_queue_status), (worker, _cmd_worker)):
+        command.add_argument("--queue", help="Queue database path")
+        command.add_argument("--config")
+        command.add_argument("--output")
+        command.set_defaults(func=handler)
+
+    runs = subparsers.add_parser("runs", help="List, inspect or export recorded runs")
+    runs_sub = runs.add_subparsers(dest="runs_command")
+    runs_list = runs_sub.add_parser("list", help="List recorded runs, newest first")
+    runs_list.add_argument("--source", help="Only runs with findings from this source id")
+    runs_list.add_argument("--identifier", help="Only runs that found this identifier value")
+    runs_list.add_argument("--since", help="Only runs started at or after this UTC timestamp")
+    runs_list.add_argument("--limit", type=int, default=50)
+    runs_list.add_argument(
+        "--import", dest="import_dirs", action="store_true", help="Record run directories on disk first"
+    )
+    runs_show = runs_sub.add_parser("show", help="Show one recorded run")
+    runs_show.add_argument("run_id")
+    runs_export = runs_sub.add_parser("export", help="Write recorded runs out as run directories")
+    runs_export.add_argument("run_id", nargs="?")
+    runs_export.add_argument("--all", action="store_true")
+    runs_export.add_argument("--dest", required=True)
+    for command, handler in ((runs_list, _cmd_runs_list), (runs_show, _cmd_runs_show), (runs_export, _cmd_runs_export)):
+        command.add_argument("--config")
+        command.add_argument("--output")
+        command.set_defaults(func=handler)
+
+    reparse = subparsers.add_parser("reparse", help="Rebuild findings and reports from stored raw artifacts, offline")
+    reparse.add_argument("run_id", nargs="?")
+    reparse.add_argument("--all", action="store_true", help="Every run under the runs directory")
+    reparse.add_argument("--workers", type=int, help="Parser processes (default: one per CPU)")
+    reparse.add_argument("--config")
+    reparse.add_argument("--output")
+    reparse.set_defaults(func=_cmd_reparse)
+
     sources = subparsers.add_parser("sources", help="List or inspect sources")
     sources_sub = sources.add_subparsers(dest="sources_command")
     sources_list = sources_sub.add_parser("list", help="List available sources")
+    sources_list.add_argument("--config")
     sources_list.set_defaults(func=_cmd_sources_list)
     sources_info = sources_sub.add_parser("info", help="Show details for a source")
     sources_info.add_argument("source_id")
+    sources_info.add_argument("--config")
     sources_info.set_defaults(func=_cmd_sources_info)
 
     plan = subparsers.add_parser("plan", help="Show a dry-run query plan")
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import csv
+import json
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+
+from openfootprint.core.inputs import LookupInputs
+from openfootprint.core.pipeline import build_context, stream_lookup
+from openfootprint.storage.runs import create_run_dir, new_run_id, write_json
+
+SUBJECT_FIELDS = ("username", "email", "phone", "name")
+
+
+def detect_format(path: Path) -> str:
+    return "csv" if path.suffix.lower() == ".csv" else "jsonl"
+
+
+def iter_subjects(path: Path, fmt: str | None = None):
+    fmt = fmt or detect_format(path)
+    with path.open("r", encoding="utf-8", newline="") as handle:
+        if fmt == "csv":
+            for index, row in enumerate(csv.DictReader(handle)):
+                yield index, {key: (row.get(key) or None) for key in SUBJECT_FIELDS}
+            return
+        index = 0
+        for line in handle:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as exc:
+                yield index, {"error": f"invalid JSON: {exc}"}
+            else:
+                if isinstance(row, dict):
+                    yield index, {key: row.get(key) for key in SUBJECT_FIELDS}
+                else:
+                    yield index, {"error": "line is not a JSON object"}
+            index += 1
+
+
+def _run_subject(index, raw, registry, config, context, runs_dir: Path) -> dict:
+    record = {"index": index, "inputs": {key: raw.get(key) for key in SUBJECT_FIELDS}}
+    if raw.get("error"):
+        record["error"] = raw["error"]
+        return record
+    try:
+        inputs = LookupInputs.from_raw(raw.get("username"), raw.get("email"), raw.get("phone"), raw.get("name"))
+        if not any(inputs.__dict__.values()):
+            raise ValueError("subject has no usable inputs")
+        run_paths = create_run_dir(runs_dir, run_id=f"{index:07d}")
+        stream = stream_lookup(inputs, registry, config, context=context, run_paths=run_paths)
+        for _finding in stream:
+            pass
+    except Exception as exc:  # noqa: BLE001 - one bad subject must not stop the batch
+        record["error"] = str(exc)
+        return record
+    record["run_id"] = stream.run_id
+    record["findings"] = stream.finding_count
+    record["report_json"] = (stream.paths or {}).get("report_json")
+    return record
+
+
+def run_batch(path: Path, registry, config, max_in_flight: int | None = None, fmt: str | None = None) -> dict:
+    batch_cfg = config.get("batch", {})
+    max_in_flight = max(1, int(max_in_flight or batch_cfg.get("max_in_flight", 4)))
+    runs_dir = Path(config["output"]["runs_dir"]).resolve()
+    batch_id = f"batch-{new_run_id()}"
+    batch_dir = runs_dir / batch_id
+    (batch_dir / "runs").mkdir(parents=True, exist_ok=False)
+    results_path = batch_dir / "results.jsonl"
+
+    started = time.monotonic()
+    totals = {"subjects": 0, "succeeded": 0, "failed": 0, "findings": 0}
+
+    def record(future, out) -> None:
+        item = future.result()
+        totals["subjects"] += 1
+        if item.get("error"):
+            totals["failed"] += 1
+        else:
+            totals["succeeded"] += 1
+            totals["findings"] += item["findings"]
+        out.write(json.dumps(item, sort_keys=True) + "\n")
+
+    with build_context(config) as context, ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+        with results_path.open("w", encoding="utf-8") as out:
+            in_flight: set[Future] = set()
+            # Only max_in_flight subjects are ever materialized, so memory stays flat for huge files.
+            for index, raw in iter_subjects(Path(path), fmt):
+                if len(in_flight) >= max_in_flight:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        record(future, out)
+                in_flight.add(
+                    executor.submit(_run_subject, index, raw, registry, config, context, batch_dir / "runs")
+                )
+            for future in wait(in_flight).done:
+                record(future, out)
+        rate_limit = context.limiter.metrics()
+
+    elapsed = time.monotonic() - started
+    summary = {
+        "batch_id": batch_id,
+        "input": str(path),
+        **totals,
+        "elapsed_seconds": round(elapsed, 3),
+        "subjects_per_second": round(totals["subjects"] / elapsed, 3) if elapsed > 0 else None,
+        "max_in_flight": max_in_flight,
+        "results": str(results_path),
+        "rate_limit": rate_limit,
+    }
+    write_json(batch_dir, "summary.json", summary)
+    return summary
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from hashlib import sha256
+from pathlib import Path
+
+CACHEABLE_STATUSES = {200, 203, 404, 410}
+VARY_HEADERS = ("accept", "accept-language")
+
+
+def header_value(headers: dict[str, str], name: str) -> str | None:
+    name = name.lower()
+    for key, value in headers.items():
+        if key.lower() == name:
+            return value
+    return None
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    url: str
+    status_code: int
+    headers: dict[str, str]
+    content: bytes
+    stored_at: float
+    expires_at: float
+
+    def is_fresh(self, now: float) -> bool:
+        return now < self.expires_at
+
+    def validators(self) -> dict[str, str]:
+        conditional = {}
+        etag = header_value(self.headers, "ETag")
+        if etag:
+            conditional["If-None-Match"] = etag
+        last_modified = header_value(self.headers, "Last-Modified")
+        if last_modified:
+            conditional["If-Modified-Since"] = last_modified
+        return conditional
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        directory: Path,
+        default_ttl: float = 3600,
+        ttl_by_source: dict[str, float] | None = None,
+        max_bytes: int = 256 * 1024 * 1024,
+        now=time.time,
+    ) -> None:
+        self.directory = Path(directory)
+        self.default_ttl = float(default_ttl)
+        self.ttl_by_source = dict(ttl_by_source or {})
+        self.max_bytes = int(max_bytes)
+        self.now = now
+        self._lock = threading.Lock()
+        self._size: int | None = None
+
+    def key(self, method: str, url: str, headers: dict[str, str] | None = None) -> str:
+        parts = [method.upper(), url]
+        for name in VARY_HEADERS:
+            parts.append(f"{name}={header_value(headers or {}, name) or ''}")
+        return sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+    def ttl_for(self, source_id: str) -> float:
+        return float(self.ttl_by_source.get(source_id, self.default_ttl))
+
+    def _paths(self, key: str) -> tuple[Path, Path]:
+        shard = self.directory / key[:2]
+        return shard / f"{key}.json", shard / f"{key}.body"
+
+    def lookup(self, key: str) -> CachedResponse | None:
+        meta_path, body_path = self._paths(key)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            content = body_path.read_bytes()
+        except (OSError, ValueError):
+            return None
+        # Touching the metadata file keeps eviction least-recently-used.
+        try:
+            os.utime(meta_path)
+        except OSError:
+            pass
+        return CachedResponse(
+            url=meta["url"],
+            status_code=int(meta["status_code"]),
+            headers=dict(meta.get("headers") or {}),
+            content=content,
+            stored_at=float(meta["stored_at"]),
+            expires_at=float(meta["expires_at"]),
+        )
+
+    def store(
+        self,
+        key: str,
+        source_id: str,
+        url: str,
+        status_code: int | None,
+        headers: dict[str, str],
+        content: bytes | None,
+    ) -> bool:
+        if status_code not in CACHEABLE_STATUSES or content is None:
+            return False
+        if "no-store" in (header_value(headers, "Cache-Control") or "").lower():
+            return False
+        now = self.now()
+        meta = {
+            "url": url,
+            "source_id": source_id,
+            "status_code": status_code,
+            "headers": dict(headers),
+            "stored_at": now,
+            "expires_at": now + self.ttl_for(source_id),
+        }
+        meta_path, body_path = self._paths(key)
+        meta_path.parent.mkdir(parents=True, exist_ok=True)
+        previous = _file_size(meta_path) + _file_size(body_path)
+        _atomic_write(body_path, content)
+        _atomic_write(meta_path, json.dumps(meta, sort_keys=True).encode("utf-8"))
+        written = _file_size(meta_path) + _file_size(body_path)
+        self._account(written - previous)
+        return True
+
+    def refresh(self, key: str, source_id: str) -> CachedResponse | None:
+        cached = self.lookup(key)
+        if cached is None:
+            return None
+        meta_path, _body_path = self._paths(key)
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        meta["expires_at"] = self.now() + self.ttl_for(source_id)
+        _atomic_write(meta_path, json.dumps(meta, sort_keys=True).encode("utf-8"))
+        return CachedResponse(
+            url=cached.url,
+            status_code=cached.status_code,
+            headers=cached.headers,
+            content=cached.content,
+            stored_at=cached.stored_at,
+            expires_at=meta["expires_at"],
+        )
+
+    def _entries(self) -> list[tuple[float, Path, Path, int]]:
+        entries = []
+        for meta_path in self.directory.glob("*/*.json"):
+            body_path = meta_path.with_suffix(".body")
+            try:
+                mtime = meta_path.stat().st_mtime
+            except OSError:
+                continue
+            entries.append((mtime, meta_path, body_path, _file_size(meta_path) + _file_size(body_path)))
+        return entries
+
+    def _account(self, delta: int) -> None:
+        with self._lock:
+            if self._size is None:
+                self._size = sum(size for *_rest, size in self._entries())
+            else:
+                self._size += delta
+            if self._size <= self.max_bytes:
+                return
+            self._evict()
+
+    def _evict(self) -> None:
+        entries = sorted(self._entries())
+        total = sum(size for *_rest, size in entries)
+        # Drop least-recently-used entries until the cache is back under 90% of the cap.
+        target = int(self.max_bytes * 0.9)
+        for _mtime, meta_path, body_path, size in entries:
+            if total <= target:
+                break
+            for path in (meta_path, body_path):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+            total -= size
+        self._size = total
+
+
+def _file_size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def build_response_cache(config: dict) -> ResponseCache | None:
+    cache_cfg = config.get("cache") or {}
+    if not cache_cfg.get("enabled"):
+        return None
+    directory = cache_cfg.get("dir") or Path(config["output"]["runs_dir"]) / ".cache" / "http"
+    return ResponseCache(
+        Path(directory).resolve(),
+        default_ttl=float(cache_cfg.get("default_ttl_seconds", 3600)),
+        ttl_by_source=cache_cfg.get("ttl_seconds") or {},
+        max_bytes=int(cache_cfg.get("max_bytes", 256 * 1024 * 1024)),
+    )
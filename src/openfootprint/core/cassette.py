@@ -0,0 +1,382 @@
+"""Record every request a lookup makes, and replay lookups from the recording without any network.
+
+A cassette is one SQLite file. Each interaction (an HTTP fetch, a robots.txt fetch or a tool
+subprocess run) is indexed by kind, key and the order it happened in; bodies, tool stdout/stderr and
+the files a tool wrote are stored once each, compressed and keyed by content hash.
+
+In record mode the cassette wraps the real http_get, robots fetcher and tool runner and writes down
+what they returned. In replay mode it stands in for them: nothing is fetched or run, rate limits do
+not sleep, and a request the cassette does not know fails the way an unreachable host would.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from hashlib import sha256
+from pathlib import Path
+
+from openfootprint.policies.robots import RobotsResponse
+from openfootprint.storage import sqlite
+from openfootprint.tools.subprocess import ToolResult
+
+try:  # optional: zstd compresses HTML noticeably better and faster than zlib
+    import zstandard  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - exercised when zstandard is absent
+    zstandard = None  # type: ignore[assignment]
+
+MODES = ("record", "replay")
+FORMAT_VERSION = "1"
+CHUNK_SIZE = 64 * 1024
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS bodies (digest TEXT PRIMARY KEY, codec TEXT NOT NULL, data BLOB NOT NULL)",
+    (
+        "CREATE TABLE IF NOT EXISTS interactions ("
+        "kind TEXT NOT NULL, key TEXT NOT NULL, seq INTEGER NOT NULL, status_code INTEGER, headers TEXT, "
+        "body TEXT, error TEXT, extra TEXT, recorded_at REAL NOT NULL, PRIMARY KEY (kind, key, seq))"
+    ),
+)
+
+
+class CassetteMiss(LookupError):
+    """Replay was asked for something the cassette did not record."""
+
+
+class ReplayedError(Exception):
+    """An error that happened while recording, raised again at the same point on replay."""
+
+
+def _compress(data: bytes) -> tuple[str, bytes]:
+    if zstandard is not None:
+        return "zstd", zstandard.ZstdCompressor(level=6).compress(data)
+    return "zlib", zlib.compress(data, 6)
+
+
+def _decompress(codec: str, data: bytes) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("reading zstd cassette bodies requires the 'zstandard' package")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return zlib.decompress(data)
+
+
+class _RecordingResponse:
+    """Passes a streamed response through to the fetcher, keeping the bytes it reads."""
+
+    def __init__(self, response, finish) -> None:
+        self._response = response
+        self._finish = finish
+        self._parts: list[bytes] = []
+        self._error: str | None = None
+        self._closed = False
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self.encoding = getattr(response, "encoding", None)
+
+    def iter_content(self, chunk_size: int = CHUNK_SIZE):
+        if hasattr(self._response, "iter_content"):
+            chunks = self._response.iter_content(chunk_size=chunk_size)
+        else:
+            chunks = [self._response.content or b""]
+        try:
+            for chunk in chunks:
+                self._parts.append(chunk)
+                yield chunk
+        except Exception as exc:
+            self._error = str(exc)
+            raise
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        # Only what the fetcher read is kept: bodies stay capped at the configured limit.
+        self._finish(b"".join(self._parts), self._error)
+        close = getattr(self._response, "close", None)
+        if close is not None:
+            close()
+
+
+class _ReplayedResponse:
+    encoding = None
+
+    def __init__(self, status_code: int | None, headers: dict[str, str], body: bytes, error: str | None) -> None:
+        self.status_code = status_code
+        self.headers = headers
+        self._body = body
+        self._error = error
+
+    def iter_content(self, chunk_size: int = CHUNK_SIZE):
+        for start in range(0, len(self._body), chunk_size):
+            yield self._body[start : start + chunk_size]
+        if self._error is not None:
+            raise ReplayedError(self._error)
+
+    def close(self) -> None:
+        return
+
+
+class Cassette:
+    """Interactions of one or more lookups, recorded into or replayed from `path`."""
+
+    def __init__(self, path: Path, mode: str, runs_dir: Path | None = None, clock=time.time) -> None:
+        if mode not in MODES:
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = Path(path)
+        self.mode = mode
+        self.runs_dir = Path(runs_dir).resolve() if runs_dir else None
+        self.clock = clock
+        self._lock = threading.Lock()
+        if mode == "replay":
+            if not self.path.exists():
+                raise FileNotFoundError(f"Cassette not found: {self.path}")
+            # Replays never write: a cassette checked in as a fixture or shared by replaying workers stays as recorded.
+            uri = f"{self.path.resolve().as_uri()}?mode=ro"
+            self._db = sqlite3.connect(uri, uri=True, check_same_thread=False, timeout=30)
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite.connect(self.path)
+            for statement in _SCHEMA:
+                self._db.execute(statement)
+            self._db.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('version', ?)", (FORMAT_VERSION,))
+            self._db.commit()
+        self._check_version()
+        # Replay position per (kind, key): the n-th request for a URL gets the n-th recorded answer.
+        self._counters: dict[tuple[str, str], int] = {}
+        self._index: dict[tuple[str, str], list[tuple]] = {}
+        if mode == "replay":
+            rows = self._db.execute(
+                "SELECT kind, key, status_code, headers, body, error, extra FROM interactions ORDER BY kind, key, seq"
+            )
+            for kind, key, *row in rows:
+                self._index.setdefault((kind, key), []).append(tuple(row))
+
+    def _check_version(self) -> None:
+        # Recording appends to an existing cassette too, so both modes refuse a format they do not know.
+        try:
+            row = self._db.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        except sqlite3.DatabaseError as exc:
+            self._db.close()
+            raise ValueError(f"Not a cassette: {self.path}") from exc
+        version = row[0] if row else None
+        if version != FORMAT_VERSION:
+            self._db.close()
+            raise ValueError(f"Cassette {self.path} has format version {version}, expected {FORMAT_VERSION}")
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def configure(self, config: dict) -> dict:
+        """The config a lookup runs with under this cassette.
+
+        Caches are bypassed in both modes, so every request is recorded and every request is replayed;
+        replays also drop rate limits, since no host is contacted.
+        """
+        config = copy.deepcopy(config)
+        config.setdefault("cache", {})["enabled"] = False
+        config.setdefault("robots", {})["persist"] = False
+        if self.replaying:
+            rate_cfg = config.setdefault("rate_limit", {})
+            rate_cfg.update({"min_interval_seconds": 0, "hosts": {}, "sources": {}, "shared_path": ""})
+        return config
+
+    # Storage
+
+    def _put(self, data: bytes) -> str:
+        digest = sha256(data).hexdigest()
+        codec, packed = _compress(data)
+        self._db.execute("INSERT OR IGNORE INTO bodies (digest, codec, data) VALUES (?, ?, ?)", (digest, codec, packed))
+        return digest
+
+    def _body(self, digest: str | None) -> bytes:
+        if digest is None:
+            return b""
+        with self._lock:
+            row = self._db.execute("SELECT codec, data FROM bodies WHERE digest = ?", (digest,)).fetchone()
+        if row is None:
+            raise CassetteMiss(f"Cassette body missing: {digest}")
+        return _decompress(row[0], row[1])
+
+    def _record(self, kind, key, status_code=None, headers=None, body=None, error=None, extra=None) -> None:
+        with self._lock, self._db:
+            # seq is taken inside the insert, so processes recording into one cassette (workers,
+            # or a second recording appended to an old one) never claim the same slot.
+            self._db.execute(
+                "INSERT INTO interactions (kind, key, seq, status_code, headers, body, error, extra, recorded_at) "
+                "SELECT ?, ?, COALESCE(MAX(seq) + 1, 0), ?, ?, ?, ?, ?, ? FROM interactions WHERE kind = ? AND key = ?",
+                (
+                    kind,
+                    key,
+                    status_code,
+                    json.dumps(dict(headers or {}), sort_keys=True),
+                    self._put(body) if body is not None else None,
+                    error,
+                    json.dumps(extra, sort_keys=True) if extra is not None else None,
+                    self.clock(),
+                    kind,
+                    key,
+                ),
+            )
+
+    def _replay(self, kind: str, key: str) -> tuple:
+        with self._lock:
+            rows = self._index.get((kind, key))
+            if not rows:
+                raise CassetteMiss(f"Not in cassette: {kind} {key}")
+            position = self._counters.get((kind, key), 0)
+            self._counters[(kind, key)] = position + 1
+        # Asked more often than recorded (e.g. a replay run twice in one process): keep giving the last answer.
+        status_code, headers, body, error, extra = rows[min(position, len(rows) - 1)]
+        return status_code, json.loads(headers or "{}"), body, error, json.loads(extra) if extra else None
+
+    def interactions(self) -> dict[str, int]:
+        with self._lock:
+            counts = dict(self._db.execute("SELECT kind, COUNT(*) FROM interactions GROUP BY kind").fetchall())
+        return {kind: counts.get(kind, 0) for kind in ("http", "robots", "tool")}
+
+    # Transports
+
+    def wrap_http(self, http_get):
+        if self.replaying:
+
+            def replay_get(url, _headers, _timeout):
+                status_code, headers, body, error, extra = self._replay("http", url)
+                if extra and extra.get("raised"):
+                    raise ReplayedError(error)
+                return _ReplayedResponse(status_code, headers, self._body(body), error)
+
+            return replay_get
+
+        def record_get(url, headers, timeout):
+            try:
+                response = http_get(url, headers, timeout)
+            except Exception as exc:
+                self._record("http", url, error=str(exc), extra={"raised": True})
+                raise
+
+            def finish(content: bytes, error: str | None) -> None:
+                self._record("http", url, response.status_code, response.headers, content, error)
+
+            return _RecordingResponse(response, finish)
+
+        return record_get
+
+    def wrap_robots(self, robots_fetch):
+        if self.replaying:
+
+            def replay_robots(url, _headers=None, _timeout=10):
+                status_code, headers, body, error, _extra = self._replay("robots", url)
+                if error is not None:
+                    raise ReplayedError(error)
+                return RobotsResponse(status_code=status_code, text=self._body(body).decode("utf-8"), headers=headers)
+
+            return replay_robots
+
+        def record_robots(url, headers=None, timeout=10):
+            try:
+                response = robots_fetch(url, headers, timeout)
+            except Exception as exc:
+                self._record("robots", url, error=str(exc))
+                raise
+            if isinstance(response, str):
+                response = RobotsResponse(status_code=200, text=response)
+            text = (response.text or "").encode("utf-8")
+            self._record("robots", url, response.status_code, response.headers, text)
+            return response
+
+        return record_robots
+
+    def _tool_key(self, command: list[str], raw_dir: Path) -> str:
+        # Run directories differ between recording and replay; the rest of the command does not.
+        replacements = [(str(raw_dir), "{raw}")]
+        if self.runs_dir is not None:
+            replacements.append((str(self.runs_dir), "{runs}"))
+        normalized = []
+        for arg in command:
+            for old, new in replacements:
+                arg = arg.replace(old, new)
+            normalized.append(arg)
+        return json.dumps(normalized)
+
+    def wrap_runner(self, runner, run_paths):
+        raw_dir = Path(run_paths.raw_dir).resolve()
+        if self.replaying:
+
+            def replay_runner(command, cwd, _env, _timeout):
+                try:
+                    returncode, _headers, stdout, error, extra = self._replay("tool", self._tool_key(command, raw_dir))
+                except CassetteMiss as exc:
+                    return ToolResult(command=command, cwd=cwd, returncode=-1, stdout="", stderr="", error=str(exc))
+                extra = extra or {}
+                for relative, digest in (extra.get("files") or {}).items():
+                    target = raw_dir / relative
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    target.write_bytes(self._body(digest))
+                return ToolResult(
+                    command=command,
+                    cwd=cwd,
+                    returncode=returncode,
+                    stdout=self._body(stdout).decode("utf-8"),
+                    stderr=self._body(extra.get("stderr")).decode("utf-8"),
+                    error=error,
+                )
+
+            return replay_runner
+
+        def record_runner(command, cwd, env, timeout):
+            result = runner(command, cwd, env, timeout)
+            files = {}
+            for output in _outputs(command, raw_dir):
+                for path in sorted(output.rglob("*")) if output.is_dir() else [output]:
+                    if path.is_file():
+                        files[path.relative_to(raw_dir).as_posix()] = path.read_bytes()
+            with self._lock, self._db:
+                stored = {relative: self._put(data) for relative, data in files.items()}
+                stderr = self._put(result.stderr.encode("utf-8"))
+            self._record(
+                "tool",
+                self._tool_key(command, raw_dir),
+                result.returncode,
+                body=result.stdout.encode("utf-8"),
+                error=result.error,
+                extra={"files": stored, "stderr": stderr},
+            )
+            return result
+
+        return record_runner
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+def _outputs(command: list[str], raw_dir: Path) -> list[Path]:
+    """Paths in a tool command that point into the run's raw directory: where the tool writes its output."""
+    outputs = []
+    for arg in command:
+        try:
+            path = Path(arg).resolve()
+            path.relative_to(raw_dir)
+        except (ValueError, OSError):
+            continue
+        if path != raw_dir and path.exists():
+            outputs.append(path)
+    return outputs
+
+
+def build_cassette(config: dict) -> Cassette | None:
+    cassette_cfg = config.get("cassette") or {}
+    mode = cassette_cfg.get("mode")
+    if not mode:
+        return None
+    if not cassette_cfg.get("path"):
+        raise ValueError("[cassette] path is required when a cassette mode is set")
+    runs_dir = (config.get("output") or {}).get("runs_dir")
+    return Cassette(Path(cassette_cfg["path"]).resolve(), mode, runs_dir=Path(runs_dir) if runs_dir else None)
@@ -1,30 +1,106 @@
 from __future__ import annotations
 
-from pathlib import Path
 import tomllib
-
+from pathlib import Path
 
 DEFAULT_CONFIG = {
     "http": {
         "user_agent": "OpenFootprint/0.1 (+https://example.com)",
         "timeout_seconds": 15,
+        "pool_connections": 32,
+        "pool_maxsize": 8,
+        "max_retries": 0,
+        "max_body_bytes": 5 * 1024 * 1024,
+        "max_body_bytes_by_source": {},
+    },
+    "concurrency": {
+        "max_workers": 8,
+        "per_host": 2,
     },
     "rate_limit": {
         "min_interval_seconds": 1.0,
+        "burst": 1,
+        "backoff_factor": 2.0,
+        "recovery_factor": 0.8,
+        "max_backoff_multiplier": 16.0,
+        "hosts": {},
+        "sources": {},
+        "shared_path": "",
+    },
+    "cache": {
+        "enabled": False,
+        "dir": "",
+        "default_ttl_seconds": 3600,
+        "max_bytes": 256 * 1024 * 1024,
+        "ttl_seconds": {},
+    },
+    "robots": {
+        "persist": False,
+        "dir": "",
+        "ttl_seconds": 86400,
+        "error_ttl_seconds": 600,
+        "timeout_seconds": 10,
     },
     "sources": {
         "enabled": [],
         "disabled": [],
+        "plugins": [],
+        "entry_points": False,
+    },
+    "batch": {
+        "max_in_flight": 4,
+    },
+    "service": {
+        "host": "127.0.0.1",
+        "port": 8765,
+        "workers": 4,
+        "max_queued": 100,
+        "retain_jobs": 1000,
+    },
+    "queue": {
+        "path": "",
+        "lease_seconds": 300,
+        "max_attempts": 3,
+        "poll_seconds": 2,
+    },
+    "reporting": {
+        "json_format": "full",
+        "json_indent": 2,
+        "json_backend": "auto",
+    },
+    "parsing": {
+        "title_backend": "auto",
+    },
+    "cassette": {
+        "mode": "",
+        "path": "",
     },
     "output": {
         "runs_dir": "runs",
     },
+    "storage": {
+        "backend": "files",
+        "database_path": "",
+        "blobs": False,
+        "blob_dir": "",
+        "compression": "",
+    },
+    "index": {
+        "enabled": False,
+        "path": "",
+    },
     "tools": {
         "python_executable": "python3",
         "timeout_seconds": 120,
+        "max_parallel": 3,
         "sherlock_path": "third_party/sherlock",
         "maigret_path": "third_party/maigret",
         "whatsmyname_path": "third_party/WhatsMyName",
+        "whatsmyname_workers": 32,
+        "whatsmyname_per_domain": 2,
+        "whatsmyname_categories": [],
+        "whatsmyname_sites": [],
+        "whatsmyname_max_bytes": 1024 * 1024,
     },
 }
 
@@ -1,34 +1,132 @@
 from __future__ import annotations
 
-from collections import defaultdict
+from urllib.parse import urlsplit, urlunsplit
 
-from openfootprint.core.schema import Entity
+from openfootprint.core.schema import Entity, Evidence, Identifier
 
+_DEFAULT_PORTS = {"http": 80, "https": 443}
 
-def correlate_findings(findings):
-    buckets = defaultdict(list)
-    for finding in findings:
-        identifiers = [f"{ident.type}:{ident.value}" for ident in finding.entity.identifiers]
-        key = identifiers[0] if identifiers else finding.entity.entity_id
-        buckets[key].append(finding.entity)
-
-    merged = []
-    for _key, entities in buckets.items():
+
+def canonicalize_url(url: str) -> str:
+    # Profile URLs differ in scheme, host case, "www.", default ports and trailing slashes
+    # far more often than they differ in meaning; fold all of those away.
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    host = host.removeprefix("www.")
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    if port is not None and port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{port}"
+    if scheme in _DEFAULT_PORTS:
+        scheme = "https"
+    path = parts.path.rstrip("/").lower()
+    return urlunsplit((scheme, host, path, parts.query, ""))
+
+
+def identifier_key(identifier: Identifier) -> tuple[str, str]:
+    return identifier.type, identifier.value.strip().casefold()
+
+
+class DisjointSet:
+    def __init__(self) -> None:
+        self.parent: list[int] = []
+        self.size: list[int] = []
+
+    def add(self) -> int:
+        node = len(self.parent)
+        self.parent.append(node)
+        self.size.append(1)
+        return node
+
+    def find(self, node: int) -> int:
+        root = node
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[node] != root:
+            self.parent[node], node = root, self.parent[node]
+        return root
+
+    def union(self, left: int, right: int) -> int:
+        left, right = self.find(left), self.find(right)
+        if left == right:
+            return left
+        if self.size[left] < self.size[right]:
+            left, right = right, left
+        self.parent[right] = left
+        self.size[left] += self.size[right]
+        return left
+
+
+class Correlator:
+    """Merge entities that share any identifier or canonical profile URL.
+
+    Findings can be added one at a time as they stream in; entities() can be called at any point.
+    """
+
+    def __init__(self) -> None:
+        self.sets = DisjointSet()
+        self.entities_seen: list[Entity] = []
+        self.canonical_urls: list[list[str]] = []
+        self.owners: dict[tuple[str, ...], int] = {}
+
+    def add(self, finding) -> None:
+        entity = finding.entity
+        node = self.sets.add()
+        self.entities_seen.append(entity)
+        canonical = [canonicalize_url(url) for url in entity.profile_urls]
+        self.canonical_urls.append(canonical)
+        keys: list[tuple[str, ...]] = [("id",) + identifier_key(ident) for ident in entity.identifiers]
+        keys.extend(("url", url) for url in canonical)
+        if not keys:
+            keys.append(("entity", entity.entity_id))
+        for key in keys:
+            owner = self.owners.setdefault(key, node)
+            if owner != node:
+                self.sets.union(owner, node)
+
+    def extend(self, findings) -> None:
+        for finding in findings:
+            self.add(finding)
+
+    def entities(self) -> list[Entity]:
+        groups: dict[int, list[int]] = {}
+        for node in range(len(self.entities_seen)):
+            groups.setdefault(self.sets.find(node), []).append(node)
+        # Components keep the order in which their first member arrived.
+        return [self._merge(members) for members in groups.values()]
+
+    def _merge(self, members: list[int]) -> Entity:
+        entities = [self.entities_seen[node] for node in members]
         primary = entities[0]
-        profile_urls = []
-        identifiers = []
-        evidence = []
-        for entity in entities:
-            profile_urls.extend(entity.profile_urls)
-            identifiers.extend(entity.identifiers)
-            evidence.extend(entity.evidence)
-        merged.append(
-            Entity(
-                entity_id=primary.entity_id,
-                display_name=primary.display_name,
-                profile_urls=profile_urls,
-                identifiers=identifiers,
-                evidence=evidence,
-            )
+        profile_urls: dict[str, str] = {}
+        identifiers: dict[tuple[str, str], tuple[Identifier, dict]] = {}
+        evidence: dict[Evidence, None] = {}
+        for node, entity in zip(members, entities):
+            for canonical, url in zip(self.canonical_urls[node], entity.profile_urls):
+                profile_urls.setdefault(canonical, url)
+            for ident in entity.identifiers:
+                _, seen = identifiers.setdefault(identifier_key(ident), (ident, {}))
+                for item in ident.evidence:
+                    seen.setdefault(item, None)
+            for item in entity.evidence:
+                evidence.setdefault(item, None)
+        display_name = next((entity.display_name for entity in entities if entity.display_name), None)
+        return Entity(
+            entity_id=primary.entity_id,
+            display_name=display_name,
+            profile_urls=list(profile_urls.values()),
+            identifiers=[
+                Identifier(type=first.type, value=first.value, evidence=list(seen))
+                for first, seen in identifiers.values()
+            ],
+            evidence=list(evidence),
         )
-    return merged
+
+
+def correlate_findings(findings):
+    correlator = Correlator()
+    correlator.extend(findings)
+    return correlator.entities()
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Self
+from urllib.parse import urlparse
+
+
+@dataclass
+class HostSlots:
+    per_host: int
+    semaphores: dict[str, threading.BoundedSemaphore] = field(default_factory=dict)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    @contextmanager
+    def hold(self, host: str):
+        with self.lock:
+            semaphore = self.semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(max(1, self.per_host))
+                self.semaphores[host] = semaphore
+        with semaphore:
+            yield
+
+
+class FetchPool:
+    def __init__(self, fetcher, max_workers: int = 8, per_host: int = 2) -> None:
+        self.fetcher = fetcher
+        self.host_slots = HostSlots(per_host)
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="openfootprint-fetch")
+
+    def submit(self, url: str, source_id: str, headers: dict[str, str] | None = None) -> Future:
+        return self._executor.submit(self._fetch, url, source_id, headers)
+
+    def _fetch(self, url: str, source_id: str, headers: dict[str, str] | None):
+        with self.host_slots.hold(urlparse(url).netloc.lower()):
+            return self.fetcher.get(url, source_id, headers)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self.close()
@@ -1,6 +1,18 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from datetime import UTC, datetime
+from hashlib import sha256
+from typing import TYPE_CHECKING
+from urllib.parse import urlparse
+
+from openfootprint.core.cache import header_value
+
+if TYPE_CHECKING:
+    from openfootprint.storage.blobs import BlobRef
+
+DEFAULT_MAX_BODY_BYTES = 5 * 1024 * 1024
+CHUNK_SIZE = 64 * 1024
 
 
 @dataclass(frozen=True)
@@ -11,6 +23,11 @@ class FetchResult:
     content: bytes | None
     error: str | None
     skipped: bool = False
+    cache_status: str | None = None
+    truncated: bool = False
+    content_hash: str | None = None
+    blob: BlobRef | None = None
+    fetched_at: str | None = None
 
 
 class Fetcher:
@@ -22,6 +39,11 @@ class Fetcher:
         rate_limiter,
         http_get,
         robots_fetcher,
+        cache=None,
+        robots_timeout_seconds: float = 10,
+        max_body_bytes: int = DEFAULT_MAX_BODY_BYTES,
+        body_limits: dict[str, int] | None = None,
+        blob_store=None,
     ) -> None:
         self.user_agent = user_agent
         self.timeout_seconds = timeout_seconds
@@ -29,22 +51,137 @@ class Fetcher:
         self.rate_limiter = rate_limiter
         self.http_get = http_get
         self.robots_fetcher = robots_fetcher
+        self.cache = cache
+        self.robots_timeout_seconds = robots_timeout_seconds
+        self.max_body_bytes = max_body_bytes
+        self.body_limits = body_limits or {}
+        self.blob_store = blob_store
+
+    def body_limit(self, source_id: str) -> int:
+        return int(self.body_limits.get(source_id, self.max_body_bytes))
+
+    def _fetch_robots(self, robots_url: str, source_id: str):
+        # robots.txt is a real request to the same host: rate limit it and identify ourselves.
+        self.rate_limiter.wait(_host(robots_url), source_id)
+        return self.robots_fetcher(robots_url, {"User-Agent": self.user_agent}, self.robots_timeout_seconds)
 
     def get(self, url: str, source_id: str, headers: dict[str, str] | None = None) -> FetchResult:
-        if not self.robots_policy.allows(url, self.user_agent, self.robots_fetcher):
+        robots_fetcher = lambda robots_url: self._fetch_robots(robots_url, source_id)
+        if not self.robots_policy.allows(url, self.user_agent, robots_fetcher):
             return FetchResult(url=url, status_code=None, headers={}, content=None, error=None, skipped=True)
-        self.rate_limiter.wait(source_id)
+        merged = {"User-Agent": self.user_agent}
+        if headers:
+            merged.update(headers)
+
+        cache_key = None
+        cached = None
+        if self.cache is not None:
+            cache_key = self.cache.key("GET", url, merged)
+            cached = self.cache.lookup(cache_key)
+            if cached is not None and cached.is_fresh(self.cache.now()):
+                return _from_cache(cached, "hit", _timestamp(cached.stored_at))
+            if cached is not None:
+                merged.update(cached.validators())
+
+        host = _host(url)
+        self.rate_limiter.wait(host, source_id)
         try:
-            merged = {"User-Agent": self.user_agent}
-            if headers:
-                merged.update(headers)
             response = self.http_get(url, merged, self.timeout_seconds)
-            return FetchResult(
-                url=url,
-                status_code=response.status_code,
-                headers=dict(response.headers),
-                content=response.content,
-                error=None,
-            )
         except Exception as exc:  # noqa: BLE001 - surface as error string
             return FetchResult(url=url, status_code=None, headers={}, content=None, error=str(exc))
+        fetched_at = _timestamp()
+        try:
+            retry_after = header_value(response.headers, "Retry-After")
+            self.rate_limiter.feedback(host, response.status_code, retry_after, source_id)
+            if cached is not None and response.status_code == 304:
+                refreshed = self.cache.refresh(cache_key, source_id) or cached
+                # The server has just confirmed the stored body is current.
+                return _from_cache(refreshed, "revalidated", fetched_at)
+            try:
+                content, digest, truncated, blob = self._read_body(response, self.body_limit(source_id))
+            except Exception as exc:  # noqa: BLE001 - a body cut off mid-read is an error, not a result
+                return FetchResult(
+                    url=url, status_code=response.status_code, headers={}, content=None, error=str(exc)
+                )
+        finally:
+            close = getattr(response, "close", None)
+            if close is not None:
+                close()
+
+        result = FetchResult(
+            url=url,
+            status_code=response.status_code,
+            headers=dict(response.headers),
+            content=content,
+            error=None,
+            cache_status="miss" if self.cache is not None else None,
+            truncated=truncated,
+            content_hash=digest,
+            blob=blob,
+            fetched_at=fetched_at,
+        )
+        if self.cache is not None and not truncated:
+            self.cache.store(cache_key, source_id, url, result.status_code, result.headers, result.content)
+        return result
+
+    def _read_body(self, response, limit: int):
+        # Read at most `limit` bytes, hashing and spooling each chunk to the blob store as it arrives,
+        # so memory per request is bounded by the limit whatever the server sends.
+        if hasattr(response, "iter_content"):
+            chunks = response.iter_content(chunk_size=CHUNK_SIZE)
+        else:
+            chunks = [response.content or b""]
+        writer = self.blob_store.writer() if self.blob_store is not None else None
+        # The blob writer hashes what it stores; only bodies kept without it are hashed here.
+        digest = sha256()
+        consume = writer.write if writer is not None else digest.update
+        parts = []
+        size = 0
+        truncated = False
+        try:
+            for chunk in chunks:
+                if not chunk:
+                    continue
+                if size + len(chunk) > limit:
+                    chunk = chunk[: limit - size]
+                    truncated = True
+                consume(chunk)
+                parts.append(chunk)
+                size += len(chunk)
+                if truncated:
+                    break
+        except BaseException:
+            if writer is not None:
+                writer.abort()
+            raise
+        content = b"".join(parts)
+        del parts
+        blob = None
+        if writer is not None:
+            if content:
+                blob = writer.commit()
+            else:
+                writer.abort()
+        hexdigest = writer.hexdigest() if writer is not None else digest.hexdigest()
+        return content, hexdigest, truncated, blob
+
+
+def _host(url: str) -> str:
+    return urlparse(url).netloc.lower()
+
+
+def _timestamp(seconds: float | None = None) -> str:
+    moment = datetime.now(UTC) if seconds is None else datetime.fromtimestamp(seconds, UTC)
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _from_cache(cached, cache_status: str, fetched_at: str) -> FetchResult:
+    return FetchResult(
+        url=cached.url,
+        status_code=cached.status_code,
+        headers=dict(cached.headers),
+        content=cached.content,
+        error=None,
+        cache_status=cache_status,
+        fetched_at=fetched_at,
+    )
@@ -2,8 +2,6 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
-import phonenumbers
-
 
 def normalize_email(value: str | None) -> str | None:
     if value is None:
@@ -32,6 +30,8 @@ def normalize_phone(value: str | None) -> str | None:
     value = value.strip()
     if not value:
         return None
+    import phonenumbers  # deferred: loading its metadata is slow and most lookups have no phone
+
     parsed = phonenumbers.parse(value, None)
     if not phonenumbers.is_valid_number(parsed):
         raise ValueError("Phone number is not valid E.164")
@@ -52,7 +52,7 @@ class LookupInputs:
         email: str | None,
         phone: str | None,
         name: str | None,
-    ) -> "LookupInputs":
+    ) -> LookupInputs:
         return cls(
             username=normalize_username(username),
             email=normalize_email(email),
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from openfootprint.core.inputs import LookupInputs
+from openfootprint.core.pipeline import stream_lookup
+from openfootprint.nameintel.command import execute_nameintel
+from openfootprint.storage.runs import create_run_dir
+
+JOB_KINDS = ("lookup", "nameintel")
+
+
+def lookup_inputs(params: dict) -> LookupInputs:
+    try:
+        inputs = LookupInputs.from_raw(
+            params.get("username"), params.get("email"), params.get("phone"), params.get("name")
+        )
+    except Exception as exc:  # phonenumbers raises its own exception type
+        raise ValueError(str(exc)) from exc
+    if not any(inputs.__dict__.values()):
+        raise ValueError("lookup needs at least one of username, email, phone, name")
+    return inputs
+
+
+def validate_job(kind: str, params: dict) -> None:
+    if kind not in JOB_KINDS:
+        raise ValueError(f"Unknown job kind '{kind}'")
+    if kind == "lookup":
+        lookup_inputs(params)
+    elif not params.get("first") or not params.get("last"):
+        raise ValueError("nameintel needs first and last")
+
+
+def execute_job(kind: str, params: dict, registry, config: dict, context, on_start=None, on_finding=None, log=None):
+    """Run one lookup or nameintel job against a warm context and return its result payload.
+
+    Shared by the HTTP service and queue workers; on_start receives the run id as soon as the
+    run directory exists, on_finding each finding dict as it is produced.
+    """
+    validate_job(kind, params)
+    if kind == "lookup":
+        stream = stream_lookup(lookup_inputs(params), registry, config, context=context)
+        if on_start is not None:
+            on_start(stream.run_id)
+        for finding in stream:
+            if on_finding is not None:
+                on_finding(finding.to_dict())
+        return {
+            "run_id": stream.run_id,
+            "sources": stream.sources,
+            "finding_count": stream.finding_count,
+            "entities": [entity.to_dict() for entity in stream.correlator.entities()],
+            "paths": stream.paths,
+        }
+
+    run_paths = create_run_dir(Path(config["output"]["runs_dir"]).resolve())
+    if on_start is not None:
+        on_start(run_paths.run_dir.name)
+    return execute_nameintel(
+        config,
+        first=params["first"],
+        last=params["last"],
+        birth_year=params.get("birth_year"),
+        sherlock=bool(params.get("sherlock")),
+        dorks=bool(params.get("dorks")),
+        dorks_sites=list(params.get("dorks_sites") or ["linkedin", "instagram"]),
+        dorks_limit=int(params.get("dorks_limit", 1)),
+        keywords=params.get("keywords") or "",
+        crosslinked=bool(params.get("crosslinked")),
+        dry_run=bool(params.get("dry_run")),
+        run_paths=run_paths,
+        log=log or print,
+    )
@@ -1,93 +1,303 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
+import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
 from hashlib import sha256
 from pathlib import Path
+from typing import Self
 
-import requests
-
-from openfootprint.core.correlate import correlate_findings
-from openfootprint.core.fetcher import Fetcher
+from openfootprint.core.cache import build_response_cache
+from openfootprint.core.cassette import Cassette, build_cassette
+from openfootprint.core.correlate import Correlator
+from openfootprint.core.executor import FetchPool
+from openfootprint.core.fetcher import DEFAULT_MAX_BODY_BYTES, Fetcher
 from openfootprint.core.plan import build_plan
 from openfootprint.core.schema import RunManifest
-from openfootprint.policies.robots import RobotsPolicy
-from openfootprint.policies.rate_limit import RateLimiter
+from openfootprint.core.transport import shared_transport
+from openfootprint.policies.rate_limit import build_rate_limiter
+from openfootprint.policies.robots import RobotsResponse, build_robots_policy
 from openfootprint.reporting.console import render_console
-from openfootprint.reporting.json_report import render_json
-from openfootprint.reporting.markdown_report import render_markdown
-from openfootprint.storage.runs import create_run_dir, save_raw_artifact, write_text, write_manifest
+from openfootprint.reporting.json_report import json_report_writer
+from openfootprint.reporting.markdown_report import write_markdown_report
+from openfootprint.sources.parsers import set_title_backend
+from openfootprint.storage.blobs import BlobStore, build_blob_store
+from openfootprint.storage.index import IdentityIndex, build_identity_index
+from openfootprint.storage.rundb import RunDatabase, build_run_database, storage_backend
+from openfootprint.storage.runs import (
+    append_raw_ref,
+    create_run_dir,
+    iter_ndjson,
+    save_raw_artifact,
+    write_manifest,
+)
 from openfootprint.tools.subprocess import run_command
 
+# RFC 9309 asks crawlers to parse at least 500 KiB of robots.txt; anything beyond is ignored.
+ROBOTS_MAX_BYTES = 500 * 1024
+
 
 def _http_get(url, headers, timeout):
-    response = requests.get(url, headers=headers, timeout=timeout)
-    return response
+    # Streamed: the fetcher reads the body itself, under its per-source byte limit.
+    return shared_transport().get(url, headers=headers, timeout=timeout, stream=True)
+
 
+def _robots_fetch(url, headers=None, timeout=10, max_bytes=ROBOTS_MAX_BYTES):
+    response = shared_transport().get(url, headers=headers, timeout=timeout, stream=True)
+    try:
+        body = bytearray()
+        for chunk in response.iter_content(chunk_size=16384):
+            body.extend(chunk)
+            if len(body) >= max_bytes:
+                break
+        text = bytes(body[:max_bytes]).decode(response.encoding or "utf-8", errors="replace")
+        return RobotsResponse(status_code=response.status_code, text=text, headers=dict(response.headers))
+    finally:
+        response.close()
+
+
+@dataclass
+class LookupContext:
+    fetcher: Fetcher
+    pool: FetchPool
+    blob_store: BlobStore | None = None
+    index: IdentityIndex | None = None
+    run_db: RunDatabase | None = None
+    cassette: Cassette | None = None
+    tool_pool: ThreadPoolExecutor = field(
+        default_factory=lambda: ThreadPoolExecutor(max_workers=3, thread_name_prefix="openfootprint-tool")
+    )
 
-def _robots_fetch(url):
-    return requests.get(url, timeout=10).text
+    @property
+    def limiter(self):
+        return self.fetcher.rate_limiter
 
+    def close(self) -> None:
+        self.pool.close()
+        self.tool_pool.shutdown(wait=True)
+        if self.limiter.shared is not None:
+            self.limiter.shared.close()
+        if self.blob_store is not None:
+            self.blob_store.close()
+        if self.index is not None:
+            self.index.close()
+        if self.run_db is not None:
+            self.run_db.close()
+        if self.cassette is not None:
+            self.cassette.close()
 
-def run_lookup(inputs, registry, config):
-    runs_dir = Path(config["output"]["runs_dir"]).resolve()
-    run_paths = create_run_dir(runs_dir)
+    def tool_runner(self, run_paths):
+        if self.cassette is None:
+            return run_command
+        return self.cassette.wrap_runner(run_command, run_paths)
 
-    policy = RobotsPolicy()
-    limiter = RateLimiter(min_interval=config["rate_limit"]["min_interval_seconds"])
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self.close()
+
+
+def build_context(config) -> LookupContext:
+    cassette = build_cassette(config)
+    http_get, robots_fetch = _http_get, _robots_fetch
+    if cassette is not None:
+        config = cassette.configure(config)
+        http_get, robots_fetch = cassette.wrap_http(http_get), cassette.wrap_robots(robots_fetch)
+    shared_transport(config.get("http", {}))
+    set_title_backend(config.get("parsing", {}).get("title_backend", "auto"))
+    http_cfg = config["http"]
+    blob_store = build_blob_store(config)
+    rate_limiter = build_rate_limiter(config)
+    if cassette is not None and cassette.replaying:
+        # Recorded 429s still count in the metrics, but nothing waits out a Retry-After on replay.
+        rate_limiter.sleeper = lambda _seconds: None
     fetcher = Fetcher(
         config["http"]["user_agent"],
         config["http"]["timeout_seconds"],
-        policy,
-        limiter,
-        _http_get,
-        _robots_fetch,
+        build_robots_policy(config),
+        rate_limiter,
+        http_get,
+        robots_fetch,
+        cache=build_response_cache(config),
+        robots_timeout_seconds=float(config.get("robots", {}).get("timeout_seconds", 10)),
+        max_body_bytes=int(http_cfg.get("max_body_bytes", DEFAULT_MAX_BODY_BYTES)),
+        body_limits=http_cfg.get("max_body_bytes_by_source") or {},
+        blob_store=blob_store,
     )
-
-    plan = build_plan(inputs, registry)
-    findings = []
-    for request in plan:
-        source = registry.get(request.source_id)
-        if not source:
-            continue
-        if request.transport == "tool" and source.execute:
-            findings.extend(source.execute(request, inputs, run_paths, config, run_command))
-            continue
-        result = fetcher.get(request.url, request.source_id, request.headers)
-        raw_info = []
-        if result.content:
-            raw_path = save_raw_artifact(run_paths, result.url, result.content)
-            raw_hash = sha256(result.content).hexdigest()
-            raw_info.append((str(raw_path), raw_hash))
-        findings.extend(source.parse(result, inputs, raw_info))
-
-    entities = correlate_findings(findings)
-    run_id = run_paths.run_dir.name
-    started_at = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
-    manifest = RunManifest(
-        run_id=run_id,
-        inputs=inputs.__dict__,
-        sources=[req.source_id for req in plan],
-        started_at=started_at,
-        finished_at=datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
-        config=config,
+    concurrency = config.get("concurrency", {})
+    pool = FetchPool(
+        fetcher,
+        max_workers=int(concurrency.get("max_workers", 8)),
+        per_host=int(concurrency.get("per_host", 2)),
+    )
+    # Each tool run is a subprocess; the pool size is the number of tool processes allowed at once.
+    tool_pool = ThreadPoolExecutor(
+        max_workers=max(1, int(config.get("tools", {}).get("max_parallel", 3))),
+        thread_name_prefix="openfootprint-tool",
     )
+    return LookupContext(
+        fetcher=fetcher,
+        pool=pool,
+        blob_store=blob_store,
+        index=build_identity_index(config),
+        run_db=build_run_database(config),
+        cassette=cassette,
+        tool_pool=tool_pool,
+    )
+
+
+class LookupStream:
+    def __init__(self, inputs, registry, config, context=None, run_paths=None) -> None:
+        self.inputs = inputs
+        self.registry = registry
+        self.config = config
+        self.context = context
+        self.run_paths = run_paths or create_run_dir(Path(config["output"]["runs_dir"]).resolve())
+        self.run_id = self.run_paths.run_dir.name
+        self.plan = build_plan(inputs, registry)
+        self.sources = [req.source_id for req in self.plan]
+        self.started_at = datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
+        self.findings_path = self.run_paths.run_dir / "findings.ndjson"
+        self.finding_count = 0
+        self.correlator = Correlator()
+        self.write_json_report = json_report_writer(config)
+        self.paths: dict[str, str] | None = None
+
+    def __iter__(self):
+        if self.context is not None:
+            yield from self._run(self.context)
+            return
+        with build_context(self.config) as owned:
+            yield from self._run(owned)
+
+    def _run(self, context):
+        cache_stats = {"hits": [], "revalidated": [], "misses": 0}
+        with self.findings_path.open("w", encoding="utf-8") as ndjson:
+            for findings in self._execute(context, cache_stats):
+                for finding in findings:
+                    ndjson.write(json.dumps(finding.to_dict(), sort_keys=True) + "\n")
+                    self.correlator.add(finding)
+                    self.finding_count += 1
+                ndjson.flush()
+                yield from findings
+
+        manifest = RunManifest(
+            run_id=self.run_id,
+            inputs=self.inputs.__dict__,
+            sources=self.sources,
+            started_at=self.started_at,
+            finished_at=datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            config=self.config,
+            cache=cache_stats if context.fetcher.cache is not None else None,
+            rate_limit=context.limiter.metrics(),
+        )
+        run_dir = self.run_paths.run_dir
+        self.paths = {"findings": str(self.findings_path)}
+        if storage_backend(self.config) != "database":
+            # Reports are rebuilt from findings.ndjson so memory stays flat however many findings there are.
+            manifest_path = write_manifest(self.run_paths, manifest)
+            report_json_path = self.write_json_report(
+                run_dir / "report.json", iter_ndjson(self.findings_path), self.sources, self.run_id
+            )
+            report_md_path = write_markdown_report(
+                run_dir / "report.md", iter_ndjson(self.findings_path), self.sources, self.run_id
+            )
+            self.paths.update(
+                {
+                    "manifest": str(manifest_path),
+                    "report_json": str(report_json_path),
+                    "report_markdown": str(report_md_path),
+                }
+            )
+        if context.run_db is not None:
+            refs_path = self.run_paths.raw_dir / "refs.jsonl"
+            context.run_db.record_run(
+                manifest.to_dict(),
+                iter_ndjson(self.findings_path),
+                [entity.to_dict() for entity in self.correlator.entities()],
+                iter_ndjson(refs_path) if refs_path.exists() else (),
+                run_dir,
+            )
+            self.paths["database"] = str(context.run_db.path)
+        if context.index is not None:
+            context.index.index_run(manifest.to_dict(), iter_ndjson(self.findings_path), run_dir)
+
+    def _execute(self, context, cache_stats):
+        # Launch every HTTP request and tool run up front, then yield results in plan order as they complete.
+        pending = {}
+        tools = {}
+        runner = context.tool_runner(self.run_paths)
+        for index, request in enumerate(self.plan):
+            source = self.registry.get(request.source_id)
+            if not source:
+                continue
+            if request.transport == "tool" and source.execute:
+                tools[index] = context.tool_pool.submit(
+                    source.execute, request, self.inputs, self.run_paths, self.config, runner
+                )
+                continue
+            pending[index] = context.pool.submit(request.url, request.source_id, request.headers)
+
+        for index, request in enumerate(self.plan):
+            source = self.registry.get(request.source_id)
+            if not source:
+                continue
+            if index in tools:
+                yield tools[index].result()
+                continue
+            result = pending[index].result()
+            if result.cache_status == "hit":
+                cache_stats["hits"].append(result.url)
+            elif result.cache_status == "revalidated":
+                cache_stats["revalidated"].append(result.url)
+            elif result.cache_status == "miss":
+                cache_stats["misses"] += 1
+            raw_info = []
+            if result.content:
+                raw_info.append(self._store_raw(context, request.source_id, result))
+            yield source.parse(result, self.inputs, raw_info)
+
+    def _store_raw(self, context, source_id, result) -> tuple[str, str]:
+        # refs.jsonl maps every stored body back to its source and URL, so a run can be reparsed offline.
+        entry = {
+            "url": result.url,
+            "source_id": source_id,
+            "status_code": result.status_code,
+            "fetched_at": result.fetched_at,
+        }
+        store = context.blob_store
+        if store is None:
+            raw_path = save_raw_artifact(self.run_paths, result.url, result.content)
+            digest = result.content_hash or sha256(result.content).hexdigest()
+            entry.update({"digest": digest, "path": str(raw_path)})
+        else:
+            # Bodies live once in the shared blob store; the run only keeps a reference.
+            # Fresh downloads were already spooled there while being read; cache hits are stored now.
+            ref = result.blob or store.put(result.content)
+            store.record_url(result.url, ref.digest, self.run_id, source_id, result.status_code)
+            raw_path, digest = ref.path, ref.digest
+            entry.update({"digest": digest, "blob": str(raw_path)})
+        entry["size"] = len(result.content)
+        if result.truncated:
+            entry["truncated"] = True
+        append_raw_ref(self.run_paths, entry)
+        return str(raw_path), digest
+
 
-    console = render_console(findings, manifest.sources, run_id)
-    report_json = render_json(findings, manifest.sources, run_id)
-    report_md = render_markdown(findings, manifest.sources, run_id)
+def stream_lookup(inputs, registry, config, context=None, run_paths=None) -> LookupStream:
+    return LookupStream(inputs, registry, config, context=context, run_paths=run_paths)
 
-    manifest_path = write_manifest(run_paths, manifest)
-    report_json_path = write_text(run_paths.run_dir, "report.json", report_json)
-    report_md_path = write_text(run_paths.run_dir, "report.md", report_md)
 
+def run_lookup(inputs, registry, config, context=None, run_paths=None):
+    stream = stream_lookup(inputs, registry, config, context=context, run_paths=run_paths)
+    findings = list(stream)
+    entities = stream.correlator.entities()
     return {
-        "run_id": run_id,
+        "run_id": stream.run_id,
         "findings": findings,
         "entities": entities,
-        "console": console,
-        "paths": {
-            "manifest": str(manifest_path),
-            "report_json": str(report_json_path),
-            "report_markdown": str(report_md_path),
-        },
+        "console": render_console(findings, stream.sources, stream.run_id),
+        "paths": stream.paths,
     }
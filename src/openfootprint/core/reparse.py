@@ -0,0 +1,257 @@
+"""Rebuild a run's findings from the bodies and tool outputs it stored, with the parsers as they are now.
+
+Nothing is fetched: raw/refs.jsonl maps each stored body back to its source and request URL, tool
+sources read the reports their last execute() left under raw/tools/, and the rebuilt findings are
+correlated and written back over findings.ndjson and the reports.
+"""
+
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from openfootprint.core.correlate import Correlator
+from openfootprint.core.fetcher import FetchResult
+from openfootprint.core.inputs import LookupInputs
+from openfootprint.core.plan import build_plan
+from openfootprint.core.schema import Finding
+from openfootprint.reporting.json_report import json_report_writer
+from openfootprint.reporting.markdown_report import write_markdown_report
+from openfootprint.sources.parsers import set_title_backend
+from openfootprint.sources.registry import default_registry
+from openfootprint.storage.blobs import build_blob_store, read_blob
+from openfootprint.storage.index import build_identity_index
+from openfootprint.storage.rundb import (
+    build_run_database,
+    finding_evidence,
+    storage_backend,
+)
+from openfootprint.storage.runs import (
+    RunPaths,
+    iter_ndjson,
+    iter_run_dirs,
+    read_run_findings,
+    run_key,
+)
+
+
+def find_run_dir(runs_dir: Path, run_id: str) -> Path | None:
+    """A run directory by run id, or by its path under runs_dir for batch subjects."""
+    runs_dir = Path(runs_dir)
+    direct = runs_dir / run_id
+    if (direct / "manifest.json").exists():
+        return direct
+    for run_dir in iter_run_dirs(runs_dir):
+        if run_dir.name == run_id or run_key(run_id, run_dir, runs_dir) == run_id:
+            return run_dir
+    return None
+
+
+def raw_artifacts(run_dir: Path, findings: list[dict]) -> list[dict]:
+    """Stored bodies of a run as refs.jsonl entries ({url, source_id, status_code, fetched_at, digest, blob or path}).
+
+    Runs that kept per-run copies in raw/ before those were listed in refs.jsonl are mapped back
+    through the evidence of their findings, which covers every body that produced a finding.
+    """
+    refs_path = Path(run_dir) / "raw" / "refs.jsonl"
+    if refs_path.exists():
+        return list(iter_ndjson(refs_path))
+    artifacts: dict[str, dict] = {}
+    for finding in findings:
+        for evidence in finding_evidence(finding):
+            path = evidence.get("raw_path") or ""
+            if path.endswith(".bin") and path not in artifacts:
+                artifacts[path] = {
+                    "url": evidence.get("request_url"),
+                    "source_id": evidence.get("source_id"),
+                    "status_code": 200,
+                    "fetched_at": evidence.get("fetched_at"),
+                    "digest": evidence.get("raw_hash"),
+                    "path": path,
+                }
+    return list(artifacts.values())
+
+
+def _read_body(artifact: dict, run_dir: Path, store) -> bytes:
+    stored = artifact.get("blob") or artifact.get("path")
+    if stored and Path(stored).exists():
+        return read_blob(Path(stored))
+    if stored:
+        # Run directories that were moved or exported carry their raw/ copies (or blob files) with them.
+        moved = Path(run_dir) / "raw" / Path(stored).name
+        if moved.exists():
+            return read_blob(moved)
+    if store is not None and artifact.get("digest"):
+        return store.read(artifact["digest"])
+    raise FileNotFoundError(f"Stored body not found for {artifact.get('url')}")
+
+
+def _parse_artifact(source, artifact: dict, inputs, run_dir: Path, store, started_at: str | None) -> list:
+    content = _read_body(artifact, run_dir, store)
+    result = FetchResult(
+        url=artifact["url"],
+        status_code=artifact.get("status_code"),
+        headers={},
+        content=content,
+        error=None,
+        truncated=bool(artifact.get("truncated")),
+        content_hash=artifact.get("digest"),
+        # Evidence keeps the time of the original fetch; refs.jsonl from before it was recorded there
+        # falls back to when the run started.
+        fetched_at=artifact.get("fetched_at") or started_at,
+    )
+    raw_path = artifact.get("blob") or artifact.get("path")
+    return source.parse(result, inputs, [(raw_path, artifact.get("digest"))])
+
+
+def _write_ndjson(path: Path, findings) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("w", encoding="utf-8") as handle:
+        for finding in findings:
+            handle.write(json.dumps(finding.to_dict(), sort_keys=True) + "\n")
+    os.replace(tmp, path)
+
+
+def reparse_run(run_dir: Path, registry, config: dict, store=None) -> dict:
+    """Rebuild one run in place and return {run_dir, run_id, manifest, findings, previous, entities}.
+
+    Requests are replayed in plan order so findings come out in the order a lookup produces them.
+    Findings from sources that cannot be rebuilt (no longer registered, or a tool without
+    parse_output) are kept as they were.
+    """
+    run_dir = Path(run_dir)
+    manifest = json.loads((run_dir / "manifest.json").read_text(encoding="utf-8"))
+    recorded = manifest.get("inputs") or {}
+    inputs = LookupInputs(**{key: recorded.get(key) for key in ("username", "email", "phone", "name")})
+    run_paths = RunPaths(run_dir=run_dir, raw_dir=run_dir / "raw")
+    started_at = manifest.get("started_at")
+    previous = list(read_run_findings(run_dir))
+
+    pending: dict[tuple[str | None, str | None], list[dict]] = {}
+    for artifact in raw_artifacts(run_dir, previous):
+        pending.setdefault((artifact.get("source_id"), artifact.get("url")), []).append(artifact)
+
+    sources = set(manifest.get("sources") or [])
+    findings = []
+    rebuilt: set[str | None] = set()
+    for request in build_plan(inputs, registry):
+        if request.source_id not in sources:
+            continue
+        source = registry.get(request.source_id)
+        if request.transport == "tool":
+            if source.parse_output is not None:
+                findings.extend(source.parse_output(inputs, run_paths))
+                rebuilt.add(request.source_id)
+            continue
+        for artifact in pending.pop((request.source_id, request.url), []):
+            findings.extend(_parse_artifact(source, artifact, inputs, run_dir, store, started_at))
+        rebuilt.add(request.source_id)
+    # Bodies the current plan no longer asks for, e.g. after a source changed its URL template.
+    for (source_id, _url), artifacts in pending.items():
+        source = registry.get(source_id)
+        if source is None or source.execute:
+            continue
+        for artifact in artifacts:
+            findings.extend(_parse_artifact(source, artifact, inputs, run_dir, store, started_at))
+        rebuilt.add(source_id)
+    findings.extend(Finding.from_dict(item) for item in previous if item.get("source_id") not in rebuilt)
+
+    correlator = Correlator()
+    correlator.extend(findings)
+    findings_path = run_dir / "findings.ndjson"
+    _write_ndjson(findings_path, findings)
+    if storage_backend(config) != "database":
+        run_id = manifest["run_id"]
+        run_sources = manifest.get("sources") or []
+        json_report_writer(config)(run_dir / "report.json", iter_ndjson(findings_path), run_sources, run_id)
+        write_markdown_report(run_dir / "report.md", iter_ndjson(findings_path), run_sources, run_id)
+    return {
+        "run_dir": str(run_dir),
+        "run_id": manifest["run_id"],
+        "manifest": manifest,
+        "findings": len(findings),
+        "previous": len(previous),
+        "entities": [entity.to_dict() for entity in correlator.entities()],
+    }
+
+
+# Per-process parsing state: sources are built from the manifest in each worker rather than pickled.
+_STATE: dict = {}
+
+
+def _init_worker(config: dict) -> None:
+    set_title_backend(config.get("parsing", {}).get("title_backend", "auto"))
+    _STATE["config"] = config
+    _STATE["registry"] = default_registry(config.get("sources"))
+    _STATE["store"] = build_blob_store(config)
+
+
+def _reparse_one(run_dir: str) -> dict:
+    try:
+        return reparse_run(Path(run_dir), _STATE["registry"], _STATE["config"], _STATE["store"])
+    except Exception as exc:  # noqa: BLE001 - one unreadable run must not stop the rest
+        return {"run_dir": run_dir, "error": f"{type(exc).__name__}: {exc}"}
+
+
+def reparse_runs(run_dirs, config: dict, workers: int | None = None, log=print) -> dict:
+    """Reparse run directories across a process pool; returns {runs, failed, findings}.
+
+    Each run is rebuilt and rewritten by a worker; the run database and identity index,
+    when configured, are updated here as results come back.
+    """
+    run_dirs = [str(Path(run_dir).resolve()) for run_dir in run_dirs]
+    workers = max(1, workers or os.cpu_count() or 1)
+    runs_dir = Path(config["output"]["runs_dir"]).resolve()
+    run_db = build_run_database(config)
+    index = build_identity_index(config)
+    summary = {"runs": 0, "failed": 0, "findings": 0}
+    pool = None
+    try:
+        if workers == 1 or len(run_dirs) <= 1:
+            _init_worker(config)
+            results: Iterable[dict] = map(_reparse_one, run_dirs)
+        else:
+            pool = ProcessPoolExecutor(
+                max_workers=min(workers, len(run_dirs)),
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(config,),
+            )
+            results = pool.map(_reparse_one, run_dirs, chunksize=max(1, len(run_dirs) // (workers * 4)))
+        for result in results:
+            run_dir = Path(result["run_dir"])
+            name = run_key(run_dir.name, run_dir, runs_dir)
+            if "error" in result:
+                summary["failed"] += 1
+                log(f"{name}\tfailed: {result['error']}")
+                continue
+            summary["runs"] += 1
+            summary["findings"] += result["findings"]
+            log(f"{name}\t{result['findings']} findings (was {result['previous']})")
+            findings_path = run_dir / "findings.ndjson"
+            if run_db is not None:
+                refs_path = run_dir / "raw" / "refs.jsonl"
+                run_db.record_run(
+                    result["manifest"],
+                    iter_ndjson(findings_path),
+                    result["entities"],
+                    iter_ndjson(refs_path) if refs_path.exists() else (),
+                    run_dir,
+                )
+            if index is not None:
+                index.index_run(result["manifest"], iter_ndjson(findings_path), run_dir)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        elif _STATE.get("store") is not None:
+            _STATE["store"].close()
+        _STATE.clear()
+        if run_db is not None:
+            run_db.close()
+        if index is not None:
+            index.close()
+    return summary
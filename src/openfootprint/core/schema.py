@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass, field
 from typing import Any
 
 
-@dataclass(frozen=True)
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+@dataclass(frozen=True, slots=True)
 class Evidence:
     source_id: str
     request_url: str
@@ -14,6 +19,12 @@ class Evidence:
     match_excerpt: str | None
     fetched_at: str
 
+    def __post_init__(self) -> None:
+        # Tool parsers build thousands of records that share these values, each as a freshly
+        # formatted string; interning keeps one copy per distinct value.
+        for name in ("source_id", "raw_path", "raw_hash", "parser_id", "fetched_at"):
+            object.__setattr__(self, name, _intern(getattr(self, name)))
+
     def to_dict(self) -> dict[str, Any]:
         return {
             "source_id": self.source_id,
@@ -25,13 +36,29 @@ class Evidence:
             "fetched_at": self.fetched_at,
         }
 
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Evidence:
+        return cls(
+            source_id=data["source_id"],
+            request_url=data["request_url"],
+            raw_path=data["raw_path"],
+            raw_hash=data["raw_hash"],
+            parser_id=data["parser_id"],
+            match_excerpt=data.get("match_excerpt"),
+            fetched_at=data["fetched_at"],
+        )
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class Identifier:
     type: str
     value: str
     evidence: list[Evidence] = field(default_factory=list)
 
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "type", _intern(self.type))
+        object.__setattr__(self, "value", _intern(self.value))
+
     def to_dict(self) -> dict[str, Any]:
         return {
             "type": self.type,
@@ -39,8 +66,16 @@ class Identifier:
             "evidence": [ev.to_dict() for ev in self.evidence],
         }
 
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Identifier:
+        return cls(
+            type=data["type"],
+            value=data["value"],
+            evidence=[Evidence.from_dict(ev) for ev in data.get("evidence") or []],
+        )
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class Entity:
     entity_id: str
     display_name: str | None
@@ -57,8 +92,18 @@ class Entity:
             "evidence": [ev.to_dict() for ev in self.evidence],
         }
 
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Entity:
+        return cls(
+            entity_id=data["entity_id"],
+            display_name=data.get("display_name"),
+            profile_urls=list(data.get("profile_urls") or []),
+            identifiers=[Identifier.from_dict(ident) for ident in data.get("identifiers") or []],
+            evidence=[Evidence.from_dict(ev) for ev in data.get("evidence") or []],
+        )
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class Artifact:
     url: str
     title: str | None
@@ -73,8 +118,17 @@ class Artifact:
             "evidence": [ev.to_dict() for ev in self.evidence],
         }
 
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Artifact:
+        return cls(
+            url=data["url"],
+            title=data.get("title"),
+            snippet=data.get("snippet"),
+            evidence=[Evidence.from_dict(ev) for ev in data.get("evidence") or []],
+        )
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class Finding:
     source_id: str
     type: str
@@ -82,6 +136,10 @@ class Finding:
     artifacts: list[Artifact] = field(default_factory=list)
     confidence: str = "medium"
 
+    def __post_init__(self) -> None:
+        for name in ("source_id", "type", "confidence"):
+            object.__setattr__(self, name, _intern(getattr(self, name)))
+
     def to_dict(self) -> dict[str, Any]:
         return {
             "source_id": self.source_id,
@@ -91,6 +149,16 @@ class Finding:
             "confidence": self.confidence,
         }
 
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Finding:
+        return cls(
+            source_id=data["source_id"],
+            type=data["type"],
+            entity=Entity.from_dict(data["entity"]),
+            artifacts=[Artifact.from_dict(artifact) for artifact in data.get("artifacts") or []],
+            confidence=data.get("confidence", "medium"),
+        )
+
 
 @dataclass(frozen=True)
 class RunManifest:
@@ -100,6 +168,8 @@ class RunManifest:
     started_at: str
     finished_at: str | None
     config: dict[str, Any]
+    cache: dict[str, Any] | None = None
+    rate_limit: dict[str, Any] | None = None
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -109,4 +179,6 @@ class RunManifest:
             "started_at": self.started_at,
             "finished_at": self.finished_at,
             "config": self.config,
+            "cache": self.cache,
+            "rate_limit": self.rate_limit,
         }
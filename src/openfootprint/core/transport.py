@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import threading
+from http.cookiejar import DefaultCookiePolicy
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class HttpTransport:
+    def __init__(self, pool_connections: int = 32, pool_maxsize: int = 8, max_retries: int = 0) -> None:
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        # One Session keeps a urllib3 pool per host, so keep-alive and TLS sessions are reused.
+        self.session = requests.Session()
+        # The session is shared by every lookup in the process: a cookie one subject's request was given
+        # must not ride along on the next subject's requests to that site.
+        self.session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=max_retries,
+            pool_block=False,
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def get(self, url: str, headers: dict[str, str] | None = None, timeout: float | None = None, **kwargs):
+        return self.session.get(url, headers=headers, timeout=timeout, **kwargs)
+
+    def post(self, url: str, headers: dict[str, str] | None = None, timeout: float | None = None, **kwargs):
+        return self.session.post(url, headers=headers, timeout=timeout, **kwargs)
+
+    def close(self) -> None:
+        self.session.close()
+
+
+_shared: HttpTransport | None = None
+_shared_lock = threading.Lock()
+
+
+def shared_transport(http_config: dict | None = None) -> HttpTransport:
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            http_config = http_config or {}
+            _shared = HttpTransport(
+                pool_connections=int(http_config.get("pool_connections", 32)),
+                pool_maxsize=int(http_config.get("pool_maxsize", 8)),
+                max_retries=int(http_config.get("max_retries", 0)),
+            )
+        return _shared
+
+
+def reset_shared_transport() -> None:
+    global _shared
+    with _shared_lock:
+        if _shared is not None:
+            _shared.close()
+        _shared = None
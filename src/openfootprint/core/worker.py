@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import copy
+import os
+import socket
+import threading
+from pathlib import Path
+from typing import Self
+
+from openfootprint.core.jobs import execute_job, validate_job
+from openfootprint.core.pipeline import build_context
+from openfootprint.storage.queue import LeaseLost
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def worker_config(config: dict, queue) -> dict:
+    """Workers share per-host politeness through a throttle file next to the queue unless one is configured."""
+    config = copy.deepcopy(config)
+    rate_cfg = config.setdefault("rate_limit", {})
+    if not rate_cfg.get("shared_path"):
+        rate_cfg["shared_path"] = str(Path(queue.path).parent / "hosts.sqlite")
+    return config
+
+
+class _Heartbeat:
+    """Extends a job's lease in the background while the job runs."""
+
+    def __init__(self, queue, job_id: str, worker_id: str, lease_seconds: float) -> None:
+        self.queue = queue
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds
+        self.run_id: str | None = None
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._beat, name="openfootprint-heartbeat", daemon=True)
+
+    def _beat(self) -> None:
+        while not self.stopped.wait(self.lease_seconds / 3):
+            try:
+                self.queue.heartbeat(self.job_id, self.worker_id, self.lease_seconds, run_id=self.run_id)
+            except LeaseLost:
+                return
+
+    def started(self, run_id: str) -> None:
+        self.run_id = run_id
+
+    def __enter__(self) -> Self:
+        self.thread.start()
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self.stopped.set()
+        self.thread.join()
+
+
+def run_worker(
+    queue,
+    registry,
+    config: dict,
+    worker_id: str | None = None,
+    lease_seconds: float = 300.0,
+    poll_seconds: float = 2.0,
+    max_jobs: int | None = None,
+    drain: bool = False,
+    stop: threading.Event | None = None,
+    log=print,
+) -> int:
+    """Claim and run jobs until stopped; returns the number of jobs processed.
+
+    With drain=True the worker exits as soon as the queue has nothing left to lease.
+    One warm LookupContext serves every job the worker runs.
+    """
+    worker_id = worker_id or default_worker_id()
+    stop = stop or threading.Event()
+    processed = 0
+    with build_context(config) as context:
+        while not stop.is_set() and (max_jobs is None or processed < max_jobs):
+            job = queue.claim(worker_id, lease_seconds)
+            if job is None:
+                if drain:
+                    break
+                stop.wait(poll_seconds)
+                continue
+            log(f"[{worker_id}] job {job['job_id']} ({job['kind']}, attempt {job['attempts']})")
+            job_id = job["job_id"]
+            processed += 1
+            try:
+                validate_job(job["kind"], job["params"])
+            except ValueError as exc:
+                # Bad parameters fail the same way on every worker; retrying would not help.
+                queue.fail(job_id, worker_id, str(exc), retry=False)
+                continue
+            try:
+                with _Heartbeat(queue, job_id, worker_id, lease_seconds) as heartbeat:
+                    try:
+                        result = execute_job(
+                            job["kind"],
+                            job["params"],
+                            registry,
+                            config,
+                            context,
+                            on_start=heartbeat.started,
+                            log=log,
+                        )
+                    except Exception as exc:  # noqa: BLE001 - the worker keeps going after a failed job
+                        queue.fail(job_id, worker_id, str(exc))
+                    else:
+                        queue.complete(job_id, worker_id, result)
+            except LeaseLost:
+                log(f"[{worker_id}] lost the lease on job {job_id}; another worker will rerun it")
+    return processed
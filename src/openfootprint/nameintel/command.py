@@ -2,21 +2,27 @@ from __future__ import annotations
 
 import json
 import os
-from datetime import datetime, timezone
+from datetime import UTC, datetime
 from pathlib import Path
 
 from openfootprint.core.config import load_config
 from openfootprint.core.inputs import LookupInputs
 from openfootprint.core.schema import RunManifest
+from openfootprint.core.transport import shared_transport
 from openfootprint.nameintel.crosslinked import is_crosslinked_available
 from openfootprint.nameintel.dorks import build_dork_queries
 from openfootprint.nameintel.permutations import generate_permutations
-from openfootprint.nameintel.serpapi import SerpApiClient, query_to_artifact_name, write_serpapi_artifact
+from openfootprint.nameintel.serpapi import (
+    SerpApiClient,
+    query_to_artifact_name,
+    write_serpapi_artifact,
+)
 from openfootprint.storage.runs import create_run_dir, write_manifest, write_text
 from openfootprint.tools.subprocess import run_command
 
 
-def run_nameintel(
+def execute_nameintel(
+    config: dict,
     *,
     first: str,
     last: str,
@@ -28,17 +34,13 @@ def run_nameintel(
     keywords: str,
     crosslinked: bool,
     dry_run: bool,
-    config_path: str | None,
-    output: str | None,
-) -> int:
-    config = load_config(config_path)
-    if output:
-        config["output"]["runs_dir"] = output
-
+    run_paths=None,
+    log=print,
+) -> dict:
     runs_dir = Path(config["output"]["runs_dir"]).resolve()
-    run_paths = create_run_dir(runs_dir)
+    run_paths = run_paths or create_run_dir(runs_dir)
     run_id = run_paths.run_dir.name
-    started_at = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    started_at = datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
 
     full_name = f"{first} {last}".strip()
     perms = generate_permutations(first=first, last=last, birth_year=birth_year, limit=100)
@@ -58,7 +60,7 @@ def run_nameintel(
 
     estimated_cost = len(dork_queries) if dorks else 0
     if dorks:
-        print(f"[i] Estimated cost: {estimated_cost} SerpAPI credits")
+        log(f"[i] Estimated cost: {estimated_cost} SerpAPI credits")
 
     warnings: list[str] = []
     if crosslinked and not is_crosslinked_available():
@@ -68,7 +70,7 @@ def run_nameintel(
     if dorks and not dry_run:
         if not os.getenv("SERPAPI_API_KEY"):
             raise RuntimeError("SERPAPI_API_KEY is required for --dorks (or use --dry-run)")
-        client = SerpApiClient()
+        client = SerpApiClient(transport=shared_transport(config.get("http")))
         for site_key in dorks_sites:
             for query in [q for q in dork_queries if f"site:{site_key}" in q or site_key in q]:
                 _ = site_key
@@ -98,7 +100,6 @@ def run_nameintel(
     if sherlock and not dry_run:
         try:
             from openfootprint.sources.tools.sherlock import SOURCE as SHERLOCK_SOURCE
-            from openfootprint.sources.base import RequestSpec
 
             for username in perms:
                 inputs = LookupInputs.from_raw(username, None, None, None)
@@ -143,7 +144,7 @@ def run_nameintel(
         inputs={"name": full_name, "username": None, "email": None, "phone": None},
         sources=[s for s in ["nameintel"] if s],
         started_at=started_at,
-        finished_at=datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        finished_at=datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%SZ"),
         config=config,
     )
 
@@ -161,7 +162,43 @@ def run_nameintel(
     if warnings:
         md_lines.extend(["", "## Warnings", *[f"- {w}" for w in warnings]])
     write_text(run_paths.run_dir, "report.md", "\n".join(md_lines) + "\n")
+    return {"run_id": run_id, "run_dir": str(run_paths.run_dir), "payload": payload}
 
+
+def run_nameintel(
+    *,
+    first: str,
+    last: str,
+    birth_year: int | None,
+    sherlock: bool,
+    dorks: bool,
+    dorks_sites: list[str],
+    dorks_limit: int,
+    keywords: str,
+    crosslinked: bool,
+    dry_run: bool,
+    config_path: str | None,
+    output: str | None,
+) -> int:
+    config = load_config(config_path)
+    if output:
+        config["output"]["runs_dir"] = output
+
+    result = execute_nameintel(
+        config,
+        first=first,
+        last=last,
+        birth_year=birth_year,
+        sherlock=sherlock,
+        dorks=dorks,
+        dorks_sites=dorks_sites,
+        dorks_limit=dorks_limit,
+        keywords=keywords,
+        crosslinked=crosslinked,
+        dry_run=dry_run,
+    )
+    perms = result["payload"]["nameintel"]["permutations"]
+    dork_queries = result["payload"]["nameintel"]["dorks"]["queries"]
     print(f"Permutations ({len(perms)}):")
     for p in perms:
         print(f"- {p}")
@@ -169,5 +206,5 @@ def run_nameintel(
         print("Dorks:")
         for q in dork_queries:
             print(f"- {q}")
-    print(f"[i] Run: {run_paths.run_dir}")
+    print(f"[i] Run: {result['run_dir']}")
     return 0
@@ -6,7 +6,7 @@ import os
 import time
 from dataclasses import dataclass
 
-import requests
+from openfootprint.core.transport import shared_transport
 
 
 def query_to_artifact_name(*, site: str, query: str) -> str:
@@ -21,9 +21,10 @@ class SerpApiResult:
 
 
 class SerpApiClient:
-    def __init__(self, *, api_key: str | None = None, sleep_seconds: float = 1.0):
+    def __init__(self, *, api_key: str | None = None, sleep_seconds: float = 1.0, transport=None):
         self.api_key = api_key or os.getenv("SERPAPI_API_KEY")
         self.sleep_seconds = float(sleep_seconds)
+        self.transport = transport or shared_transport()
 
     def search(self, *, query: str, num: int = 10) -> SerpApiResult:
         if not self.api_key:
@@ -34,7 +35,7 @@ class SerpApiClient:
             "num": int(num),
             "api_key": self.api_key,
         }
-        resp = requests.get("https://serpapi.com/search.json", params=params, timeout=30)
+        resp = self.transport.get("https://serpapi.com/search.json", params=params, timeout=30)
         resp.raise_for_status()
         payload = resp.json()
         time.sleep(self.sleep_seconds)
@@ -1,23 +1,254 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+import asyncio
+import threading
 import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+
+from openfootprint.storage import sqlite
+
+THROTTLE_STATUSES = {429, 503}
+
+
+@dataclass(frozen=True)
+class BucketRule:
+    rate: float
+    burst: float = 1.0
+
+
+@dataclass
+class TokenBucket:
+    rule: BucketRule
+    tokens: float
+    updated: float
+    penalty: float = 1.0
+    blocked_until: float = 0.0
+
+    def reserve(self, current: float) -> float:
+        # Tokens may go negative: each caller reserves a future slot and sleeps until it arrives.
+        rate = self.rule.rate / self.penalty
+        delay = max(0.0, self.blocked_until - current)
+        if rate <= 0:
+            return delay
+        self.tokens = min(self.rule.burst, self.tokens + (current - self.updated) * rate)
+        self.updated = current
+        self.tokens -= 1
+        if self.tokens < 0:
+            delay = max(delay, -self.tokens / rate)
+        return delay
+
+
+@dataclass
+class WaitStats:
+    requests: int = 0
+    waits: int = 0
+    wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+    throttled: int = 0
+
+    def to_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "waits": self.waits,
+            "wait_seconds": round(self.wait_seconds, 3),
+            "max_wait_seconds": round(self.max_wait_seconds, 3),
+            "throttled": self.throttled,
+        }
+
+
+def parse_retry_after(value: str | None, wall_clock=time.time) -> float | None:
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - wall_clock())
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+class SharedHostThrottle:
+    """Per-key request slots shared by every process that opens the same SQLite file.
+
+    Each key stores the wall-clock time of its next free slot. A reservation takes the
+    write lock, books the slot and pushes it forward by the caller's interval, so workers
+    on different hosts sharing the file space their requests to one site between them.
+    """
+
+    def __init__(self, path: Path, clock=time.time) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._db = sqlite.connect(self.path, isolation_level=None)
+        self._db.execute("CREATE TABLE IF NOT EXISTS hosts (host TEXT PRIMARY KEY, next_at REAL NOT NULL)")
+
+    def _update(self, key: str, func) -> float:
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                now = self.clock()
+                row = self._db.execute("SELECT next_at FROM hosts WHERE host = ?", (key,)).fetchone()
+                delay, next_at = func(now, row[0] if row else now)
+                self._db.execute("INSERT OR REPLACE INTO hosts (host, next_at) VALUES (?, ?)", (key, next_at))
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+            return delay
+
+    def reserve(self, key: str, interval: float, not_before: float = 0.0) -> float:
+        """Book the next slot for key no earlier than not_before seconds from now; returns the delay."""
+
+        def book(now, next_at):
+            start = max(now + not_before, next_at)
+            return start - now, start + interval
+
+        return self._update(key, book)
+
+    def block(self, key: str, seconds: float) -> None:
+        self._update(key, lambda now, next_at: (0.0, max(next_at, now + seconds)))
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
 
 
 @dataclass
 class RateLimiter:
     min_interval: float
-    now: callable = time.monotonic
-    sleeper: callable = time.sleep
-    last_seen: dict[str, float] = field(default_factory=dict)
-
-    def wait(self, key: str) -> None:
-        last = self.last_seen.get(key)
-        current = self.now()
-        if last is not None:
-            elapsed = current - last
-            if elapsed < self.min_interval:
-                sleep_for = self.min_interval - elapsed
-                self.sleeper(sleep_for)
-                current = current + sleep_for
-        self.last_seen[key] = current
+    now: Callable = time.monotonic
+    sleeper: Callable = time.sleep
+    burst: float = 1.0
+    hosts: dict[str, BucketRule] = field(default_factory=dict)
+    sources: dict[str, BucketRule] = field(default_factory=dict)
+    backoff_factor: float = 2.0
+    recovery_factor: float = 0.8
+    max_backoff_multiplier: float = 16.0
+    shared: SharedHostThrottle | None = None
+    buckets: dict[tuple[str, str | None], TokenBucket] = field(default_factory=dict)
+    stats: dict[str, WaitStats] = field(default_factory=dict)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def _rule(self, key: str, source_id: str | None) -> BucketRule:
+        if key in self.hosts:
+            return self.hosts[key]
+        if source_id is not None and source_id in self.sources:
+            return self.sources[source_id]
+        if key in self.sources:
+            return self.sources[key]
+        rate = 1.0 / self.min_interval if self.min_interval > 0 else 0.0
+        return BucketRule(rate=rate, burst=self.burst)
+
+    def _bucket_key(self, key: str, source_id: str | None) -> tuple[str, str | None]:
+        # A source with its own rule gets its own bucket on each host it uses, so its rule holds whichever
+        # source reached the host first; everything else on the host shares the host's bucket.
+        if key not in self.hosts and source_id is not None and source_id in self.sources:
+            return key, source_id
+        return key, None
+
+    def _bucket(self, key: str, source_id: str | None, current: float) -> TokenBucket:
+        bucket_key = self._bucket_key(key, source_id)
+        bucket = self.buckets.get(bucket_key)
+        if bucket is None:
+            rule = self._rule(key, source_id)
+            bucket = TokenBucket(rule=rule, tokens=rule.burst, updated=current)
+            self.buckets[bucket_key] = bucket
+        return bucket
+
+    def _record(self, key: str, delay: float) -> None:
+        stats = self.stats.setdefault(key, WaitStats())
+        stats.requests += 1
+        if delay > 0:
+            stats.waits += 1
+            stats.wait_seconds += delay
+            stats.max_wait_seconds = max(stats.max_wait_seconds, delay)
+
+    def reserve(self, key: str, source_id: str | None = None) -> float:
+        with self.lock:
+            current = self.now()
+            bucket = self._bucket(key, source_id, current)
+            delay = bucket.reserve(current)
+            interval = bucket.penalty / bucket.rule.rate if bucket.rule.rate > 0 else 0.0
+            if self.shared is None or interval <= 0:
+                self._record(key, delay)
+                return delay
+        # The shared file lock can be held by another process for a while: book there without
+        # holding our own lock, which every other host in this process needs too. Every process
+        # sharing the file books its slots there, so the host is spaced at the (penalised) rate
+        # across all of them, not once per process.
+        delay = max(delay, self.shared.reserve(key, interval, not_before=delay))
+        with self.lock:
+            self._record(key, delay)
+        return delay
+
+    def wait(self, key: str, source_id: str | None = None) -> float:
+        # Reserve the slot under the lock, sleep outside it so other keys are not blocked.
+        delay = self.reserve(key, source_id)
+        if delay > 0:
+            self.sleeper(delay)
+        return delay
+
+    acquire = wait
+
+    async def acquire_async(self, key: str, source_id: str | None = None) -> float:
+        delay = self.reserve(key, source_id)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def feedback(
+        self, key: str, status_code: int | None, retry_after: str | None = None, source_id: str | None = None
+    ) -> None:
+        if status_code is None:
+            return
+        pause = None
+        with self.lock:
+            current = self.now()
+            bucket = self._bucket(key, source_id, current)
+            if status_code in THROTTLE_STATUSES:
+                bucket.penalty = min(bucket.penalty * self.backoff_factor, self.max_backoff_multiplier)
+                pause = parse_retry_after(retry_after)
+                if pause is None and bucket.rule.rate > 0:
+                    pause = bucket.penalty / bucket.rule.rate
+                if pause:
+                    # The host refused us, not one source: hold back every bucket that sends to it.
+                    for (host, _source), other in self.buckets.items():
+                        if host == key:
+                            other.blocked_until = max(other.blocked_until, current + pause)
+                self.stats.setdefault(key, WaitStats()).throttled += 1
+            elif status_code < 400:
+                bucket.penalty = max(1.0, bucket.penalty * self.recovery_factor)
+        if pause and self.shared is not None:
+            self.shared.block(key, pause)
+
+    def metrics(self) -> dict[str, dict]:
+        with self.lock:
+            return {key: stats.to_dict() for key, stats in sorted(self.stats.items())}
+
+
+def _rules(section: dict | None) -> dict[str, BucketRule]:
+    rules = {}
+    for key, value in (section or {}).items():
+        rate = float(value.get("rate_per_second", 0))
+        rules[key] = BucketRule(rate=rate, burst=float(value.get("burst", 1)))
+    return rules
+
+
+def build_rate_limiter(config: dict) -> RateLimiter:
+    rate_cfg = config.get("rate_limit") or {}
+    shared_path = rate_cfg.get("shared_path")
+    return RateLimiter(
+        min_interval=float(rate_cfg.get("min_interval_seconds", 1.0)),
+        burst=float(rate_cfg.get("burst", 1)),
+        hosts=_rules(rate_cfg.get("hosts")),
+        sources=_rules(rate_cfg.get("sources")),
+        backoff_factor=float(rate_cfg.get("backoff_factor", 2.0)),
+        recovery_factor=float(rate_cfg.get("recovery_factor", 0.8)),
+        max_backoff_multiplier=float(rate_cfg.get("max_backoff_multiplier", 16.0)),
+        shared=SharedHostThrottle(Path(shared_path).resolve()) if shared_path else None,
+    )
@@ -1,21 +1,138 @@
 from __future__ import annotations
 
+import json
+import os
+import re
+import threading
+import time
+from collections.abc import Callable
 from dataclasses import dataclass, field
+from hashlib import sha256
+from pathlib import Path
 from urllib.parse import urlparse
 from urllib.robotparser import RobotFileParser
 
+_MAX_AGE = re.compile(r"max-age\s*=\s*(\d+)", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class RobotsResponse:
+    status_code: int | None
+    text: str
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class RobotsEntry:
+    status_code: int | None
+    text: str
+    expires_at: float
+
+    def parser(self) -> RobotFileParser:
+        parser = RobotFileParser()
+        if self.status_code is not None and 200 <= self.status_code < 300:
+            parser.parse(self.text.splitlines())
+        elif self.status_code is not None and 400 <= self.status_code < 500:
+            # RFC 9309: an unavailable robots.txt means no restrictions.
+            parser.parse([])
+        else:
+            # Server errors and unreachable hosts are treated as a complete disallow.
+            parser.parse(["User-agent: *", "Disallow: /"])
+        return parser
+
+
+@dataclass
+class RobotsStore:
+    directory: Path
+
+    def _path(self, base: str) -> Path:
+        return Path(self.directory) / f"{sha256(base.encode('utf-8')).hexdigest()}.json"
+
+    def load(self, base: str) -> RobotsEntry | None:
+        try:
+            payload = json.loads(self._path(base).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return RobotsEntry(
+            status_code=payload.get("status_code"),
+            text=payload.get("text", ""),
+            expires_at=float(payload.get("expires_at", 0)),
+        )
+
+    def save(self, base: str, entry: RobotsEntry) -> None:
+        path = self._path(base)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"base": base, "status_code": entry.status_code, "text": entry.text, "expires_at": entry.expires_at}
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_text(json.dumps(payload, sort_keys=True), encoding="utf-8")
+        os.replace(tmp_path, path)
+
 
 @dataclass
 class RobotsPolicy:
     cache: dict[str, RobotFileParser] = field(default_factory=dict)
+    store: RobotsStore | None = None
+    ttl_seconds: float = 86400
+    error_ttl_seconds: float = 600
+    now: Callable = time.time
+    expires: dict[str, float] = field(default_factory=dict)
+    locks: dict[str, threading.Lock] = field(default_factory=dict)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def _base_lock(self, base: str) -> threading.Lock:
+        with self.lock:
+            return self.locks.setdefault(base, threading.Lock())
+
+    def _is_current(self, base: str) -> bool:
+        return base in self.cache and self.now() < self.expires.get(base, float("inf"))
 
     def allows(self, url: str, user_agent: str, fetcher) -> bool:
         parsed = urlparse(url)
         base = f"{parsed.scheme}://{parsed.netloc}"
-        if base not in self.cache:
-            robots_url = f"{base}/robots.txt"
-            content = fetcher(robots_url)
-            parser = RobotFileParser()
-            parser.parse(content.splitlines())
-            self.cache[base] = parser
+        if not self._is_current(base):
+            # Concurrent requests to the same host wait for a single robots.txt fetch.
+            with self._base_lock(base):
+                if not self._is_current(base):
+                    entry = self.store.load(base) if self.store is not None else None
+                    if entry is None or self.now() >= entry.expires_at:
+                        entry = self._fetch(f"{base}/robots.txt", fetcher)
+                        if self.store is not None:
+                            self.store.save(base, entry)
+                    self.cache[base] = entry.parser()
+                    self.expires[base] = entry.expires_at
         return self.cache[base].can_fetch(user_agent, url)
+
+    def _fetch(self, robots_url: str, fetcher) -> RobotsEntry:
+        try:
+            response = fetcher(robots_url)
+        except Exception:  # noqa: BLE001 - unreachable robots.txt disallows until retried
+            return RobotsEntry(status_code=None, text="", expires_at=self.now() + self.error_ttl_seconds)
+        if isinstance(response, str):
+            response = RobotsResponse(status_code=200, text=response)
+        status_code = response.status_code
+        if status_code is None or status_code >= 500:
+            ttl = self.error_ttl_seconds
+        else:
+            ttl = self._ttl_from_headers(response.headers or {})
+        return RobotsEntry(status_code=status_code, text=response.text or "", expires_at=self.now() + ttl)
+
+    def _ttl_from_headers(self, headers: dict[str, str]) -> float:
+        for key, value in headers.items():
+            if key.lower() == "cache-control":
+                match = _MAX_AGE.search(value or "")
+                if match:
+                    return min(float(match.group(1)), self.ttl_seconds)
+        return self.ttl_seconds
+
+
+def build_robots_policy(config: dict) -> RobotsPolicy:
+    robots_cfg = config.get("robots") or {}
+    store = None
+    if robots_cfg.get("persist"):
+        directory = robots_cfg.get("dir") or Path(config["output"]["runs_dir"]) / ".cache" / "robots"
+        store = RobotsStore(Path(directory).resolve())
+    return RobotsPolicy(
+        store=store,
+        ttl_seconds=float(robots_cfg.get("ttl_seconds", 86400)),
+        error_ttl_seconds=float(robots_cfg.get("error_ttl_seconds", 600)),
+    )
@@ -1,8 +1,16 @@
 from __future__ import annotations
 
 
+def render_console_header(sources, run_id) -> str:
+    return "\n".join([f"OpenFootprint run {run_id}", f"Sources: {', '.join(sources)}", "Findings:"])
+
+
+def render_console_line(finding) -> str:
+    return f"- {finding.source_id}: {finding.entity.display_name or finding.entity.entity_id}"
+
+
 def render_console(findings, sources, run_id) -> str:
-    lines = [f"OpenFootprint run {run_id}", f"Sources: {', '.join(sources)}", "Findings:"]
+    lines = [render_console_header(sources, run_id)]
     for finding in findings:
-        lines.append(f"- {finding.source_id}: {finding.entity.display_name or finding.entity.entity_id}")
+        lines.append(render_console_line(finding))
     return "\n".join(lines)
@@ -1,6 +1,17 @@
 from __future__ import annotations
 
 import json
+from pathlib import Path
+
+from openfootprint.storage.runs import COMPACT_FORMAT
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore[assignment]
+
+JSON_FORMATS = ("full", "compact")
+JSON_BACKENDS = ("auto", "json", "orjson")
 
 
 def render_json(findings, sources, run_id) -> str:
@@ -10,3 +21,132 @@ def render_json(findings, sources, run_id) -> str:
         "findings": [finding.to_dict() for finding in findings],
     }
     return json.dumps(payload, indent=2, sort_keys=True)
+
+
+def _nested(value, depth: int) -> str:
+    return json.dumps(value, indent=2, sort_keys=True).replace("\n", "\n" + "  " * depth)
+
+
+def write_json_report(path: Path, finding_dicts, sources, run_id) -> Path:
+    # Writes the same document as render_json, one finding at a time.
+    with Path(path).open("w", encoding="utf-8") as handle:
+        handle.write('{\n  "findings": [')
+        first = True
+        for finding in finding_dicts:
+            handle.write("\n    " if first else ",\n    ")
+            handle.write(_nested(finding, 2))
+            first = False
+        handle.write("]" if first else "\n  ]")
+        handle.write(f',\n  "run_id": {json.dumps(run_id)},\n  "sources": {_nested(sources, 1)}\n}}')
+    return Path(path)
+
+
+class EvidenceTable:
+    """Assigns each distinct evidence record an integer id, its position in the report's evidence list."""
+
+    def __init__(self) -> None:
+        self.ids: dict[tuple, int] = {}
+        self.rows: list[dict] = []
+
+    def ref(self, item: dict) -> int:
+        key = tuple(sorted(item.items()))
+        ref = self.ids.get(key)
+        if ref is None:
+            ref = self.ids[key] = len(self.rows)
+            self.rows.append(item)
+        return ref
+
+    def refs(self, items) -> list[int]:
+        return [self.ref(item) for item in items or ()]
+
+
+def compact_finding(finding: dict, table: EvidenceTable) -> dict:
+    """Replace every evidence list in a finding dict with ids into the table."""
+    entity = finding["entity"]
+    return {
+        **finding,
+        "entity": {
+            **entity,
+            "identifiers": [
+                {**ident, "evidence": table.refs(ident.get("evidence"))} for ident in entity.get("identifiers") or []
+            ],
+            "evidence": table.refs(entity.get("evidence")),
+        },
+        "artifacts": [
+            {**artifact, "evidence": table.refs(artifact.get("evidence"))}
+            for artifact in finding.get("artifacts") or []
+        ],
+    }
+
+
+def _encoder(backend: str, indent: int | None):
+    if backend not in JSON_BACKENDS:
+        raise ValueError(f"Unknown JSON backend '{backend}' (expected one of: {', '.join(JSON_BACKENDS)})")
+    if backend == "orjson" and orjson is None:
+        raise ValueError("The orjson backend needs the orjson package (pip install -e .[json])")
+    # orjson only indents by two spaces; other widths use the standard library.
+    if orjson is not None and backend != "json" and indent in (None, 2):
+        option = orjson.OPT_SORT_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return lambda value: orjson.dumps(value, option=option)
+    separators = (",", ": ") if indent else (",", ":")
+    return lambda value: json.dumps(
+        value, indent=indent, sort_keys=True, ensure_ascii=False, separators=separators
+    ).encode("utf-8")
+
+
+def write_compact_json_report(
+    path: Path, finding_dicts, sources, run_id, indent: int | None = None, backend: str = "auto"
+) -> Path:
+    """Stream a report whose evidence records are written once, in a table, and referenced by id.
+
+    Findings are encoded and written to the file one at a time; the evidence table follows
+    them, since it is only complete once every finding has been seen.
+    """
+    encode = _encoder(backend, indent)
+    step = b" " * (indent or 0)
+
+    def line(depth: int) -> bytes:
+        return b"\n" + step * depth if indent else b""
+
+    def nested(value, depth: int) -> bytes:
+        data = encode(value)
+        return data.replace(b"\n", line(depth)) if indent else data
+
+    def write_array(handle, items) -> None:
+        handle.write(b"[")
+        first = True
+        for item in items:
+            handle.write((b"" if first else b",") + line(2) + nested(item, 2))
+            first = False
+        handle.write((b"" if first else line(1)) + b"]")
+
+    colon = b": " if indent else b":"
+    table = EvidenceTable()
+    with Path(path).open("wb") as handle:
+        handle.write(b"{" + line(1) + b'"format"' + colon + encode(COMPACT_FORMAT) + b",")
+        handle.write(line(1) + b'"run_id"' + colon + encode(run_id) + b",")
+        handle.write(line(1) + b'"sources"' + colon + nested(sources, 1) + b",")
+        handle.write(line(1) + b'"findings"' + colon)
+        write_array(handle, (compact_finding(finding, table) for finding in finding_dicts))
+        handle.write(b"," + line(1) + b'"evidence"' + colon)
+        write_array(handle, table.rows)
+        handle.write(line(0) + b"}")
+    return Path(path)
+
+
+def json_report_writer(config: dict):
+    """The report.json writer selected by [reporting]: the full document, or the compact evidence-table form."""
+    reporting = config.get("reporting") or {}
+    fmt = reporting.get("json_format") or "full"
+    if fmt not in JSON_FORMATS:
+        raise ValueError(f"Unknown JSON report format '{fmt}' (expected one of: {', '.join(JSON_FORMATS)})")
+    if fmt == "full":
+        return write_json_report
+    indent = reporting.get("json_indent")
+    backend = reporting.get("json_backend") or "auto"
+    _encoder(backend, indent)
+
+    def write(path: Path, finding_dicts, sources, run_id) -> Path:
+        return write_compact_json_report(path, finding_dicts, sources, run_id, indent=indent or None, backend=backend)
+
+    return write
@@ -1,13 +1,30 @@
 from __future__ import annotations
 
+from pathlib import Path
 
-def render_markdown(findings, sources, run_id) -> str:
+
+def _header(sources, run_id) -> list[str]:
     lines = ["# OpenFootprint Report", "", f"Run: {run_id}", "", "## Sources", ""]
     for source in sources:
         lines.append(f"- {source}")
     lines.append("")
     lines.append("## Findings")
+    return lines
+
+
+def render_markdown(findings, sources, run_id) -> str:
+    lines = _header(sources, run_id)
     for finding in findings:
         lines.append(f"- {finding.source_id}: {finding.entity.display_name or finding.entity.entity_id}")
     lines.append("")
     return "\n".join(lines)
+
+
+def write_markdown_report(path: Path, finding_dicts, sources, run_id) -> Path:
+    with Path(path).open("w", encoding="utf-8") as handle:
+        handle.write("\n".join(_header(sources, run_id)))
+        for finding in finding_dicts:
+            entity = finding["entity"]
+            handle.write(f"\n- {finding['source_id']}: {entity.get('display_name') or entity['entity_id']}")
+        handle.write("\n")
+    return Path(path)
@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+import json
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import islice
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+from openfootprint.core.jobs import JOB_KINDS, execute_job, validate_job
+from openfootprint.core.pipeline import build_context
+
+
+def _now() -> str:
+    return datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class QueueFull(Exception):
+    pass
+
+
+@dataclass
+class Job:
+    job_id: str
+    kind: str
+    params: dict
+    status: str = "queued"
+    created_at: str = field(default_factory=_now)
+    started_at: str | None = None
+    finished_at: str | None = None
+    run_id: str | None = None
+    findings_path: Path | None = None
+    finding_count: int = 0
+    log: list[str] = field(default_factory=list)
+    result: dict | None = None
+    error: str | None = None
+    changed: threading.Condition = field(default_factory=threading.Condition)
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("succeeded", "failed")
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.job_id,
+            "kind": self.kind,
+            "params": self.params,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "run_id": self.run_id,
+            "finding_count": self.finding_count,
+            "log": self.log,
+            "error": self.error,
+        }
+
+    def update(self, **changes) -> None:
+        with self.changed:
+            for key, value in changes.items():
+                setattr(self, key, value)
+            self.changed.notify_all()
+
+    def add_finding(self, _finding: dict) -> None:
+        # The finding is already in findings.ndjson by now; readers fetch it from there.
+        with self.changed:
+            self.finding_count += 1
+            self.changed.notify_all()
+
+    def wait_findings(self, start: int, timeout: float) -> tuple[int, bool]:
+        """Wait up to timeout for findings past start; returns (findings available, done)."""
+        with self.changed:
+            if self.finding_count <= start and not self.done:
+                self.changed.wait(timeout)
+            return self.finding_count, self.done
+
+    def open_findings(self, start: int):
+        """findings.ndjson positioned at finding number start, one finding per line."""
+        # Only called for findings the job has reported, and on_start sets the path before the first one.
+        assert self.findings_path is not None
+        handle = self.findings_path.open("rb")
+        for _line in islice(handle, start):
+            pass
+        return handle
+
+    def read_findings(self, start: int, stop: int) -> list[dict]:
+        if stop <= start:
+            return []
+        with self.open_findings(start) as handle:
+            return [json.loads(line) for line in islice(handle, stop - start)]
+
+
+class JobManager:
+    """Runs lookup and nameintel jobs on a bounded pool against one warm LookupContext.
+
+    The registry, HTTP connection pools, response cache, robots cache and rate limiter
+    are built once and shared by every job, the same way a batch shares them across subjects.
+    """
+
+    def __init__(self, config: dict, registry, workers: int = 4, max_queued: int = 100, retain: int = 1000) -> None:
+        self.config = config
+        self.registry = registry
+        self.context = build_context(config)
+        self.max_queued = max_queued
+        self.retain = retain
+        self.jobs: OrderedDict[str, Job] = OrderedDict()
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="openfootprint-job")
+
+    def submit(self, kind: str, params: dict) -> Job:
+        validate_job(kind, params)
+        job = Job(job_id=uuid.uuid4().hex, kind=kind, params=params)
+        with self.lock:
+            queued = sum(1 for item in self.jobs.values() if item.status == "queued")
+            if queued >= self.max_queued:
+                raise QueueFull(f"{queued} jobs already queued")
+            self.jobs[job.job_id] = job
+            self._evict()
+        self.executor.submit(self._run, job)
+        return job
+
+    def _evict(self) -> None:
+        finished = [job_id for job_id, job in self.jobs.items() if job.done]
+        for job_id in finished[: max(0, len(self.jobs) - self.retain)]:
+            del self.jobs[job_id]
+
+    def get(self, job_id: str) -> Job | None:
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def list(self) -> list[Job]:
+        with self.lock:
+            return list(self.jobs.values())
+
+    def _run(self, job: Job) -> None:
+        job.update(status="running", started_at=_now())
+        runs_dir = Path(self.config["output"]["runs_dir"]).resolve()
+        try:
+            result = execute_job(
+                job.kind,
+                job.params,
+                self.registry,
+                self.config,
+                self.context,
+                on_start=lambda run_id: job.update(run_id=run_id, findings_path=runs_dir / run_id / "findings.ndjson"),
+                on_finding=job.add_finding,
+                log=job.log.append,
+            )
+        except Exception as exc:  # noqa: BLE001 - a failing job is reported, the service keeps running
+            job.update(status="failed", error=str(exc), finished_at=_now())
+            return
+        job.update(status="succeeded", result=result, finished_at=_now())
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=True)
+        self.context.close()
+
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    manager: JobManager
+    server_version = "OpenFootprint"
+
+    def log_message(self, _format, *_args) -> None:
+        return
+
+    def _send_json(self, status: int, payload) -> None:
+        body = json.dumps(payload, sort_keys=True).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _job(self, job_id: str) -> Job | None:
+        job = self.manager.get(job_id)
+        if job is None:
+            self._send_json(404, {"error": "job not found"})
+        return job
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split("/") if part]
+        query = parse_qs(url.query)
+        if parts == ["health"]:
+            self._send_json(200, {"status": "ok", "jobs": len(self.manager.list())})
+        elif parts == ["jobs"]:
+            self._send_json(200, {"jobs": [job.to_dict() for job in self.manager.list()]})
+        elif len(parts) == 2 and parts[0] == "jobs":
+            job = self._job(parts[1])
+            if job is not None:
+                self._send_json(200, job.to_dict())
+        elif len(parts) == 3 and parts[0] == "jobs" and parts[2] == "findings":
+            job = self._job(parts[1])
+            if job is None:
+                return
+            since = query.get("since", ["0"])[0]
+            if not since.isdigit():
+                self._send_json(400, {"error": "since must be a non-negative integer"})
+                return
+            start = int(since)
+            if query.get("stream", ["0"])[0] in ("1", "true"):
+                self._stream_findings(job, start)
+            else:
+                available, done = job.wait_findings(start, 0)
+                findings = job.read_findings(start, available)
+                self._send_json(200, {"findings": findings, "next": start + len(findings), "done": done})
+        elif len(parts) == 3 and parts[0] == "jobs" and parts[2] == "result":
+            job = self._job(parts[1])
+            if job is None:
+                return
+            if job.status == "succeeded":
+                self._send_json(200, job.result)
+            elif job.status == "failed":
+                self._send_json(500, {"error": job.error})
+            else:
+                self._send_json(202, job.to_dict())
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def _stream_findings(self, job: Job, start: int) -> None:
+        # NDJSON, one finding per line as the job produces it; the connection closes when the job ends.
+        # Lines are copied from findings.ndjson through one open handle rather than held in memory.
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        position = start
+        handle = None
+        try:
+            while True:
+                available, done = job.wait_findings(position, 1.0)
+                if available > position:
+                    if handle is None:
+                        handle = job.open_findings(position)
+                    for line in islice(handle, available - position):
+                        self.wfile.write(line)
+                    position = available
+                    self.wfile.flush()
+                elif done:
+                    break
+        finally:
+            if handle is not None:
+                handle.close()
+
+    def do_POST(self) -> None:
+        parts = [part for part in urlparse(self.path).path.split("/") if part]
+        if len(parts) != 2 or parts[0] != "jobs" or parts[1] not in JOB_KINDS:
+            self._send_json(404, {"error": "not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            params = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(params, dict):
+                self._send_json(400, {"error": "request body must be a JSON object"})
+                return
+            job = self.manager.submit(parts[1], params)
+        except QueueFull as exc:
+            self._send_json(429, {"error": str(exc)})
+            return
+        except ValueError as exc:
+            self._send_json(400, {"error": str(exc)})
+            return
+        self._send_json(202, job.to_dict())
+
+
+def make_server(manager: JobManager, host: str = "127.0.0.1", port: int = 8765) -> ThreadingHTTPServer:
+    handler = type("BoundServiceHandler", (ServiceHandler,), {"manager": manager})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def serve(config: dict, registry, host: str | None = None, port: int | None = None, workers: int | None = None) -> None:
+    service_cfg = config.get("service", {})
+    manager = JobManager(
+        config,
+        registry,
+        workers=int(workers or service_cfg.get("workers", 4)),
+        max_queued=int(service_cfg.get("max_queued", 100)),
+        retain=int(service_cfg.get("retain_jobs", 1000)),
+    )
+    host = host or service_cfg.get("host", "127.0.0.1")
+    server = make_server(manager, host, int(port or service_cfg.get("port", 8765)))
+    print(f"Serving on http://{host}:{server.server_address[1]}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        manager.close()
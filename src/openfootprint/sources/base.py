@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import Callable
 from dataclasses import dataclass, field
 
 
@@ -17,6 +18,8 @@ class Source:
     name: str
     category: str
     supported_inputs: set[str]
-    build_requests: callable
-    parse: callable
-    execute: callable | None = None
+    build_requests: Callable
+    parse: Callable
+    execute: Callable | None = None
+    # Tool sources: rebuild findings from the output a previous execute() left in the run directory.
+    parse_output: Callable | None = None
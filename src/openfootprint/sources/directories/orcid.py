@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 import json
-from datetime import datetime, timezone
+from datetime import UTC, datetime
 
-from openfootprint.core.schema import Evidence, Identifier, Entity, Finding
+from openfootprint.core.schema import Entity, Evidence, Finding, Identifier
 from openfootprint.sources.base import RequestSpec, Source
 
 
@@ -18,11 +18,14 @@ def build_requests(inputs):
 def parse(result, inputs, raw_info):
     if result.status_code != 200 or not result.content:
         return []
-    payload = json.loads(result.content.decode("utf-8", errors="replace"))
+    try:
+        payload = json.loads(result.content.decode("utf-8", errors="replace"))
+    except ValueError:  # truncated at the body limit, or not JSON at all
+        return []
     hits = payload.get("result", [])
     if not hits:
         return []
-    fetched_at = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    fetched_at = getattr(result, "fetched_at", None) or datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
     evidence = []
     for raw_path, raw_hash in raw_info:
         evidence.append(
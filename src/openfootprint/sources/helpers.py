@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import UTC, datetime
 
-from openfootprint.core.schema import Evidence, Identifier, Entity, Finding
+from openfootprint.core.schema import Entity, Evidence, Finding, Identifier
 from openfootprint.sources.base import RequestSpec, Source
 from openfootprint.sources.parsers import extract_title
 
@@ -23,9 +23,9 @@ class HtmlProfileSource:
     def parse(self, result, inputs, raw_info: list[tuple[str, str]]) -> list[Finding]:
         if result.status_code != 200 or not result.content:
             return []
-        html = result.content.decode("utf-8", errors="replace")
-        title = extract_title(html)
-        fetched_at = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        # The title scanner reads the raw bytes and stops at </head>; the page is never decoded in full.
+        title = extract_title(result.content)
+        fetched_at = getattr(result, "fetched_at", None) or datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
         evidence = []
         for raw_path, raw_hash in raw_info:
             evidence.append(
@@ -0,0 +1,68 @@
+"""Source metadata, readable without importing any source implementation.
+
+Each entry names the object that implements the source as "module:attribute"; the module is
+imported the first time the source is actually used. Plugins add entries the same way, from
+modules listed under [sources] plugins (each exposing a SOURCES sequence of SourceSpec) or,
+with [sources] entry_points = true, from the "openfootprint.sources" entry point group.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from importlib import import_module
+
+ENTRY_POINT_GROUP = "openfootprint.sources"
+
+
+@dataclass(frozen=True)
+class SourceSpec:
+    source_id: str
+    name: str
+    category: str
+    supported_inputs: frozenset[str]
+    target: str
+
+    def load(self):
+        module_name, _, attribute = self.target.partition(":")
+        source = getattr(import_module(module_name), attribute or "SOURCE")
+        if source.source_id != self.source_id:
+            raise ValueError(f"{self.target} implements '{source.source_id}', not '{self.source_id}'")
+        return source
+
+
+def _spec(source_id: str, name: str, category: str, inputs: str, module: str) -> SourceSpec:
+    return SourceSpec(source_id, name, category, frozenset(inputs.split()), f"openfootprint.sources.{module}:SOURCE")
+
+
+BUILTIN_SOURCES = (
+    _spec("github", "GitHub", "developer", "username", "developer.github"),
+    _spec("gitlab", "GitLab", "developer", "username", "developer.gitlab"),
+    _spec("codeberg", "Codeberg", "developer", "username", "developer.codeberg"),
+    _spec("reddit", "Reddit", "social", "username", "social.reddit"),
+    _spec("hackernews", "Hacker News", "social", "username", "social.hackernews"),
+    _spec("mastodon", "Mastodon", "social", "username", "social.mastodon"),
+    _spec("devto", "Dev.to", "blogs", "username", "blogs.devto"),
+    _spec("medium", "Medium", "blogs", "username", "blogs.medium"),
+    _spec("wordpress", "WordPress.com", "blogs", "username", "blogs.wordpress"),
+    _spec("wikidata", "Wikidata", "directories", "name", "directories.wikidata"),
+    _spec("orcid", "ORCID", "directories", "name", "directories.orcid"),
+    _spec("openalex", "OpenAlex", "directories", "name", "directories.openalex"),
+    _spec("sherlock", "Sherlock", "tools", "username", "tools.sherlock"),
+    _spec("maigret", "Maigret", "tools", "username", "tools.maigret"),
+    _spec("whatsmyname", "WhatsMyName", "tools", "username", "tools.whatsmyname"),
+)
+
+
+def plugin_sources(sources_cfg: dict | None = None) -> list:
+    sources_cfg = sources_cfg or {}
+    specs = []
+    for module_name in sources_cfg.get("plugins") or []:
+        specs.extend(import_module(module_name).SOURCES)
+    if sources_cfg.get("entry_points"):
+        # Scanning installed distributions costs more than the rest of startup, so it is opt-in.
+        from importlib.metadata import entry_points
+
+        for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+            loaded = entry_point.load()
+            specs.extend(loaded if isinstance(loaded, (list, tuple)) else [loaded])
+    return specs
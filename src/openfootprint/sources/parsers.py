@@ -1,16 +1,166 @@
 from __future__ import annotations
 
-from bs4 import BeautifulSoup
+import re
+from html import unescape
+from html.entities import html5
 
+try:  # optional: selectolax parses whole documents much faster than BeautifulSoup
+    from selectolax.parser import HTMLParser as _LexborParser  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - exercised when selectolax is absent
+    _LexborParser = None  # type: ignore[assignment, misc]
 
-def extract_title(html: str) -> str | None:
-    soup = BeautifulSoup(html, "html.parser")
+_HEAD_END = re.compile(rb"</head\s*>", re.IGNORECASE)
+_TAG = re.compile(rb"<(/?)([A-Za-z][^\s/>]*)((?:[^>\"']|\"[^\"]*\"|'[^']*')*)>")
+_TITLE_END = re.compile(rb"</title\s*>", re.IGNORECASE)
+_CHARREF = re.compile(r"&(#[0-9]+|#[xX][0-9a-fA-F]+|[A-Za-z][A-Za-z0-9]*);")
+_NOT_REF = re.compile(r"&(?![0-9A-Za-z#])")
+# html.parser reads these as raw text; the scanner skips them to their end tag.
+_RAW_TEXT = {b"script", b"style"}
+# Elements whose content the scanner does not model; documents containing them take the slow path.
+_UNMODELLED = {b"textarea", b"xmp", b"plaintext", b"iframe", b"noembed", b"noframes", b"template"}
+
+
+class _NeedsFullParse(Exception):
+    pass
+
+
+def _decode(html: str | bytes) -> str:
+    if isinstance(html, str):
+        return html
+    return bytes(html).decode("utf-8", errors="replace")
+
+
+def _title_text(raw: bytes) -> str:
+    if b"<" in raw:
+        raise _NeedsFullParse
+    text = raw.decode("utf-8", errors="replace")
+    if "&" in text:
+        # Only references BeautifulSoup resolves the same way html.unescape does are handled here.
+        bare = len(_NOT_REF.findall(text))
+        refs = _CHARREF.findall(text)
+        if bare + len(refs) != text.count("&"):
+            raise _NeedsFullParse
+        if any(not ref.startswith("#") and f"{ref};" not in html5 for ref in refs):
+            raise _NeedsFullParse
+        text = unescape(text)
+    return text
+
+
+def scan_head_title(html: str | bytes) -> str | None:
+    """Read the first <title> by scanning the document head only.
+
+    Raises _NeedsFullParse when the head holds anything the scanner does not model
+    (unusual comments, unterminated tags, markup inside the title, no title before </head>).
+    """
+    if isinstance(html, str):
+        try:
+            data = html.encode("utf-8")
+        except UnicodeEncodeError:
+            raise _NeedsFullParse from None
+    else:
+        data = html
+    head_end = _HEAD_END.search(data)
+    if head_end is None:
+        raise _NeedsFullParse
+    limit = head_end.start()
+    position = 0
+    while True:
+        start = data.find(b"<", position, limit)
+        if start == -1:
+            raise _NeedsFullParse
+        if data.startswith(b"<!--", start):
+            # Only plain comments: parsers disagree on "--" inside comments and on "<!-->".
+            end = data.find(b"-->", start + 4, limit)
+            if end == -1 or b"--" in data[start + 4 : end] or data[start + 4 : start + 5] in (b">", b"-"):
+                raise _NeedsFullParse
+            position = end + 3
+            continue
+        if data.startswith(b"<!", start) or data.startswith(b"<?", start):
+            end = data.find(b">", start, limit)
+            if end == -1:
+                raise _NeedsFullParse
+            position = end + 1
+            continue
+        tag = _TAG.match(data, start, limit)
+        if tag is None:
+            raise _NeedsFullParse
+        name = tag.group(2).lower()
+        position = tag.end()
+        if tag.group(1):
+            continue
+        if name in _UNMODELLED:
+            raise _NeedsFullParse
+        if name in _RAW_TEXT:
+            close = re.compile(rb"</\s*" + re.escape(name) + rb"\s*>", re.IGNORECASE).search(data, position, limit)
+            if close is None:
+                raise _NeedsFullParse
+            position = close.end()
+            continue
+        if name == b"title":
+            if tag.group(3).rstrip().endswith(b"/"):
+                raise _NeedsFullParse
+            close = _TITLE_END.search(data, position, limit)
+            if close is None:
+                raise _NeedsFullParse
+            text = _title_text(data[position : close.start()])
+            return text.strip() if text else None
+
+
+def _bs4_title(html: str | bytes) -> str | None:
+    # Deferred: only documents the scanner cannot read need it.
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(_decode(html), "html.parser")
     title = soup.find("title")
     if not title or not title.text:
         return None
     return title.text.strip()
 
 
+def _lexbor_title(html: str | bytes) -> str | None:
+    node = _LexborParser(_decode(html)).css_first("title")
+    if node is None:
+        return None
+    text = node.text(deep=True)
+    if not text:
+        return None
+    return text.strip()
+
+
+def _scan_or(fallback):
+    def extract(html: str | bytes) -> str | None:
+        try:
+            return scan_head_title(html)
+        except _NeedsFullParse:
+            return fallback(html)
+
+    return extract
+
+
+TITLE_BACKENDS = {
+    "auto": _scan_or(_bs4_title),
+    "bs4": _bs4_title,
+}
+if _LexborParser is not None:
+    TITLE_BACKENDS["selectolax"] = _scan_or(_lexbor_title)
+
+_title_backend = TITLE_BACKENDS["auto"]
+
+
+def set_title_backend(name: str) -> None:
+    global _title_backend
+    if name not in TITLE_BACKENDS:
+        raise ValueError(f"Unknown title backend '{name}' (available: {', '.join(sorted(TITLE_BACKENDS))})")
+    _title_backend = TITLE_BACKENDS[name]
+
+
+def extract_title(html: str | bytes, backend: str | None = None) -> str | None:
+    extract = TITLE_BACKENDS[backend] if backend else _title_backend
+    return extract(html)
+
+
 def extract_text(html: str) -> str:
+    from bs4 import BeautifulSoup
+
     soup = BeautifulSoup(html, "html.parser")
     return soup.get_text(" ", strip=True)
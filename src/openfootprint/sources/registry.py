@@ -1,30 +1,52 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from .base import Source
+from .manifest import BUILTIN_SOURCES, SourceSpec, plugin_sources
 
 
 @dataclass
 class SourceRegistry:
-    sources: list[Source]
+    """Sources by id. Entries may be SourceSpec manifest entries, loaded the first time they are needed."""
+
+    sources: list[Source | SourceSpec]
+    loaded: dict[str, Source] = field(default_factory=dict, repr=False)
+
+    def _load(self, entry: Source | SourceSpec) -> Source:
+        if isinstance(entry, Source):
+            return entry
+        source = self.loaded.get(entry.source_id)
+        if source is None:
+            source = self.loaded[entry.source_id] = entry.load()
+        return source
 
     def for_inputs(self, inputs: set[str]) -> list[Source]:
-        return [source for source in self.sources if source.supported_inputs & inputs]
+        return [self._load(source) for source in self.sources if source.supported_inputs & inputs]
 
-    def filtered(self, enabled: list[str], disabled: list[str]) -> "SourceRegistry":
+    def filtered(self, enabled: list[str], disabled: list[str]) -> SourceRegistry:
         sources = self.sources
         if enabled:
             sources = [source for source in sources if source.source_id in enabled]
         if disabled:
             sources = [source for source in sources if source.source_id not in disabled]
-        return SourceRegistry(sources)
+        return SourceRegistry(sources, self.loaded)
 
-    def list_sources(self) -> list[Source]:
+    def list_sources(self) -> list[Source | SourceSpec]:
+        """Metadata for every source (source_id, name, category, supported_inputs); nothing is imported."""
         return sorted(self.sources, key=lambda s: s.source_id)
 
-    def get(self, source_id: str) -> Source | None:
+    def entry(self, source_id: str) -> Source | SourceSpec | None:
         for source in self.sources:
             if source.source_id == source_id:
                 return source
         return None
+
+    def get(self, source_id: str) -> Source | None:
+        source = self.entry(source_id)
+        return self._load(source) if source is not None else None
+
+
+def default_registry(sources_cfg: dict | None = None) -> SourceRegistry:
+    """The built-in sources plus any plugins named in the [sources] config section."""
+    return SourceRegistry([*BUILTIN_SOURCES, *plugin_sources(sources_cfg)])
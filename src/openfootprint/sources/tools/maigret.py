@@ -2,11 +2,11 @@ from __future__ import annotations
 
 import json
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import UTC, datetime
 from hashlib import sha256
 from pathlib import Path
 
-from openfootprint.core.schema import Evidence, Entity, Finding, Identifier
+from openfootprint.core.schema import Entity, Evidence, Finding, Identifier
 from openfootprint.sources.base import RequestSpec, Source
 
 
@@ -36,7 +36,6 @@ class MaigretSource:
 
         output_dir = run_paths.raw_dir / "tools" / "maigret"
         output_dir.mkdir(parents=True, exist_ok=True)
-        output_file = output_dir / f"report_{username}_simple.json"
 
         command = [
             python_exec,
@@ -49,15 +48,20 @@ class MaigretSource:
             str(output_dir),
         ]
         runner(command, base_dir, {"PYTHONPATH": str(base_dir)}, timeout)
-        if not output_file.exists():
+        return self.parse_output(inputs, run_paths)
+
+    def parse_output(self, inputs, run_paths):
+        """Findings from the report a previous execute() left in the run directory."""
+        output_file = run_paths.raw_dir / "tools" / "maigret" / f"report_{inputs.username}_simple.json"
+        if not inputs.username or not output_file.exists():
             return []
-        return parse_maigret_json(output_file, username, source_id=self.source_id)
+        return parse_maigret_json(output_file, inputs.username, source_id=self.source_id)
 
 
 def parse_maigret_json(path: Path, username: str, source_id: str) -> list[Finding]:
     payload = json.loads(path.read_text(encoding="utf-8"))
     findings = []
-    fetched_at = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    fetched_at = datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
     raw_hash = sha256(path.read_bytes()).hexdigest()
 
     for site_name, data in payload.items():
@@ -94,4 +98,5 @@ SOURCE = Source(
     build_requests=MaigretSource("maigret", "Maigret", "tools").build_requests,
     parse=MaigretSource("maigret", "Maigret", "tools").parse,
     execute=MaigretSource("maigret", "Maigret", "tools").execute,
+    parse_output=MaigretSource("maigret", "Maigret", "tools").parse_output,
 )
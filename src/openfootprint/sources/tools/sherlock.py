@@ -2,11 +2,11 @@ from __future__ import annotations
 
 import csv
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import UTC, datetime
 from hashlib import sha256
 from pathlib import Path
 
-from openfootprint.core.schema import Evidence, Entity, Finding, Identifier
+from openfootprint.core.schema import Entity, Evidence, Finding, Identifier
 from openfootprint.sources.base import RequestSpec, Source
 
 
@@ -36,7 +36,6 @@ class SherlockSource:
 
         output_dir = run_paths.raw_dir / "tools" / "sherlock"
         output_dir.mkdir(parents=True, exist_ok=True)
-        output_file = output_dir / f"{username}.csv"
 
         command = [
             python_exec,
@@ -52,16 +51,21 @@ class SherlockSource:
             username,
         ]
         env = tools_cfg.get("env") or {}
-        runner(command, base_dir, {**env, **{"PYTHONPATH": str(base_dir)}}, timeout)
-        if not output_file.exists():
+        runner(command, base_dir, {**env, "PYTHONPATH": str(base_dir)}, timeout)
+        return self.parse_output(inputs, run_paths)
+
+    def parse_output(self, inputs, run_paths):
+        """Findings from the CSV a previous execute() left in the run directory."""
+        output_file = run_paths.raw_dir / "tools" / "sherlock" / f"{inputs.username}.csv"
+        if not inputs.username or not output_file.exists():
             return []
-        return parse_sherlock_csv(output_file, username, source_id=self.source_id)
+        return parse_sherlock_csv(output_file, inputs.username, source_id=self.source_id)
 
 
 def parse_sherlock_csv(path: Path, username: str, source_id: str) -> list[Finding]:
     rows = list(csv.DictReader(path.read_text(encoding="utf-8").splitlines()))
     findings = []
-    fetched_at = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    fetched_at = datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
     raw_hash = sha256(path.read_bytes()).hexdigest()
 
     for row in rows:
@@ -100,4 +104,5 @@ SOURCE = Source(
     build_requests=SherlockSource("sherlock", "Sherlock", "tools").build_requests,
     parse=SherlockSource("sherlock", "Sherlock", "tools").parse,
     execute=SherlockSource("sherlock", "Sherlock", "tools").execute,
+    parse_output=SherlockSource("sherlock", "Sherlock", "tools").parse_output,
 )
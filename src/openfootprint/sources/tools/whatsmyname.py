@@ -2,11 +2,11 @@ from __future__ import annotations
 
 import json
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import UTC, datetime
 from hashlib import sha256
 from pathlib import Path
 
-from openfootprint.core.schema import Evidence, Entity, Finding, Identifier
+from openfootprint.core.schema import Entity, Evidence, Finding, Identifier
 from openfootprint.sources.base import RequestSpec, Source
 
 
@@ -51,17 +51,41 @@ class WhatsMyNameSource:
             str(output_file),
             "--timeout",
             str(config.get("http", {}).get("timeout_seconds", 15)),
+            "--workers",
+            str(tools_cfg.get("whatsmyname_workers", 32)),
+            "--per-domain",
+            str(tools_cfg.get("whatsmyname_per_domain", 2)),
+            "--jsonl",
+            str(output_dir / f"matches_{username}.jsonl"),
+            # Leave headroom to write partial results before the subprocess timeout kills the runner.
+            "--deadline",
+            str(max(1, timeout - 10)),
+            "--max-bytes",
+            str(tools_cfg.get("whatsmyname_max_bytes", 1024 * 1024)),
+            "--index-cache",
+            str(Path(config.get("output", {}).get("runs_dir", "runs")).resolve() / ".cache" / "wmn"),
         ]
+        categories = tools_cfg.get("whatsmyname_categories") or []
+        if categories:
+            command.extend(["--categories", ",".join(categories)])
+        sites = tools_cfg.get("whatsmyname_sites") or []
+        if sites:
+            command.extend(["--sites", ",".join(sites)])
         runner(command, Path.cwd(), {"PYTHONPATH": str(Path.cwd())}, timeout)
-        if not output_file.exists():
+        return self.parse_output(inputs, run_paths)
+
+    def parse_output(self, inputs, run_paths):
+        """Findings from the report a previous execute() left in the run directory."""
+        output_file = run_paths.raw_dir / "tools" / "whatsmyname" / f"report_{inputs.username}.json"
+        if not inputs.username or not output_file.exists():
             return []
-        return parse_whatsmyname_report(output_file, username, source_id=self.source_id)
+        return parse_whatsmyname_report(output_file, inputs.username, source_id=self.source_id)
 
 
 def parse_whatsmyname_report(path: Path, username: str, source_id: str) -> list[Finding]:
     payload = json.loads(path.read_text(encoding="utf-8"))
     findings = []
-    fetched_at = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    fetched_at = datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
     raw_hash = sha256(path.read_bytes()).hexdigest()
 
     for item in payload.get("results", []):
@@ -99,4 +123,5 @@ SOURCE = Source(
     build_requests=WhatsMyNameSource("whatsmyname", "WhatsMyName", "tools").build_requests,
     parse=WhatsMyNameSource("whatsmyname", "WhatsMyName", "tools").parse,
     execute=WhatsMyNameSource("whatsmyname", "WhatsMyName", "tools").execute,
+    parse_output=WhatsMyNameSource("whatsmyname", "WhatsMyName", "tools").parse_output,
 )
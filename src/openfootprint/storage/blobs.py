@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import gzip
+import os
+import tempfile
+import threading
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from hashlib import sha256
+from pathlib import Path
+
+from openfootprint.storage import sqlite
+
+try:  # optional: zstd compresses HTML noticeably better and faster than gzip
+    import zstandard  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - exercised when zstandard is absent
+    zstandard = None  # type: ignore[assignment]
+
+CODEC_EXTENSIONS = {"zstd": ".zst", "gzip": ".gz"}
+
+
+@dataclass(frozen=True)
+class BlobRef:
+    digest: str
+    path: Path
+    size: int
+    codec: str
+
+
+class BlobWriter:
+    def __init__(self, store: BlobStore) -> None:
+        self.store = store
+        self.codec = store.codec
+        self.size = 0
+        self._hash = sha256()
+        fd, tmp_name = tempfile.mkstemp(prefix=".blob-", dir=store.tmp_dir)
+        self._tmp_path = Path(tmp_name)
+        self._raw = os.fdopen(fd, "wb")
+        if self.codec == "zstd":
+            self._sink = zstandard.ZstdCompressor(level=3).stream_writer(self._raw, closefd=False)
+        else:
+            self._sink = gzip.GzipFile(fileobj=self._raw, mode="wb", compresslevel=6, mtime=0)
+
+    def write(self, chunk) -> None:
+        self._hash.update(chunk)
+        self._sink.write(chunk)
+        self.size += len(chunk)
+
+    def hexdigest(self) -> str:
+        """SHA-256 of everything written so far."""
+        return self._hash.hexdigest()
+
+    def commit(self) -> BlobRef:
+        self._sink.close()
+        self._raw.close()
+        digest = self.hexdigest()
+        existing = self.store.find(digest)
+        if existing is not None:
+            self._tmp_path.unlink()
+            return BlobRef(digest=digest, path=existing.path, size=self.size, codec=existing.codec)
+        path = self.store.path_for(digest, self.codec)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(self._tmp_path, path)
+        return BlobRef(digest=digest, path=path, size=self.size, codec=self.codec)
+
+    def abort(self) -> None:
+        try:
+            self._sink.close()
+            self._raw.close()
+        finally:
+            self._tmp_path.unlink(missing_ok=True)
+
+
+class BlobStore:
+    def __init__(self, root: Path, codec: str | None = None) -> None:
+        self.root = Path(root)
+        self.codec = codec or ("zstd" if zstandard is not None else "gzip")
+        if self.codec == "zstd" and zstandard is None:
+            raise RuntimeError("zstd compression requires the 'zstandard' package")
+        self.tmp_dir = self.root / "tmp"
+        self.tmp_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite.connect(self.root / "index.sqlite")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS urls ("
+            "url TEXT NOT NULL, digest TEXT NOT NULL, run_id TEXT, source_id TEXT, "
+            "status_code INTEGER, recorded_at TEXT NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS urls_url ON urls (url)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS urls_digest ON urls (digest)")
+        self._db.commit()
+
+    def path_for(self, digest: str, codec: str) -> Path:
+        return self.root / "objects" / digest[:2] / digest[2:4] / f"{digest}{CODEC_EXTENSIONS[codec]}"
+
+    def find(self, digest: str) -> BlobRef | None:
+        for codec in CODEC_EXTENSIONS:
+            path = self.path_for(digest, codec)
+            if path.exists():
+                return BlobRef(digest=digest, path=path, size=-1, codec=codec)
+        return None
+
+    def writer(self) -> BlobWriter:
+        return BlobWriter(self)
+
+    def put(self, content: bytes) -> BlobRef:
+        digest = sha256(content).hexdigest()
+        existing = self.find(digest)
+        if existing is not None:
+            return BlobRef(digest=digest, path=existing.path, size=len(content), codec=existing.codec)
+        if self.codec == "zstd":
+            data = zstandard.ZstdCompressor(level=3).compress(content)
+        else:
+            data = gzip.compress(content, compresslevel=6, mtime=0)
+        path = self.path_for(digest, self.codec)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(prefix=".blob-", dir=self.tmp_dir)
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+        os.replace(tmp_name, path)
+        return BlobRef(digest=digest, path=path, size=len(content), codec=self.codec)
+
+    def read(self, digest: str) -> bytes:
+        ref = self.find(digest)
+        if ref is None:
+            raise FileNotFoundError(f"Blob not found: {digest}")
+        return read_blob(ref.path)
+
+    def record_url(
+        self, url: str, digest: str, run_id: str | None, source_id: str | None, status_code: int | None
+    ) -> None:
+        recorded_at = datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO urls (url, digest, run_id, source_id, status_code, recorded_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (url, digest, run_id, source_id, status_code, recorded_at),
+            )
+            self._db.commit()
+
+    def lookup_url(self, url: str) -> list[dict]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT digest, run_id, source_id, status_code, recorded_at FROM urls WHERE url = ? ORDER BY rowid",
+                (url,),
+            ).fetchall()
+        keys = ("digest", "run_id", "source_id", "status_code", "recorded_at")
+        return [dict(zip(keys, row)) for row in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+def read_blob(path: Path) -> bytes:
+    path = Path(path)
+    if path.suffix == ".zst":
+        if zstandard is None:
+            raise RuntimeError("reading .zst blobs requires the 'zstandard' package")
+        with path.open("rb") as handle:
+            return zstandard.ZstdDecompressor().stream_reader(handle).read()
+    if path.suffix == ".gz":
+        with gzip.open(path, "rb") as handle:
+            return handle.read()
+    return path.read_bytes()
+
+
+def build_blob_store(config: dict) -> BlobStore | None:
+    storage_cfg = config.get("storage") or {}
+    if not storage_cfg.get("blobs"):
+        return None
+    directory = storage_cfg.get("blob_dir") or Path(config["output"]["runs_dir"]) / ".blobs"
+    return BlobStore(Path(directory).resolve(), codec=storage_cfg.get("compression") or None)
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import json
+import threading
+from pathlib import Path
+
+from openfootprint.core.correlate import canonicalize_url
+from openfootprint.storage import sqlite
+from openfootprint.storage.runs import iter_run_dirs, read_run_findings, run_key
+
+_SCHEMA = (
+    (
+        "CREATE TABLE IF NOT EXISTS runs ("
+        "run_id TEXT PRIMARY KEY, started_at TEXT, finished_at TEXT, run_dir TEXT, inputs TEXT)"
+    ),
+    (
+        "CREATE TABLE IF NOT EXISTS sightings ("
+        "kind TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, run_id TEXT NOT NULL, "
+        "source_id TEXT, entity_id TEXT, seen_at TEXT)"
+    ),
+    "CREATE INDEX IF NOT EXISTS sightings_key ON sightings (key, kind)",
+    "CREATE INDEX IF NOT EXISTS sightings_run ON sightings (run_id)",
+)
+
+
+def _normalize(kind: str, value: str) -> str:
+    if kind == "url":
+        return canonicalize_url(value)
+    return value.strip().casefold()
+
+
+def _sightings(finding: dict):
+    entity = finding.get("entity") or {}
+    source_id = finding.get("source_id")
+    entity_id = entity.get("entity_id")
+    if entity_id:
+        yield "entity", entity_id, source_id, entity_id
+    for ident in entity.get("identifiers") or []:
+        if ident.get("value"):
+            yield ident.get("type") or "unknown", ident["value"], source_id, entity_id
+    for url in entity.get("profile_urls") or []:
+        yield "url", url, source_id, entity_id
+    for artifact in finding.get("artifacts") or []:
+        if artifact.get("url"):
+            yield "url", artifact["url"], source_id, entity_id
+
+
+class IdentityIndex:
+    """Cross-run index of identifiers, profile URLs and entity ids, answering "seen before" queries.
+
+    Runs are keyed by their directory relative to runs_dir, so batch subjects
+    ("batch-<ts>/runs/0000001") do not collide with each other or with top-level runs.
+    """
+
+    def __init__(self, path: Path, runs_dir: Path | None = None) -> None:
+        self.path = Path(path)
+        self.runs_dir = Path(runs_dir).resolve() if runs_dir else None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite.connect(self.path)
+        for statement in _SCHEMA:
+            self._db.execute(statement)
+        self._db.commit()
+
+    def index_run(self, manifest: dict, findings, run_dir: Path | None = None) -> int:
+        # Re-indexing a run replaces its rows, so this is safe to repeat.
+        run_id = run_key(manifest["run_id"], run_dir, self.runs_dir)
+        seen_at = manifest.get("started_at")
+        rows: dict[tuple, str] = {}
+        for finding in findings:
+            for kind, value, source_id, entity_id in _sightings(finding):
+                key = _normalize(kind, value)
+                rows.setdefault((kind, key, source_id, entity_id), value)
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM sightings WHERE run_id = ?", (run_id,))
+            self._db.execute(
+                "INSERT OR REPLACE INTO runs (run_id, started_at, finished_at, run_dir, inputs) VALUES (?, ?, ?, ?, ?)",
+                (
+                    run_id,
+                    seen_at,
+                    manifest.get("finished_at"),
+                    str(run_dir) if run_dir else None,
+                    json.dumps(manifest.get("inputs") or {}, sort_keys=True),
+                ),
+            )
+            self._db.executemany(
+                "INSERT INTO sightings (kind, key, value, run_id, source_id, entity_id, seen_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (kind, key, value, run_id, source_id, entity_id, seen_at)
+                    for (kind, key, source_id, entity_id), value in rows.items()
+                ],
+            )
+        return len(rows)
+
+    def indexed_runs(self) -> set[str]:
+        with self._lock:
+            return {row[0] for row in self._db.execute("SELECT run_id FROM runs")}
+
+    def search(self, value: str, kind: str | None = None, source_id: str | None = None, limit: int = 100) -> list[dict]:
+        keys = {_normalize("value", value)}
+        if kind in (None, "url") and "://" in value:
+            keys.add(_normalize("url", value))
+        query = (
+            "SELECT kind, value, run_id, source_id, entity_id, seen_at FROM sightings "
+            f"WHERE key IN ({', '.join('?' for _ in keys)})"
+        )
+        params: list = list(keys)
+        if kind:
+            query += " AND kind = ?"
+            params.append(kind)
+        if source_id:
+            query += " AND source_id = ?"
+            params.append(source_id)
+        query += " ORDER BY seen_at DESC, run_id DESC LIMIT ?"
+        params.append(int(limit))
+        with self._lock:
+            rows = self._db.execute(query, params).fetchall()
+        fields = ("kind", "value", "run_id", "source_id", "entity_id", "seen_at")
+        return [dict(zip(fields, row)) for row in rows]
+
+    def rebuild(self, runs_dir: Path | None = None, full: bool = False) -> int:
+        """Index run directories already on disk; returns the number of runs indexed."""
+        runs_dir = runs_dir or self.runs_dir
+        if runs_dir is None:
+            raise ValueError("No runs directory to index")
+        done = set() if full else self.indexed_runs()
+        count = 0
+        for run_dir in iter_run_dirs(runs_dir):
+            if run_key(run_dir.name, run_dir, self.runs_dir) in done:
+                continue
+            try:
+                manifest = json.loads((run_dir / "manifest.json").read_text(encoding="utf-8"))
+                self.index_run(manifest, read_run_findings(run_dir), run_dir)
+            except (OSError, ValueError, KeyError):
+                continue
+            count += 1
+        return count
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+def build_identity_index(config: dict) -> IdentityIndex | None:
+    index_cfg = config.get("index") or {}
+    if not index_cfg.get("enabled"):
+        return None
+    runs_dir = Path(config["output"]["runs_dir"])
+    path = index_cfg.get("path") or runs_dir / ".index" / "identity.sqlite"
+    return IdentityIndex(Path(path).resolve(), runs_dir=runs_dir)
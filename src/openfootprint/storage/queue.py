@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from openfootprint.storage import sqlite
+
+STATUSES = ("queued", "leased", "succeeded", "failed")
+
+_SCHEMA = (
+    (
+        "CREATE TABLE IF NOT EXISTS jobs ("
+        "job_id TEXT PRIMARY KEY, kind TEXT NOT NULL, params TEXT NOT NULL, status TEXT NOT NULL, "
+        "attempts INTEGER NOT NULL DEFAULT 0, max_attempts INTEGER NOT NULL, "
+        "lease_owner TEXT, lease_expires REAL, created_at REAL NOT NULL, updated_at REAL NOT NULL, "
+        "run_id TEXT, result TEXT, error TEXT)"
+    ),
+    "CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at)",
+)
+_FIELDS = (
+    "job_id",
+    "kind",
+    "params",
+    "status",
+    "attempts",
+    "max_attempts",
+    "lease_owner",
+    "lease_expires",
+    "created_at",
+    "updated_at",
+    "run_id",
+    "result",
+    "error",
+)
+
+
+def _row(row) -> dict:
+    job = dict(zip(_FIELDS, row))
+    job["params"] = json.loads(job["params"])
+    job["result"] = json.loads(job["result"]) if job["result"] else None
+    return job
+
+
+class LeaseLost(Exception):
+    """The worker no longer holds the job: its lease expired and another worker took it."""
+
+
+class JobQueue:
+    """Durable job queue in one SQLite file, shared by every worker that can reach the file.
+
+    Claims take a write lock (BEGIN IMMEDIATE) so two workers never lease the same job.
+    A leased job belongs to its worker until lease_expires; workers heartbeat to extend it,
+    and a job whose lease ran out is handed to the next worker that asks, up to max_attempts.
+    Lease times are wall-clock seconds, so hosts sharing the queue need roughly synchronised clocks.
+    """
+
+    def __init__(self, path: Path, max_attempts: int = 3, clock=time.time) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_attempts = max_attempts
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._db = sqlite.connect(self.path, isolation_level=None)
+        for statement in _SCHEMA:
+            self._db.execute(statement)
+
+    def _write(self, func):
+        # One immediate transaction per operation: the write lock is taken up front, so
+        # read-then-update sequences cannot interleave with another process.
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                result = func(self._db, self.clock())
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+            return result
+
+    def enqueue(self, kind: str, params: dict, max_attempts: int | None = None) -> str:
+        job_id = uuid.uuid4().hex
+
+        def insert(db, now):
+            db.execute(
+                "INSERT INTO jobs (job_id, kind, params, status, max_attempts, created_at, updated_at) "
+                "VALUES (?, ?, ?, 'queued', ?, ?, ?)",
+                (job_id, kind, json.dumps(params, sort_keys=True), max_attempts or self.max_attempts, now, now),
+            )
+
+        self._write(insert)
+        return job_id
+
+    def claim(self, worker_id: str, lease_seconds: float) -> dict | None:
+        """Lease the oldest runnable job to worker_id, or return None if there is none."""
+
+        def take(db, now):
+            # Abandoned jobs that already used every attempt are failed rather than retried forever.
+            db.execute(
+                "UPDATE jobs SET status = 'failed', error = COALESCE(error, 'lease expired'), "
+                "lease_owner = NULL, lease_expires = NULL, updated_at = ? "
+                "WHERE status = 'leased' AND lease_expires < ? AND attempts >= max_attempts",
+                (now, now),
+            )
+            row = db.execute(
+                "SELECT job_id FROM jobs WHERE status = 'queued' OR (status = 'leased' AND lease_expires < ?) "
+                "ORDER BY created_at, job_id LIMIT 1",
+                (now,),
+            ).fetchone()
+            if row is None:
+                return None
+            db.execute(
+                "UPDATE jobs SET status = 'leased', attempts = attempts + 1, lease_owner = ?, lease_expires = ?, "
+                "updated_at = ? WHERE job_id = ?",
+                (worker_id, now + lease_seconds, now, row[0]),
+            )
+            return _row(db.execute(f"SELECT {', '.join(_FIELDS)} FROM jobs WHERE job_id = ?", row).fetchone())
+
+        return self._write(take)
+
+    def _owned(self, db, job_id: str, worker_id: str, changes: str, params: tuple) -> None:
+        cursor = db.execute(
+            f"UPDATE jobs SET {changes} WHERE job_id = ? AND status = 'leased' AND lease_owner = ?",
+            params + (job_id, worker_id),
+        )
+        if cursor.rowcount != 1:
+            raise LeaseLost(job_id)
+
+    def heartbeat(self, job_id: str, worker_id: str, lease_seconds: float, run_id: str | None = None) -> None:
+        self._write(
+            lambda db, now: self._owned(
+                db,
+                job_id,
+                worker_id,
+                "lease_expires = ?, updated_at = ?, run_id = COALESCE(?, run_id)",
+                (now + lease_seconds, now, run_id),
+            )
+        )
+
+    def complete(self, job_id: str, worker_id: str, result: dict) -> None:
+        self._write(
+            lambda db, now: self._owned(
+                db,
+                job_id,
+                worker_id,
+                "status = 'succeeded', result = ?, run_id = COALESCE(?, run_id), error = NULL, "
+                "lease_owner = NULL, lease_expires = NULL, updated_at = ?",
+                (json.dumps(result, sort_keys=True), result.get("run_id"), now),
+            )
+        )
+
+    def fail(self, job_id: str, worker_id: str, error: str, retry: bool = True) -> None:
+        """Record a failed attempt; the job goes back on the queue while it has attempts left."""
+
+        def record(db, now):
+            row = db.execute("SELECT attempts, max_attempts FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            requeue = retry and row is not None and row[0] < row[1]
+            self._owned(
+                db,
+                job_id,
+                worker_id,
+                "status = ?, error = ?, lease_owner = NULL, lease_expires = NULL, updated_at = ?",
+                ("queued" if requeue else "failed", error, now),
+            )
+
+        self._write(record)
+
+    def get(self, job_id: str) -> dict | None:
+        with self._lock:
+            row = self._db.execute(f"SELECT {', '.join(_FIELDS)} FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return _row(row) if row else None
+
+    def jobs(self, status: str | None = None, limit: int = 100) -> list[dict]:
+        query = f"SELECT {', '.join(_FIELDS)} FROM jobs"
+        params: list = []
+        if status:
+            query += " WHERE status = ?"
+            params.append(status)
+        query += " ORDER BY created_at DESC, job_id LIMIT ?"
+        params.append(int(limit))
+        with self._lock:
+            rows = self._db.execute(query, params).fetchall()
+        return [_row(row) for row in rows]
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            counts = dict(self._db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+        return {status: counts.get(status, 0) for status in STATUSES}
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+def build_job_queue(config: dict) -> JobQueue:
+    queue_cfg = config.get("queue") or {}
+    path = queue_cfg.get("path") or Path(config["output"]["runs_dir"]) / ".queue" / "jobs.sqlite"
+    return JobQueue(Path(path).resolve(), max_attempts=int(queue_cfg.get("max_attempts", 3)))
@@ -0,0 +1,292 @@
+from __future__ import annotations
+
+import json
+import shutil
+import threading
+from pathlib import Path
+
+from openfootprint.core.correlate import Correlator
+from openfootprint.core.schema import Finding
+from openfootprint.reporting.json_report import json_report_writer, write_json_report
+from openfootprint.reporting.markdown_report import write_markdown_report
+from openfootprint.storage import sqlite
+from openfootprint.storage.runs import (
+    iter_ndjson,
+    iter_run_dirs,
+    read_run_findings,
+    run_key,
+    write_json,
+)
+
+BACKENDS = ("files", "database", "both")
+
+_SCHEMA = (
+    (
+        "CREATE TABLE IF NOT EXISTS runs ("
+        "run_id TEXT PRIMARY KEY, started_at TEXT, finished_at TEXT, inputs TEXT, sources TEXT, "
+        "manifest TEXT NOT NULL, finding_count INTEGER NOT NULL)"
+    ),
+    (
+        "CREATE TABLE IF NOT EXISTS findings ("
+        "run_id TEXT NOT NULL, seq INTEGER NOT NULL, source_id TEXT, type TEXT, confidence TEXT, "
+        "entity_id TEXT, payload TEXT NOT NULL, PRIMARY KEY (run_id, seq))"
+    ),
+    (
+        "CREATE TABLE IF NOT EXISTS identifiers ("
+        "run_id TEXT NOT NULL, seq INTEGER NOT NULL, type TEXT, value TEXT, key TEXT)"
+    ),
+    (
+        "CREATE TABLE IF NOT EXISTS evidence ("
+        "run_id TEXT NOT NULL, seq INTEGER NOT NULL, source_id TEXT, request_url TEXT, raw_path TEXT, "
+        "raw_hash TEXT, parser_id TEXT, match_excerpt TEXT, fetched_at TEXT)"
+    ),
+    (
+        "CREATE TABLE IF NOT EXISTS entities ("
+        "run_id TEXT NOT NULL, position INTEGER NOT NULL, entity_id TEXT, display_name TEXT, payload TEXT NOT NULL)"
+    ),
+    "CREATE TABLE IF NOT EXISTS raw_refs (run_id TEXT NOT NULL, payload TEXT NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS runs_started ON runs (started_at)",
+    "CREATE INDEX IF NOT EXISTS findings_source ON findings (source_id, run_id)",
+    "CREATE INDEX IF NOT EXISTS identifiers_key ON identifiers (key, run_id)",
+    "CREATE INDEX IF NOT EXISTS identifiers_run ON identifiers (run_id)",
+    "CREATE INDEX IF NOT EXISTS evidence_run ON evidence (run_id)",
+    "CREATE INDEX IF NOT EXISTS entities_run ON entities (run_id)",
+    "CREATE INDEX IF NOT EXISTS raw_refs_run ON raw_refs (run_id)",
+)
+_RUN_TABLES = ("runs", "findings", "identifiers", "evidence", "entities", "raw_refs")
+
+
+def _compact(value) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"))
+
+
+def finding_evidence(finding: dict):
+    """Every distinct evidence record of a finding dict, wherever in the finding it is attached."""
+    entity = finding.get("entity") or {}
+    seen = set()
+    groups = [entity.get("evidence") or []]
+    groups.extend(ident.get("evidence") or [] for ident in entity.get("identifiers") or [])
+    groups.extend(artifact.get("evidence") or [] for artifact in finding.get("artifacts") or [])
+    for group in groups:
+        for item in group:
+            key = _compact(item)
+            if key not in seen:
+                seen.add(key)
+                yield item
+
+
+class RunDatabase:
+    """Runs, findings, identifiers, evidence and correlated entities in one SQLite file."""
+
+    def __init__(self, path: Path, runs_dir: Path | None = None, report_writer=write_json_report) -> None:
+        self.path = Path(path)
+        self.report_writer = report_writer
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.runs_dir = Path(runs_dir).resolve() if runs_dir else None
+        self._lock = threading.Lock()
+        self._db = sqlite.connect(self.path)
+        for statement in _SCHEMA:
+            self._db.execute(statement)
+        self._db.commit()
+
+    def record_run(self, manifest: dict, findings, entities=(), raw_refs=(), run_dir: Path | None = None) -> str:
+        run_id = run_key(manifest["run_id"], run_dir, self.runs_dir)
+        finding_rows, identifier_rows, evidence_rows = [], [], []
+        for seq, finding in enumerate(findings):
+            entity = finding.get("entity") or {}
+            finding_rows.append(
+                (
+                    run_id,
+                    seq,
+                    finding.get("source_id"),
+                    finding.get("type"),
+                    finding.get("confidence"),
+                    entity.get("entity_id"),
+                    _compact(finding),
+                )
+            )
+            for ident in entity.get("identifiers") or []:
+                value = ident.get("value") or ""
+                identifier_rows.append((run_id, seq, ident.get("type"), value, value.strip().casefold()))
+            for item in finding_evidence(finding):
+                evidence_rows.append(
+                    (
+                        run_id,
+                        seq,
+                        item.get("source_id"),
+                        item.get("request_url"),
+                        item.get("raw_path"),
+                        item.get("raw_hash"),
+                        item.get("parser_id"),
+                        item.get("match_excerpt"),
+                        item.get("fetched_at"),
+                    )
+                )
+        entity_rows = [
+            (run_id, position, entity.get("entity_id"), entity.get("display_name"), _compact(entity))
+            for position, entity in enumerate(entities)
+        ]
+        with self._lock, self._db:
+            for table in _RUN_TABLES:
+                self._db.execute(f"DELETE FROM {table} WHERE run_id = ?", (run_id,))
+            self._db.execute(
+                "INSERT INTO runs (run_id, started_at, finished_at, inputs, sources, manifest, finding_count) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    run_id,
+                    manifest.get("started_at"),
+                    manifest.get("finished_at"),
+                    _compact(manifest.get("inputs") or {}),
+                    _compact(manifest.get("sources") or []),
+                    _compact(manifest),
+                    len(finding_rows),
+                ),
+            )
+            self._db.executemany("INSERT INTO findings VALUES (?, ?, ?, ?, ?, ?, ?)", finding_rows)
+            self._db.executemany("INSERT INTO identifiers VALUES (?, ?, ?, ?, ?)", identifier_rows)
+            self._db.executemany("INSERT INTO evidence VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", evidence_rows)
+            self._db.executemany("INSERT INTO entities VALUES (?, ?, ?, ?, ?)", entity_rows)
+            self._db.executemany("INSERT INTO raw_refs VALUES (?, ?)", [(run_id, _compact(ref)) for ref in raw_refs])
+        return run_id
+
+    def import_run_dir(self, run_dir: Path) -> str:
+        run_dir = Path(run_dir)
+        manifest = json.loads((run_dir / "manifest.json").read_text(encoding="utf-8"))
+        refs_path = run_dir / "raw" / "refs.jsonl"
+        raw_refs = iter_ndjson(refs_path) if refs_path.exists() else ()
+        findings = list(read_run_findings(run_dir))
+        # Entities are not stored in the run directory: correlate them again, as the lookup did.
+        correlator = Correlator()
+        correlator.extend(Finding.from_dict(finding) for finding in findings)
+        entities = [entity.to_dict() for entity in correlator.entities()]
+        return self.record_run(manifest, findings, entities, raw_refs, run_dir)
+
+    def import_runs(self, runs_dir: Path | None = None) -> int:
+        runs_dir = runs_dir or self.runs_dir
+        if runs_dir is None:
+            raise ValueError("No runs directory to import")
+        count = 0
+        for run_dir in iter_run_dirs(Path(runs_dir)):
+            try:
+                self.import_run_dir(run_dir)
+            except (OSError, ValueError, KeyError):
+                continue
+            count += 1
+        return count
+
+    def list_runs(
+        self,
+        source_id: str | None = None,
+        identifier: str | None = None,
+        since: str | None = None,
+        limit: int = 50,
+    ) -> list[dict]:
+        query = "SELECT run_id, started_at, finished_at, inputs, finding_count FROM runs WHERE 1 = 1"
+        params: list = []
+        if since:
+            query += " AND started_at >= ?"
+            params.append(since)
+        if source_id:
+            query += " AND run_id IN (SELECT run_id FROM findings WHERE source_id = ?)"
+            params.append(source_id)
+        if identifier:
+            query += " AND run_id IN (SELECT run_id FROM identifiers WHERE key = ?)"
+            params.append(identifier.strip().casefold())
+        query += " ORDER BY started_at DESC, run_id DESC LIMIT ?"
+        params.append(int(limit))
+        with self._lock:
+            rows = self._db.execute(query, params).fetchall()
+        return [
+            {
+                "run_id": run_id,
+                "started_at": started_at,
+                "finished_at": finished_at,
+                "inputs": json.loads(inputs),
+                "finding_count": finding_count,
+            }
+            for run_id, started_at, finished_at, inputs, finding_count in rows
+        ]
+
+    def get_run(self, run_id: str) -> dict | None:
+        with self._lock:
+            row = self._db.execute("SELECT manifest, finding_count FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+            if row is None:
+                return None
+            by_source = self._db.execute(
+                "SELECT source_id, COUNT(*) FROM findings WHERE run_id = ? GROUP BY source_id ORDER BY source_id",
+                (run_id,),
+            ).fetchall()
+        return {
+            "run_id": run_id,
+            "manifest": json.loads(row[0]),
+            "finding_count": row[1],
+            "findings_by_source": dict(by_source),
+            "entities": self.entities(run_id),
+        }
+
+    def _payloads(self, query: str, run_id: str) -> list:
+        with self._lock:
+            return [json.loads(row[0]) for row in self._db.execute(query, (run_id,))]
+
+    def findings(self, run_id: str) -> list[dict]:
+        return self._payloads("SELECT payload FROM findings WHERE run_id = ? ORDER BY seq", run_id)
+
+    def entities(self, run_id: str) -> list[dict]:
+        return self._payloads("SELECT payload FROM entities WHERE run_id = ? ORDER BY position", run_id)
+
+    def raw_refs(self, run_id: str) -> list[dict]:
+        return self._payloads("SELECT payload FROM raw_refs WHERE run_id = ? ORDER BY rowid", run_id)
+
+    def export_run(self, run_id: str, dest_dir: Path) -> Path:
+        """Write the run back out in the per-run directory layout of the files backend."""
+        run = self.get_run(run_id)
+        if run is None:
+            raise KeyError(run_id)
+        manifest = run["manifest"]
+        run_dir = Path(dest_dir) / run_id
+        (run_dir / "raw").mkdir(parents=True, exist_ok=True)
+        write_json(run_dir, "manifest.json", manifest)
+        findings = self.findings(run_id)
+        with (run_dir / "findings.ndjson").open("w", encoding="utf-8") as handle:
+            for finding in findings:
+                handle.write(json.dumps(finding, sort_keys=True) + "\n")
+        self.report_writer(run_dir / "report.json", findings, manifest.get("sources") or [], manifest["run_id"])
+        write_markdown_report(run_dir / "report.md", findings, manifest.get("sources") or [], manifest["run_id"])
+        refs = self.raw_refs(run_id)
+        if refs:
+            with (run_dir / "raw" / "refs.jsonl").open("w", encoding="utf-8") as handle:
+                for ref in refs:
+                    handle.write(json.dumps(ref, sort_keys=True) + "\n")
+            # The bodies travel with the run, stored as they were (blob files stay compressed), so the
+            # export can be reparsed or checked against its evidence hashes without the original store.
+            for ref in refs:
+                stored = ref.get("blob") or ref.get("path")
+                if stored and Path(stored).is_file():
+                    shutil.copyfile(stored, run_dir / "raw" / Path(stored).name)
+        return run_dir
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+def storage_backend(config: dict) -> str:
+    """Where runs are kept: "files" (run directories, the default), "database" or "both".
+
+    "database" replaces the rendered reports and manifest.json only. Each run still gets a
+    directory holding findings.ndjson (streamed while the run is in progress) and raw/ (tool
+    outputs and refs.jsonl), because tools write there and the run database points at it.
+    """
+    backend = (config.get("storage") or {}).get("backend") or "files"
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown storage backend '{backend}' (expected one of: {', '.join(BACKENDS)})")
+    return backend
+
+
+def build_run_database(config: dict, force: bool = False) -> RunDatabase | None:
+    if not force and storage_backend(config) == "files":
+        return None
+    storage_cfg = config.get("storage") or {}
+    runs_dir = Path(config["output"]["runs_dir"])
+    path = storage_cfg.get("database_path") or runs_dir / ".db" / "runs.sqlite"
+    return RunDatabase(Path(path).resolve(), runs_dir=runs_dir, report_writer=json_report_writer(config))
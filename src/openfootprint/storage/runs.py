@@ -1,13 +1,17 @@
 from __future__ import annotations
 
+import json
+import secrets
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import UTC, datetime
 from hashlib import sha256
-import json
 from pathlib import Path
 
 from openfootprint.core.schema import RunManifest
 
+# Compact report.json files (reporting.json_report) store each evidence record once, referenced by position.
+COMPACT_FORMAT = "openfootprint-compact/1"
+
 
 @dataclass(frozen=True)
 class RunPaths:
@@ -15,25 +19,62 @@ class RunPaths:
     raw_dir: Path
 
 
-def _now_id() -> str:
-    return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+def new_run_id() -> str:
+    # Timestamp for ordering and readability, random suffix so runs started in the same
+    # second (threads, processes or hosts sharing runs_dir) never collide.
+    return f"{datetime.now(UTC).strftime('%Y%m%dT%H%M%SZ')}-{secrets.token_hex(4)}"
+
+
+def create_run_dir(base_dir: Path, run_id: str | None = None) -> RunPaths:
+    while True:
+        run_dir = Path(base_dir) / (run_id or new_run_id())
+        try:
+            run_dir.mkdir(parents=True, exist_ok=False)
+        except FileExistsError:
+            if run_id is not None:
+                raise
+            continue
+        raw_dir = run_dir / "raw"
+        raw_dir.mkdir()
+        return RunPaths(run_dir=run_dir, raw_dir=raw_dir)
+
 
+def run_key(run_id: str, run_dir: Path | None, runs_dir: Path | None) -> str:
+    # Batch subjects are numbered per batch, so runs are told apart by their path under runs_dir.
+    if run_dir is None or runs_dir is None:
+        return run_id
+    try:
+        return Path(run_dir).resolve().relative_to(Path(runs_dir).resolve()).as_posix()
+    except ValueError:
+        return run_id
 
-def create_run_dir(base_dir: Path) -> RunPaths:
-    run_id = _now_id()
-    run_dir = base_dir / run_id
-    raw_dir = run_dir / "raw"
-    raw_dir.mkdir(parents=True, exist_ok=False)
-    return RunPaths(run_dir=run_dir, raw_dir=raw_dir)
+
+def iter_run_dirs(runs_dir: Path):
+    for path in sorted(Path(runs_dir).iterdir()):
+        if path.name.startswith(".") or not path.is_dir():
+            continue
+        if (path / "manifest.json").exists():
+            yield path
+        elif (path / "runs").is_dir():
+            yield from iter_run_dirs(path / "runs")
 
 
 def save_raw_artifact(run_paths: RunPaths, url: str, content: bytes) -> Path:
-    digest = sha256(content + url.encode("utf-8")).hexdigest()
-    raw_path = run_paths.raw_dir / f"{digest}.bin"
+    # Same name as sha256(content + url) without building a concatenated copy of the body.
+    hasher = sha256(content)
+    hasher.update(url.encode("utf-8"))
+    raw_path = run_paths.raw_dir / f"{hasher.hexdigest()}.bin"
     raw_path.write_bytes(content)
     return raw_path
 
 
+def append_raw_ref(run_paths: RunPaths, entry: dict) -> Path:
+    path = run_paths.raw_dir / "refs.jsonl"
+    with path.open("a", encoding="utf-8") as handle:
+        handle.write(json.dumps(entry, sort_keys=True) + "\n")
+    return path
+
+
 def write_json(run_dir: Path, filename: str, payload: dict) -> Path:
     path = run_dir / filename
     path.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
@@ -46,5 +87,51 @@ def write_text(run_dir: Path, filename: str, text: str) -> Path:
     return path
 
 
+def iter_ndjson(path: Path):
+    with Path(path).open("r", encoding="utf-8") as handle:
+        for line in handle:
+            if line.strip():
+                yield json.loads(line)
+
+
+def expand_compact_report(payload: dict) -> dict:
+    """Turn a compact report back into the full report document."""
+    if payload.get("format") != COMPACT_FORMAT:
+        return payload
+    rows = payload["evidence"]
+
+    def expand(refs):
+        return [rows[ref] for ref in refs]
+
+    findings = []
+    for finding in payload["findings"]:
+        entity = finding["entity"]
+        findings.append(
+            {
+                **finding,
+                "entity": {
+                    **entity,
+                    "identifiers": [
+                        {**ident, "evidence": expand(ident["evidence"])} for ident in entity["identifiers"]
+                    ],
+                    "evidence": expand(entity["evidence"]),
+                },
+                "artifacts": [
+                    {**artifact, "evidence": expand(artifact["evidence"])} for artifact in finding["artifacts"]
+                ],
+            }
+        )
+    return {"run_id": payload["run_id"], "sources": payload["sources"], "findings": findings}
+
+
+def read_run_findings(run_dir: Path):
+    ndjson_path = Path(run_dir) / "findings.ndjson"
+    if ndjson_path.exists():
+        return iter_ndjson(ndjson_path)
+    # Runs from before findings.ndjson existed only have the rendered report.
+    report = json.loads((Path(run_dir) / "report.json").read_text(encoding="utf-8"))
+    return expand_compact_report(report).get("findings", [])
+
+
 def write_manifest(run_paths: RunPaths, manifest: RunManifest) -> Path:
     return write_json(run_paths.run_dir, "manifest.json", manifest.to_dict())
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+
+def connect(path: Path | str, **kwargs) -> sqlite3.Connection:
+    """Open one of openfootprint's SQLite files.
+
+    Every store uses SQLite's rollback journal rather than WAL. WAL keeps its index in shared
+    memory, which only works between processes on one machine, while the queue, host throttle,
+    blob store, index, run database and cassettes may all sit on a filesystem that workers on
+    several hosts mount.
+    """
+    kwargs.setdefault("check_same_thread", False)
+    kwargs.setdefault("timeout", 30)
+    db = sqlite3.connect(str(path), **kwargs)
+    db.execute("PRAGMA journal_mode=DELETE")
+    return db
@@ -2,10 +2,17 @@ from __future__ import annotations
 
 import argparse
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FuturesTimeout
 from pathlib import Path
 
 import requests
 
+from openfootprint.core.executor import HostSlots
+from openfootprint.core.transport import HttpTransport, shared_transport
+from openfootprint.tools.wmn_index import CompiledSite, compile_site, load_site_index
+
 
 def evaluate_match(site: dict, status_code: int, body: str) -> bool | None:
     if site.get("m_code") is not None and status_code == site.get("m_code"):
@@ -19,42 +26,178 @@ def evaluate_match(site: dict, status_code: int, body: str) -> bool | None:
     return None
 
 
-def check_site(site: dict, username: str, timeout: int) -> dict | None:
-    url = site["uri_check"].replace("{account}", username)
-    headers = site.get("headers") or {}
+def check_site(site: dict, username: str, timeout: int, transport=None) -> dict | None:
+    return check_compiled_site(compile_site(0, site), username, timeout, transport or shared_transport())
+
+
+DEFAULT_MAX_BYTES = 1024 * 1024
+CHUNK_SIZE = 16 * 1024
+
+
+def _iter_body(resp):
+    if hasattr(resp, "iter_content"):
+        return resp.iter_content(chunk_size=CHUNK_SIZE)
+    return iter([resp.content or b""])
+
+
+def match_streaming(
+    site: CompiledSite, status_code: int, resp, max_bytes: int = DEFAULT_MAX_BYTES, ends_at: float | None = None
+) -> bool | None:
+    # Decide from the status line when the body cannot change the outcome.
+    if site.m_code is not None and status_code == site.m_code:
+        return True
+    e_code_hit = site.e_code is not None and status_code == site.e_code
+    if not site.m_string and (e_code_hit or not site.e_string):
+        return False if e_code_hit else None
+
+    # Otherwise scan chunks, keeping an overlap so markers split across chunks are still seen.
+    markers = [marker for marker in (site.m_string, site.e_string) if marker]
+    overlap = max(len(marker) for marker in markers) - 1
+    tail = b""
+    read = 0
+    e_found = False
+    for chunk in _iter_body(resp):
+        if not chunk:
+            continue
+        chunk = chunk[: max_bytes - read]
+        read += len(chunk)
+        window = tail + chunk
+        if site.m_string and site.m_string in window:
+            return True
+        if site.e_string and not e_found and site.e_string in window:
+            e_found = True
+            if not site.m_string:
+                return False
+        tail = window[-overlap:] if overlap else b""
+        if read >= max_bytes or (ends_at is not None and time.monotonic() >= ends_at):
+            break
+    if e_code_hit or e_found:
+        return False
+    return None
+
+
+def check_compiled_site(
+    site: CompiledSite,
+    username: str,
+    timeout: float,
+    transport,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    ends_at: float | None = None,
+) -> dict | None:
+    url = site.url(username)
+    post_body = site.post_body(username)
     try:
-        if site.get("post_body"):
-            resp = requests.post(
-                url,
-                data=site["post_body"].replace("{account}", username),
-                headers=headers,
-                timeout=timeout,
-            )
+        if post_body is not None:
+            resp = transport.post(url, data=post_body, headers=site.headers, timeout=timeout, stream=True)
         else:
-            resp = requests.get(url, headers=headers, timeout=timeout)
+            resp = transport.get(url, headers=site.headers, timeout=timeout, stream=True)
+    except requests.RequestException:
+        return None
+    try:
+        matched = match_streaming(site, resp.status_code, resp, max_bytes, ends_at)
     except requests.RequestException:
         return None
-    match = evaluate_match(site, resp.status_code, resp.text)
-    if match is not True:
+    finally:
+        close = getattr(resp, "close", None)
+        if close is not None:
+            close()
+    if matched is not True:
         return None
     return {
-        "site_name": site.get("name") or url,
-        "url": site.get("uri_pretty", url).replace("{account}", username),
+        "site_name": site.name,
+        "url": site.pretty_url(username),
         "matched": True,
         "status_code": resp.status_code,
     }
 
 
-def run(data_path: Path, username: str, output_path: Path, timeout: int) -> None:
-    payload = json.loads(data_path.read_text(encoding="utf-8"))
-    results = []
-    for site in payload.get("sites", []):
-        if not site.get("uri_check"):
-            continue
-        item = check_site(site, username, timeout)
-        if item:
-            results.append(item)
-    output = {"username": username, "results": results}
+def _check_with_slot(
+    slots: HostSlots,
+    site: CompiledSite,
+    username: str,
+    timeout: float,
+    transport,
+    max_bytes: int,
+    ends_at: float | None,
+) -> dict | None:
+    with slots.hold(site.host):
+        if ends_at is not None:
+            # Past the deadline nobody is waiting for the answer: a check still running then would
+            # only hold the process open (worker threads are joined at exit), so bound it.
+            remaining = ends_at - time.monotonic()
+            if remaining <= 0:
+                return None
+            timeout = min(timeout, remaining)
+        try:
+            return check_compiled_site(site, username, timeout, transport, max_bytes, ends_at)
+        except Exception:  # noqa: BLE001 - one malformed site must not abort the whole run
+            return None
+
+
+def run(
+    data_path: Path,
+    username: str,
+    output_path: Path,
+    timeout: int,
+    transport=None,
+    workers: int = 32,
+    per_domain: int = 2,
+    jsonl_path: Path | None = None,
+    deadline: float | None = None,
+    categories: list[str] | None = None,
+    site_names: list[str] | None = None,
+    index_cache: Path | None = None,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+) -> None:
+    started = time.monotonic()
+    ends_at = None if deadline is None else started + deadline
+    sites = load_site_index(data_path, index_cache).select(categories, site_names)
+    workers = max(1, int(workers))
+    owned = transport is None
+    if owned:
+        transport = HttpTransport(pool_connections=max(64, workers), pool_maxsize=max(1, per_domain))
+    slots = HostSlots(per_domain)
+
+    found = {}
+    checked = 0
+    partial = False
+    jsonl = None
+    if jsonl_path is not None:
+        jsonl_path.parent.mkdir(parents=True, exist_ok=True)
+        jsonl = jsonl_path.open("w", encoding="utf-8")
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="wmn-check")
+    try:
+        futures = {
+            executor.submit(_check_with_slot, slots, site, username, timeout, transport, max_bytes, ends_at): site.index
+            for site in sites
+        }
+        remaining = None if ends_at is None else max(0.0, ends_at - time.monotonic())
+        try:
+            for future in as_completed(futures, timeout=remaining):
+                checked += 1
+                item = future.result()
+                if not item:
+                    continue
+                found[futures[future]] = item
+                if jsonl is not None:
+                    jsonl.write(json.dumps(item, sort_keys=True) + "\n")
+                    jsonl.flush()
+        except FuturesTimeout:
+            # Deadline hit: keep what matched so far and drop checks that have not started; those in
+            # flight run out their capped timeouts.
+            partial = True
+    finally:
+        executor.shutdown(wait=not partial, cancel_futures=True)
+        if owned:
+            transport.close()
+        if jsonl is not None:
+            jsonl.close()
+
+    output: dict[str, object] = {"username": username, "results": [found[index] for index in sorted(found)]}
+    if partial:
+        output["partial"] = True
+        output["checked"] = checked
+        output["total"] = len(sites)
     output_path.parent.mkdir(parents=True, exist_ok=True)
     output_path.write_text(json.dumps(output, indent=2, sort_keys=True), encoding="utf-8")
 
@@ -65,9 +208,30 @@ def main(argv=None) -> int:
     parser.add_argument("--username", required=True)
     parser.add_argument("--output", required=True)
     parser.add_argument("--timeout", type=int, default=15)
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--per-domain", type=int, default=2)
+    parser.add_argument("--jsonl")
+    parser.add_argument("--deadline", type=float)
+    parser.add_argument("--categories", help="Comma-separated WhatsMyName categories to check")
+    parser.add_argument("--sites", help="Comma-separated site names to check")
+    parser.add_argument("--index-cache", help="Directory for the compiled site index")
+    parser.add_argument("--max-bytes", type=int, default=DEFAULT_MAX_BYTES, help="Per-site body read limit")
     args = parser.parse_args(argv)
 
-    run(Path(args.data), args.username, Path(args.output), args.timeout)
+    run(
+        Path(args.data),
+        args.username,
+        Path(args.output),
+        args.timeout,
+        workers=args.workers,
+        per_domain=args.per_domain,
+        jsonl_path=Path(args.jsonl) if args.jsonl else None,
+        deadline=args.deadline,
+        categories=args.categories.split(",") if args.categories else None,
+        site_names=args.sites.split(",") if args.sites else None,
+        index_cache=Path(args.index_cache) if args.index_cache else None,
+        max_bytes=args.max_bytes,
+    )
     return 0
 
 
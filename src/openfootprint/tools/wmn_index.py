@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import json
+import marshal
+import os
+import threading
+from dataclasses import astuple, dataclass, field
+from hashlib import sha256
+from pathlib import Path
+from urllib.parse import urlparse
+
+INDEX_VERSION = 2
+ACCOUNT = "{account}"
+
+
+@dataclass(frozen=True)
+class CompiledSite:
+    index: int
+    name: str
+    category: str | None
+    host: str
+    uri_parts: tuple[str, ...]
+    pretty_parts: tuple[str, ...] | None
+    post_parts: tuple[str, ...] | None
+    headers: dict[str, str]
+    m_code: int | None
+    e_code: int | None
+    m_string: bytes | None
+    e_string: bytes | None
+
+    def url(self, username: str) -> str:
+        return username.join(self.uri_parts)
+
+    def pretty_url(self, username: str) -> str:
+        return username.join(self.pretty_parts or self.uri_parts)
+
+    def post_body(self, username: str) -> str | None:
+        return username.join(self.post_parts) if self.post_parts else None
+
+
+def compile_site(index: int, site: dict) -> CompiledSite:
+    uri = site["uri_check"]
+    pretty = site.get("uri_pretty")
+    post_body = site.get("post_body")
+    return CompiledSite(
+        index=index,
+        name=site.get("name") or uri,
+        category=site.get("cat"),
+        host=urlparse(uri.replace(ACCOUNT, "x")).netloc.lower(),
+        uri_parts=tuple(uri.split(ACCOUNT)),
+        pretty_parts=tuple(pretty.split(ACCOUNT)) if pretty else None,
+        post_parts=tuple(post_body.split(ACCOUNT)) if post_body else None,
+        headers=dict(site.get("headers") or {}),
+        m_code=site.get("m_code"),
+        e_code=site.get("e_code"),
+        m_string=site["m_string"].encode("utf-8") if site.get("m_string") else None,
+        e_string=site["e_string"].encode("utf-8") if site.get("e_string") else None,
+    )
+
+
+@dataclass
+class SiteIndex:
+    digest: str
+    sites: list[CompiledSite]
+    by_host: dict[str, list[int]] = field(default_factory=dict)
+    by_category: dict[str, list[int]] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        if not self.by_host and not self.by_category:
+            for position, site in enumerate(self.sites):
+                self.by_host.setdefault(site.host, []).append(position)
+                self.by_category.setdefault((site.category or "").lower(), []).append(position)
+
+    def select(self, categories=None, sites=None) -> list[CompiledSite]:
+        wanted_categories = {value.strip().lower() for value in categories or [] if value.strip()}
+        wanted_sites = {value.strip().lower() for value in sites or [] if value.strip()}
+        if not wanted_categories and not wanted_sites:
+            return list(self.sites)
+        positions = set()
+        for category in wanted_categories:
+            positions.update(self.by_category.get(category, []))
+        if wanted_sites:
+            positions.update(i for i, site in enumerate(self.sites) if site.name.lower() in wanted_sites)
+        return [self.sites[i] for i in sorted(positions)]
+
+
+def compile_index(raw: bytes, digest: str) -> SiteIndex:
+    payload = json.loads(raw)
+    candidates = [site for site in payload.get("sites", []) if site.get("uri_check")]
+    sites = [compile_site(index, site) for index, site in enumerate(candidates)]
+    return SiteIndex(digest=digest, sites=sites)
+
+
+_memory: dict[str, SiteIndex] = {}
+_memory_lock = threading.Lock()
+
+
+def _data_digest(data_path: Path) -> str:
+    # The data file is identified by where it is, its size and its mtime, like make does, so a warm
+    # start never reads or hashes it; a rewrite that keeps all three would need its mtime touched.
+    path = Path(data_path).resolve()
+    stat = path.stat()
+    return sha256(f"{path}\0{stat.st_size}\0{stat.st_mtime_ns}".encode()).hexdigest()
+
+
+def _read_cache(cache_path: Path, digest: str) -> SiteIndex | None:
+    try:
+        version, cached_digest, rows = marshal.loads(cache_path.read_bytes())
+        if version != INDEX_VERSION or cached_digest != digest:
+            return None
+        return SiteIndex(digest=digest, sites=[CompiledSite(index, *row) for index, row in enumerate(rows)])
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+
+def _write_cache(cache_path: Path, index: SiteIndex) -> None:
+    # marshal keeps the compiled tuples as they are: loading them skips JSON parsing and URL splitting.
+    rows = [astuple(site)[1:] for site in index.sites]
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_name(f".{cache_path.name}.{os.getpid()}.tmp")
+    tmp_path.write_bytes(marshal.dumps((INDEX_VERSION, index.digest, rows)))
+    os.replace(tmp_path, cache_path)
+    # Indexes of earlier versions of the data file (or of this format) are never read again.
+    for stale in cache_path.parent.glob("wmn-index-v*-*.marshal"):
+        if stale != cache_path:
+            stale.unlink(missing_ok=True)
+
+
+def load_site_index(data_path: Path, cache_dir: Path | None = None) -> SiteIndex:
+    digest = _data_digest(data_path)
+    with _memory_lock:
+        cached = _memory.get(digest)
+    if cached is not None:
+        return cached
+
+    cache_path = Path(cache_dir) / f"wmn-index-v{INDEX_VERSION}-{digest[:24]}.marshal" if cache_dir else None
+    index = _read_cache(cache_path, digest) if cache_path is not None and cache_path.exists() else None
+    if index is None:
+        index = compile_index(Path(data_path).read_bytes(), digest)
+        if cache_path is not None:
+            _write_cache(cache_path, index)
+    with _memory_lock:
+        _memory[digest] = index
+    return index
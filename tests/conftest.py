@@ -1,6 +1,98 @@
 import sys
 from pathlib import Path
 
+import pytest
 
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT / "src"))
+
+PAGE = b"<html><head><title>Alice</title></head></html>"
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, headers: dict, content: bytes) -> None:
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+
+class FakeHttp:
+    """Stands in for the pipeline's HTTP and robots.txt fetchers and records what they were asked for."""
+
+    robots_txt = "User-agent: *\nAllow: /"
+
+    def __init__(self) -> None:
+        self.requests: list[str] = []
+        self.robots_requests: list[str] = []
+        # Set once a test has what it needs, for the parts that must work without the network.
+        self.offline = False
+        self.respond(PAGE)
+
+    def respond(self, content: bytes, status_code: int = 200, headers: dict | None = None) -> None:
+        """Answer every request with the same response."""
+        self.route(lambda _url: (status_code, dict(headers or {}), content))
+
+    def route(self, answer) -> None:
+        """Answer each request with answer(url), a (status_code, headers, content) tuple."""
+        self._answer = answer
+
+    def get(self, url: str, _headers, _timeout) -> FakeResponse:
+        self._check(url)
+        self.requests.append(url)
+        return FakeResponse(*self._answer(url))
+
+    def robots(self, url: str, _headers, _timeout) -> str:
+        self._check(url)
+        self.robots_requests.append(url)
+        return self.robots_txt
+
+    def _check(self, url: str) -> None:
+        if self.offline:
+            raise AssertionError(f"unexpected network access: {url}")
+
+
+@pytest.fixture
+def fake_http(monkeypatch) -> FakeHttp:
+    from openfootprint.core import pipeline
+
+    fake = FakeHttp()
+    monkeypatch.setattr(pipeline, "_http_get", fake.get)
+    monkeypatch.setattr(pipeline, "_robots_fetch", fake.robots)
+    return fake
+
+
+@pytest.fixture
+def example_registry():
+    """Build a registry holding one "example" source that finds a profile at https://example.com/<username>.
+
+    The username "broken" makes its parser raise.
+    """
+    from openfootprint.core.schema import Entity, Evidence, Finding, Identifier
+    from openfootprint.sources.base import RequestSpec, Source
+    from openfootprint.sources.registry import SourceRegistry
+
+    def build(confidence: str = "medium"):
+        def parse(result, inputs, raw_info):
+            if inputs.username == "broken":
+                raise RuntimeError("parser exploded")
+            evidence = [
+                Evidence("example", result.url, path, digest, "example.profile", None, "2024-01-01T00:00:00Z")
+                for path, digest in raw_info
+            ]
+            identifiers = [Identifier("username", inputs.username, evidence)]
+            entity = Entity(f"example:{inputs.username}", inputs.username.title(), [result.url], identifiers, evidence)
+            return [Finding(source_id="example", type="profile", entity=entity, confidence=confidence)]
+
+        source = Source(
+            source_id="example",
+            name="Example",
+            category="developer",
+            supported_inputs={"username"},
+            build_requests=lambda inputs: [
+                RequestSpec(url=f"https://example.com/{inputs.username}", input_type="username")
+            ],
+            parse=parse,
+        )
+        return SourceRegistry([source])
+
+    return build
@@ -0,0 +1,60 @@
+import json
+from pathlib import Path
+
+from openfootprint.core import batch, pipeline
+from openfootprint.core.batch import iter_subjects, run_batch
+from openfootprint.sources.developer.github import SOURCE as GITHUB
+from openfootprint.sources.registry import SourceRegistry
+
+
+def test_iter_subjects_reads_jsonl_and_csv(tmp_path: Path):
+    jsonl = tmp_path / "subjects.jsonl"
+    jsonl.write_text('{"username": "alice"}\n\n{"name": "Bob Smith", "extra": 1}\nnot json\n', encoding="utf-8")
+    rows = list(iter_subjects(jsonl))
+    assert rows[0] == (0, {"username": "alice", "email": None, "phone": None, "name": None})
+    assert rows[1][1]["name"] == "Bob Smith"
+    assert "error" in rows[2][1]
+
+    jsonl.write_text('"bob"\n42\n[]\nnull\n{"username": "carol"}\n', encoding="utf-8")
+    rows = list(iter_subjects(jsonl))
+    assert [raw.get("error") for _index, raw in rows[:4]] == ["line is not a JSON object"] * 4
+    assert rows[4] == (4, {"username": "carol", "email": None, "phone": None, "name": None})
+
+    csv_path = tmp_path / "subjects.csv"
+    csv_path.write_text("username,email\nalice,\n,bob@example.com\n", encoding="utf-8")
+    rows = list(iter_subjects(csv_path))
+    assert rows[0][1]["username"] == "alice" and rows[0][1]["email"] is None
+    assert rows[1][1]["email"] == "bob@example.com"
+
+
+def test_run_batch_shares_context_and_writes_summary(tmp_path: Path, monkeypatch, fake_http):
+    contexts = []
+    real_build_context = pipeline.build_context
+
+    def counting_build_context(config):
+        contexts.append(config)
+        return real_build_context(config)
+
+    monkeypatch.setattr(batch, "build_context", counting_build_context)
+
+    subjects = tmp_path / "subjects.jsonl"
+    subjects.write_text(
+        "\n".join(json.dumps({"username": f"user{i}"}) for i in range(5)) + '\n{"phone": "bogus"}\n',
+        encoding="utf-8",
+    )
+    config = {
+        "http": {"user_agent": "UA", "timeout_seconds": 1},
+        "rate_limit": {"min_interval_seconds": 0},
+        "output": {"runs_dir": str(tmp_path / "runs")},
+    }
+    summary = run_batch(subjects, SourceRegistry([GITHUB]), config, max_in_flight=2)
+
+    assert len(contexts) == 1
+    assert fake_http.robots_requests == ["https://github.com/robots.txt"]
+    assert summary["subjects"] == 6
+    assert summary["succeeded"] == 5
+    assert summary["failed"] == 1
+    assert summary["findings"] == 5
+    results = [json.loads(line) for line in Path(summary["results"]).read_text(encoding="utf-8").splitlines()]
+    assert sorted(item["index"] for item in results) == list(range(6))
+    assert Path(summary["results"]).with_name("summary.json").exists()
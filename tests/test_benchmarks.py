@@ -0,0 +1,37 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _throughput(*argv: str) -> subprocess.CompletedProcess:
+    env = os.environ.copy()
+    env["PYTHONPATH"] = str(ROOT / "src")
+    return subprocess.run(
+        [sys.executable, str(ROOT / "benchmarks" / "throughput.py"), *argv],
+        capture_output=True,
+        text=True,
+        env=env,
+        timeout=120,
+        check=False,
+    )
+
+
+def test_throughput_benchmark_reports_and_flags_regressions(tmp_path: Path):
+    args = ["--scenario", "batch", "--hosts", "4", "--subjects", "2", "--latency-ms", "0", "--jitter-ms", "0"]
+    first = _throughput(*args, "--output", str(tmp_path / "base.json"))
+    assert first.returncode == 0, first.stderr
+    metrics = json.loads(first.stdout)["scenarios"]["batch"]
+    assert metrics["requests"] >= 8  # 4 robots.txt + 2 subjects x 4 hosts, less any disallowed hosts
+    assert set(metrics["latency_ms"]) == {"p50", "p95", "p99"}
+    assert metrics["cpu_seconds"] > 0 and metrics["peak_rss_mb"] > 0
+
+    baseline = json.loads((tmp_path / "base.json").read_text(encoding="utf-8"))
+    baseline["scenarios"]["batch"]["requests_per_second"] *= 100
+    (tmp_path / "fast.json").write_text(json.dumps(baseline), encoding="utf-8")
+    second = _throughput(*args, "--baseline", str(tmp_path / "fast.json"))
+    assert second.returncode == 1
+    assert "REGRESSION batch requests_per_second" in second.stderr
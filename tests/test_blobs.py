@@ -0,0 +1,78 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from openfootprint.core import pipeline
+from openfootprint.core.inputs import LookupInputs
+from openfootprint.sources.developer.github import SOURCE as GITHUB
+from openfootprint.sources.developer.gitlab import SOURCE as GITLAB
+from openfootprint.sources.registry import SourceRegistry
+from openfootprint.storage import blobs
+from openfootprint.storage.blobs import BlobStore, read_blob
+
+
+def test_blob_store_deduplicates_and_compresses(tmp_path: Path):
+    store = BlobStore(tmp_path, codec="gzip")
+    body = b"<html>" + b"x" * 10000 + b"</html>"
+    first = store.put(body)
+    second = store.put(body)
+    assert first.path == second.path
+    assert first.path.suffix == ".gz"
+    assert first.path.stat().st_size < len(body) // 10
+    assert first.path.parent.parent.name == first.digest[:2]
+    assert store.read(first.digest) == body
+    assert len(list((tmp_path / "objects").rglob("*.gz"))) == 1
+
+
+def test_blob_writer_hashes_while_streaming(tmp_path: Path):
+    store = BlobStore(tmp_path, codec="gzip")
+    writer = store.writer()
+    for chunk in (b"hello ", b"world"):
+        writer.write(chunk)
+    ref = writer.commit()
+    assert ref.digest == store.put(b"hello world").digest
+    assert ref.size == 11
+    assert read_blob(ref.path) == b"hello world"
+    assert list(store.tmp_dir.iterdir()) == []
+
+
+@pytest.mark.skipif(blobs.zstandard is None, reason="zstandard not installed")
+def test_blob_store_uses_zstd_when_available(tmp_path: Path):
+    store = BlobStore(tmp_path)
+    ref = store.put(b"zstd body")
+    assert ref.path.suffix == ".zst"
+    assert store.read(ref.digest) == b"zstd body"
+
+
+def test_blob_store_indexes_urls(tmp_path: Path):
+    store = BlobStore(tmp_path, codec="gzip")
+    ref = store.put(b"body")
+    store.record_url("https://example.com/a", ref.digest, "run-1", "example", 200)
+    store.record_url("https://example.com/a", ref.digest, "run-2", "example", 200)
+    rows = store.lookup_url("https://example.com/a")
+    assert [row["run_id"] for row in rows] == ["run-1", "run-2"]
+    store.close()
+
+
+def test_run_lookup_references_shared_blobs(tmp_path: Path, fake_http):
+    page = b"<title>Same page</title>"
+    fake_http.respond(page)
+    config = {
+        "http": {"user_agent": "UA", "timeout_seconds": 1},
+        "rate_limit": {"min_interval_seconds": 0},
+        "output": {"runs_dir": str(tmp_path / "runs")},
+        "storage": {"blobs": True, "blob_dir": str(tmp_path / "blobs"), "compression": "gzip"},
+    }
+    result = pipeline.run_lookup(
+        LookupInputs.from_raw("alice", None, None, None), SourceRegistry([GITHUB, GITLAB]), config
+    )
+
+    evidence = [finding.entity.evidence[0] for finding in result["findings"]]
+    assert evidence[0].raw_path == evidence[1].raw_path
+    assert read_blob(Path(evidence[0].raw_path)) == page
+    run_dir = Path(result["paths"]["manifest"]).parent
+    refs = [json.loads(line) for line in (run_dir / "raw" / "refs.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert [ref["source_id"] for ref in refs] == ["github", "gitlab"]
+    assert refs[0]["digest"] == evidence[0].raw_hash
+    assert not list((run_dir / "raw").glob("*.bin"))
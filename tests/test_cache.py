@@ -0,0 +1,118 @@
+import json
+from pathlib import Path
+
+from openfootprint.core import pipeline
+from openfootprint.core.cache import ResponseCache
+from openfootprint.core.fetcher import Fetcher
+from openfootprint.core.inputs import LookupInputs
+from openfootprint.policies.rate_limit import RateLimiter
+from openfootprint.policies.robots import RobotsPolicy
+from openfootprint.sources.developer.github import SOURCE as GITHUB
+from openfootprint.sources.registry import SourceRegistry
+
+
+class _Clock:
+    def __init__(self):
+        self.value = 1000.0
+
+    def __call__(self):
+        return self.value
+
+
+def _fetcher(cache, http_get):
+    limiter = RateLimiter(min_interval=0.0, now=lambda: 0.0, sleeper=lambda _s: None)
+    return Fetcher("UA", 10, RobotsPolicy(), limiter, http_get, lambda _url, _headers, _timeout: "", cache=cache)
+
+
+def _response(status_code, content=b"", headers=None):
+    return type("R", (), {"status_code": status_code, "content": content, "headers": headers or {}})()
+
+
+def test_cache_round_trip_and_ttl(tmp_path: Path):
+    clock = _Clock()
+    cache = ResponseCache(tmp_path, default_ttl=60, ttl_by_source={"slow": 600}, now=clock)
+    key = cache.key("GET", "https://example.com/alice", {"Accept": "text/html"})
+    assert key != cache.key("GET", "https://example.com/alice", {"Accept": "application/json"})
+
+    assert cache.store(key, "fast", "https://example.com/alice", 200, {"ETag": '"v1"'}, b"body")
+    cached = cache.lookup(key)
+    assert cached.content == b"body"
+    assert cached.is_fresh(clock.value + 59)
+    assert not cached.is_fresh(clock.value + 61)
+    assert cached.validators() == {"If-None-Match": '"v1"'}
+    assert cache.ttl_for("slow") == 600
+
+
+def test_cache_skips_uncacheable_responses(tmp_path: Path):
+    cache = ResponseCache(tmp_path)
+    assert not cache.store("a" * 64, "s", "https://example.com", 500, {}, b"oops")
+    assert not cache.store("b" * 64, "s", "https://example.com", 200, {"Cache-Control": "no-store"}, b"x")
+    assert cache.lookup("a" * 64) is None
+
+
+def test_cache_evicts_least_recently_used(tmp_path: Path):
+    cache = ResponseCache(tmp_path, max_bytes=2500)
+    keys = [cache.key("GET", f"https://example.com/{i}") for i in range(3)]
+    for key in keys:
+        cache.store(key, "s", "https://example.com", 200, {}, b"x" * 1000)
+    assert cache.lookup(keys[0]) is None
+    assert cache.lookup(keys[2]) is not None
+
+
+def test_fetcher_serves_fresh_hits_and_revalidates(tmp_path: Path):
+    clock = _Clock()
+    cache = ResponseCache(tmp_path, default_ttl=60, now=clock)
+    calls = []
+
+    def http_get(url, headers, _timeout):
+        calls.append(dict(headers))
+        if len(calls) == 1:
+            return _response(200, b"profile", {"ETag": '"v1"'})
+        return _response(304)
+
+    fetcher = _fetcher(cache, http_get)
+    first = fetcher.get("https://example.com/alice", "example")
+    assert first.cache_status == "miss"
+
+    second = fetcher.get("https://example.com/alice", "example")
+    assert second.cache_status == "hit"
+    assert second.content == b"profile"
+    assert len(calls) == 1
+    # A hit is dated by when its body was stored (clock 1000s), not when it was served.
+    assert second.fetched_at == "1970-01-01T00:16:40Z"
+    assert first.fetched_at > second.fetched_at
+
+    clock.value += 120
+    third = fetcher.get("https://example.com/alice", "example")
+    assert third.cache_status == "revalidated"
+    assert third.content == b"profile"
+    assert calls[1]["If-None-Match"] == '"v1"'
+    assert cache.lookup(cache.key("GET", "https://example.com/alice")).is_fresh(clock.value)
+
+
+def test_run_lookup_records_cache_hits_in_manifest(tmp_path: Path, monkeypatch):
+    calls = []
+
+    def fake_http_get(url, _headers, _timeout):
+        calls.append(url)
+        return _response(200, b"<title>Alice</title>")
+
+    monkeypatch.setattr(pipeline, "_http_get", fake_http_get)
+    monkeypatch.setattr(pipeline, "_robots_fetch", lambda _url, _headers, _timeout: "User-agent: *\nAllow: /")
+    config = {
+        "http": {"user_agent": "UA", "timeout_seconds": 1},
+        "rate_limit": {"min_interval_seconds": 0},
+        "output": {"runs_dir": str(tmp_path / "runs")},
+        "cache": {"enabled": True, "dir": str(tmp_path / "cache")},
+    }
+    inputs = LookupInputs.from_raw("alice", None, None, None)
+    registry = SourceRegistry([GITHUB])
+
+    first = pipeline.run_lookup(inputs, registry, config)
+    second = pipeline.run_lookup(inputs, registry, config)
+
+    assert calls == ["https://github.com/alice"]
+    manifest = json.loads(Path(second["paths"]["manifest"]).read_text(encoding="utf-8"))
+    assert manifest["cache"]["hits"] == ["https://github.com/alice"]
+    assert Path(second["findings"][0].entity.evidence[0].raw_path).exists()
+    assert first["run_id"] != second["run_id"]
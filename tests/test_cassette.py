@@ -0,0 +1,163 @@
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from openfootprint.core.cassette import Cassette, CassetteMiss, ReplayedError
+from openfootprint.core.inputs import LookupInputs
+from openfootprint.core.pipeline import run_lookup
+from openfootprint.core.schema import Entity, Evidence, Finding, Identifier
+from openfootprint.sources.base import RequestSpec, Source
+from openfootprint.sources.registry import SourceRegistry
+
+
+def _answer(url: str) -> tuple[int, dict, bytes]:
+    content = f"<html><head><title>{url}</title></head></html>".encode()
+    if "busy" in url:
+        return 429, {"Retry-After": "30"}, content
+    return 200, {"Content-Type": "text/html"}, content
+
+
+def _registry() -> SourceRegistry:
+    def parse(result, inputs, raw_info):
+        if result.status_code != 200:
+            return []
+        evidence = [
+            Evidence("example", result.url, path, digest, "example.profile", None, "2024-01-01T00:00:00Z")
+            for path, digest in raw_info
+        ]
+        entity = Entity(f"example:{result.url}", result.content.decode("utf-8"), [result.url], [], evidence)
+        return [Finding(source_id="example", type="profile", entity=entity)]
+
+    def execute(_request, inputs, run_paths, _config, runner):
+        output = run_paths.raw_dir / "tools" / "echo" / "out.txt"
+        output.parent.mkdir(parents=True, exist_ok=True)
+        script = f"import pathlib, sys; pathlib.Path(sys.argv[1]).write_text('{inputs.username}-from-tool')"
+        result = runner([sys.executable, "-c", script, str(output)], Path.cwd(), {}, 30)
+        if result.returncode != 0 or not output.exists():
+            return []
+        name = output.read_text(encoding="utf-8")
+        entity = Entity(f"echo:{name}", name, [], [Identifier("username", name)])
+        return [Finding(source_id="echo", type="profile", entity=entity)]
+
+    urls = ["https://a.example/alice", "https://a.example/alice/about", "https://busy.example/alice"]
+    return SourceRegistry(
+        [
+            Source(
+                source_id="example",
+                name="Example",
+                category="developer",
+                supported_inputs={"username"},
+                build_requests=lambda _inputs: [RequestSpec(url=url, input_type="username") for url in urls],
+                parse=parse,
+            ),
+            Source(
+                source_id="echo",
+                name="Echo",
+                category="tools",
+                supported_inputs={"username"},
+                build_requests=lambda _inputs: [RequestSpec("tool://echo", "username", transport="tool")],
+                parse=lambda _result, _inputs, _raw: [],
+                execute=execute,
+            ),
+        ]
+    )
+
+
+def _config(tmp_path: Path, mode: str, min_interval: float) -> dict:
+    return {
+        "http": {"user_agent": "UA", "timeout_seconds": 1},
+        "rate_limit": {"min_interval_seconds": min_interval},
+        "output": {"runs_dir": str(tmp_path / mode)},
+        "storage": {"blobs": True, "blob_dir": str(tmp_path / "blobs")},
+        "cassette": {"mode": mode, "path": str(tmp_path / "lookup.cassette")},
+    }
+
+
+def _summary(findings) -> list:
+    return [(finding.source_id, finding.entity.entity_id, finding.entity.display_name) for finding in findings]
+
+
+def test_replay_reproduces_a_recorded_lookup_without_network_or_tools(tmp_path: Path, monkeypatch, fake_http):
+    from openfootprint.core import pipeline
+
+    fake_http.route(_answer)
+    inputs = LookupInputs.from_raw("alice", None, None, None)
+    recorded = run_lookup(inputs, _registry(), _config(tmp_path, "record", 0))
+
+    cassette = Cassette(tmp_path / "lookup.cassette", "replay")
+    assert cassette.interactions() == {"http": 3, "robots": 2, "tool": 1}
+    cassette.close()
+
+    def refuse(*_args, **_kwargs):
+        raise AssertionError("replay must not run tools")
+
+    fake_http.offline = True
+    monkeypatch.setattr(pipeline, "run_command", refuse)
+    started = time.monotonic()
+    # Politeness delays and the recorded Retry-After would take far longer than this if they applied.
+    replayed = run_lookup(inputs, _registry(), _config(tmp_path, "replay", 5))
+
+    assert time.monotonic() - started < 3
+    assert _summary(replayed["findings"]) == _summary(recorded["findings"])
+    assert ("echo", "echo:alice-from-tool", "alice-from-tool") in _summary(replayed["findings"])
+    assert len(replayed["findings"]) == 3
+
+
+def test_replay_serves_repeated_requests_in_order_and_reraises_errors(tmp_path: Path, fake_http):
+    path = tmp_path / "unit.cassette"
+    answers = iter([_answer("https://a.example/one"), _answer("https://busy.example/one")])
+
+    def answer(url):
+        if "down" in url:
+            raise ConnectionError("connection refused")
+        return next(answers)
+
+    fake_http.route(answer)
+    recorder = Cassette(path, "record")
+    get = recorder.wrap_http(fake_http.get)
+    for _attempt in range(2):
+        response = get("https://a.example/one", {}, 1)
+        b"".join(response.iter_content())
+        response.close()
+    with pytest.raises(ConnectionError):
+        get("https://down.example/", {}, 1)
+    recorder.close()
+
+    player = Cassette(path, "replay")
+    get = player.wrap_http(None)
+    assert [get("https://a.example/one", {}, 1).status_code for _attempt in range(3)] == [200, 429, 429]
+    with pytest.raises(ReplayedError, match="connection refused"):
+        get("https://down.example/", {}, 1)
+    with pytest.raises(CassetteMiss):
+        get("https://never.example/", {}, 1)
+    player.close()
+
+
+def test_replay_opens_read_only_and_rejects_other_format_versions(tmp_path: Path):
+    import sqlite3
+
+    path = tmp_path / "unit.cassette"
+    recorder = Cassette(path, "record")
+    robots = recorder.wrap_robots(lambda _url, _headers, _timeout: "User-agent: *\nAllow: /")
+    robots("https://a.example/robots.txt", {}, 1)
+    recorder.close()
+    recorded = path.read_bytes()
+
+    player = Cassette(path, "replay")
+    with pytest.raises(sqlite3.OperationalError, match="readonly"):
+        player._db.execute("INSERT INTO meta (key, value) VALUES ('touched', '1')")
+    player.close()
+    assert path.read_bytes() == recorded
+
+    db = sqlite3.connect(path)
+    db.execute("UPDATE meta SET value = '0' WHERE key = 'version'")
+    db.commit()
+    db.close()
+    for mode in ("replay", "record"):
+        with pytest.raises(ValueError, match="format version 0"):
+            Cassette(path, mode)
+    (tmp_path / "other.sqlite").write_bytes(b"not a database at all, just some bytes padding it out")
+    with pytest.raises(ValueError, match="Not a cassette"):
+        Cassette(tmp_path / "other.sqlite", "replay")
@@ -1,5 +1,9 @@
-from openfootprint.core.correlate import correlate_findings
-from openfootprint.core.schema import Entity, Finding, Identifier
+from openfootprint.core.correlate import (
+    Correlator,
+    canonicalize_url,
+    correlate_findings,
+)
+from openfootprint.core.schema import Entity, Evidence, Finding, Identifier
 
 
 def test_correlate_merges_by_identifier():
@@ -11,3 +15,51 @@ def test_correlate_merges_by_identifier():
     ]
     merged = correlate_findings(findings)
     assert len(merged) == 1
+
+
+def _finding(entity_id, identifiers=(), urls=(), evidence=()):
+    entity = Entity(
+        entity_id=entity_id,
+        display_name=None,
+        profile_urls=list(urls),
+        identifiers=list(identifiers),
+        evidence=list(evidence),
+    )
+    return Finding(source_id="s", type="profile", entity=entity)
+
+
+def test_canonicalize_url_folds_scheme_host_case_and_trailing_slash():
+    assert canonicalize_url("HTTPS://WWW.GitHub.com:443/Alice/") == canonicalize_url("https://github.com/alice")
+    assert canonicalize_url("https://example.com:8443/a") == "https://example.com:8443/a"
+
+
+def test_correlate_merges_on_secondary_identifier_and_shared_url():
+    findings = [
+        _finding("a", [Identifier("username", "alice"), Identifier("email", "a@b.com")]),
+        _finding("b", [Identifier("username", "other"), Identifier("email", "A@B.com")]),
+        _finding("c", [Identifier("username", "third")], urls=["https://github.com/Third/"]),
+        _finding("d", urls=["http://www.github.com/third"]),
+        _finding("e", [Identifier("username", "loner")]),
+    ]
+    merged = correlate_findings(findings)
+    assert [entity.entity_id for entity in merged] == ["a", "c", "e"]
+    assert merged[1].profile_urls == ["https://github.com/Third/"]
+
+
+def test_correlate_deduplicates_evidence_and_identifiers():
+    evidence = Evidence("s", "https://x", "raw", "hash", "p", None, "2024-01-01T00:00:00Z")
+    ident = Identifier("username", "alice", evidence=[evidence])
+    findings = [_finding("a", [ident], evidence=[evidence]), _finding("b", [ident], evidence=[evidence])]
+    (entity,) = correlate_findings(findings)
+    assert len(entity.identifiers) == 1
+    assert entity.identifiers[0].evidence == [evidence]
+    assert entity.evidence == [evidence]
+
+
+def test_correlator_merges_incrementally():
+    correlator = Correlator()
+    correlator.add(_finding("a", [Identifier("username", "alice")]))
+    correlator.add(_finding("b", [Identifier("email", "a@b.com")]))
+    assert len(correlator.entities()) == 2
+    correlator.add(_finding("c", [Identifier("username", "alice"), Identifier("email", "a@b.com")]))
+    assert [entity.entity_id for entity in correlator.entities()] == ["a"]
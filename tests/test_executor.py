@@ -0,0 +1,89 @@
+import threading
+import time
+from pathlib import Path
+
+from openfootprint.core.executor import FetchPool, HostSlots
+from openfootprint.core.fetcher import FetchResult
+from openfootprint.core.inputs import LookupInputs
+from openfootprint.core.pipeline import run_lookup
+from openfootprint.core.schema import Entity, Finding
+from openfootprint.sources.base import RequestSpec, Source
+from openfootprint.sources.registry import SourceRegistry
+
+
+class _RecordingFetcher:
+    def __init__(self, delay):
+        self.delay = delay
+        self.active = {}
+        self.peak = {}
+        self.lock = threading.Lock()
+
+    def get(self, url, source_id, headers=None):
+        host = url.split("/")[2]
+        with self.lock:
+            self.active[host] = self.active.get(host, 0) + 1
+            self.peak[host] = max(self.peak.get(host, 0), self.active[host])
+        time.sleep(self.delay)
+        with self.lock:
+            self.active[host] -= 1
+        return FetchResult(url=url, status_code=200, headers={}, content=b"ok", error=None)
+
+
+def test_fetch_pool_caps_requests_per_host():
+    fetcher = _RecordingFetcher(delay=0.05)
+    with FetchPool(fetcher, max_workers=8, per_host=2) as pool:
+        futures = [pool.submit(f"https://a.example/{i}", "a") for i in range(6)]
+        futures += [pool.submit(f"https://b.example/{i}", "b") for i in range(2)]
+        results = [future.result() for future in futures]
+    assert [result.url for result in results][:2] == ["https://a.example/0", "https://a.example/1"]
+    assert fetcher.peak["a.example"] == 2
+    assert fetcher.peak["b.example"] == 2
+
+
+def test_host_slots_share_semaphore_per_host():
+    slots = HostSlots(per_host=1)
+    with slots.hold("a.example"):
+        assert slots.semaphores["a.example"].acquire(blocking=False) is False
+        with slots.hold("b.example"):
+            pass
+
+
+def test_run_lookup_fetches_concurrently_in_plan_order(tmp_path: Path, fake_http):
+    delays = {"slow": 0.3, "mid": 0.2, "fast": 0.1}
+
+    def make_source(source_id):
+        def build(_inputs):
+            return [RequestSpec(url=f"https://{source_id}.example/alice", input_type="username")]
+
+        def parse(result, _inputs, _raw):
+            entity = Entity(entity_id=f"{source_id}:alice", display_name=None)
+            return [Finding(source_id=source_id, type="profile", entity=entity)]
+
+        return Source(
+            source_id=source_id,
+            name=source_id,
+            category="developer",
+            supported_inputs={"username"},
+            build_requests=build,
+            parse=parse,
+        )
+
+    def answer(url):
+        time.sleep(delays[url.split("/")[2].split(".")[0]])
+        return 200, {}, b"<html></html>"
+
+    fake_http.route(answer)
+
+    registry = SourceRegistry([make_source(source_id) for source_id in delays])
+    config = {
+        "http": {"user_agent": "UA", "timeout_seconds": 1},
+        "rate_limit": {"min_interval_seconds": 0},
+        "output": {"runs_dir": str(tmp_path)},
+        "concurrency": {"max_workers": 4, "per_host": 1},
+    }
+    started = time.monotonic()
+    result = run_lookup(LookupInputs.from_raw("alice", None, None, None), registry, config)
+    elapsed = time.monotonic() - started
+
+    assert [finding.source_id for finding in result["findings"]] == ["slow", "mid", "fast"]
+    assert elapsed < sum(delays.values())
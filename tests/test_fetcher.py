@@ -1,12 +1,15 @@
+from hashlib import sha256
+
 from openfootprint.core.fetcher import Fetcher
-from openfootprint.policies.robots import RobotsPolicy
 from openfootprint.policies.rate_limit import RateLimiter
+from openfootprint.policies.robots import RobotsPolicy
+from openfootprint.storage.blobs import BlobStore
 
 
 def test_fetcher_respects_robots():
     policy = RobotsPolicy()
 
-    def robots_fetcher(_url):
+    def robots_fetcher(_url, _headers, _timeout):
         return "User-agent: *\nDisallow: /"
 
     def http_get(_url, _headers, _timeout):
@@ -17,3 +20,88 @@ def test_fetcher_respects_robots():
 
     result = fetcher.get("https://example.com", "example")
     assert result.skipped is True
+
+
+class _StreamedResponse:
+    def __init__(self, chunks, status_code=200):
+        self.status_code = status_code
+        self.headers = {"Content-Type": "text/html"}
+        self.chunks = chunks
+        self.served = 0
+        self.closed = False
+
+    def iter_content(self, chunk_size=None):
+        for chunk in self.chunks:
+            self.served += 1
+            yield chunk
+
+    def close(self):
+        self.closed = True
+
+
+def _streaming_fetcher(response, **kwargs):
+    limiter = RateLimiter(min_interval=0.0, now=lambda: 0.0, sleeper=lambda _s: None)
+    return Fetcher(
+        "UA",
+        10,
+        RobotsPolicy(),
+        limiter,
+        lambda _url, _headers, _timeout: response,
+        lambda _url, _headers, _timeout: "",
+        **kwargs,
+    )
+
+
+def test_fetcher_truncates_body_at_source_limit():
+    response = _StreamedResponse([b"a" * 4, b"b" * 4, b"c" * 4, b"never"])
+    fetcher = _streaming_fetcher(response, max_body_bytes=100, body_limits={"small": 6})
+
+    result = fetcher.get("https://example.com/page", "small")
+
+    assert result.content == b"aaaabb"
+    assert result.truncated is True
+    assert result.content_hash == sha256(b"aaaabb").hexdigest()
+    assert response.served == 2
+    assert response.closed
+
+
+def test_fetcher_spools_body_to_blob_store_while_reading(tmp_path):
+    store = BlobStore(tmp_path / "blobs", codec="gzip")
+    response = _StreamedResponse([b"<html>", b"profile", b"</html>"])
+    fetcher = _streaming_fetcher(response, blob_store=store)
+
+    result = fetcher.get("https://example.com/page", "example")
+
+    assert result.truncated is False
+    assert result.blob is not None
+    assert result.blob.digest == result.content_hash == sha256(b"<html>profile</html>").hexdigest()
+    assert store.read(result.blob.digest) == b"<html>profile</html>"
+    store.close()
+
+
+def test_fetcher_hashes_each_chunk_once_when_spooling(tmp_path, monkeypatch):
+    from openfootprint.core import fetcher as fetcher_module
+
+    hashed = []
+
+    class CountingHash:
+        def __init__(self):
+            self._hash = sha256()
+
+        def update(self, chunk):
+            hashed.append(chunk)
+            self._hash.update(chunk)
+
+        def hexdigest(self):
+            return self._hash.hexdigest()
+
+    monkeypatch.setattr(fetcher_module, "sha256", CountingHash)
+    store = BlobStore(tmp_path / "blobs", codec="gzip")
+    fetcher = _streaming_fetcher(_StreamedResponse([b"<html>", b"profile"]), blob_store=store)
+
+    result = fetcher.get("https://example.com/page", "example")
+
+    # Only the blob writer hashed the body on its way to the store.
+    assert hashed == []
+    assert result.content_hash == sha256(b"<html>profile").hexdigest()
+    store.close()
@@ -0,0 +1,42 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Seconds allowed for importing the CLI and running the command, measured inside the child process.
+# Generous on purpose: the module check below is the precise guard, this one catches gross regressions.
+BUDGET = float(os.environ.get("OPENFOOTPRINT_IMPORT_BUDGET", "0.3"))
+HEAVY = ("bs4", "requests", "urllib3", "phonenumbers", "openfootprint.core.pipeline")
+
+_PROBE = """
+import contextlib, io, json, sys, time
+started = time.perf_counter()
+from openfootprint import cli
+with contextlib.redirect_stdout(io.StringIO()):
+    cli.main(sys.argv[1:])
+elapsed = time.perf_counter() - started
+print(json.dumps({"seconds": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+
+def _probe(*argv: str) -> dict:
+    env = os.environ.copy()
+    env["PYTHONPATH"] = str(Path(__file__).resolve().parents[1] / "src")
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE, *argv], capture_output=True, text=True, env=env, check=True
+    )
+    return json.loads(result.stdout)
+
+
+@pytest.mark.parametrize("argv", [("sources", "list"), ("sources", "info", "github"), ("plan", "--username", "a")])
+def test_metadata_commands_stay_light(argv):
+    # Take the best of a few runs so a busy machine does not fail the budget.
+    runs = [_probe(*argv) for _ in range(3)]
+    loaded = set(runs[0]["modules"])
+    assert not loaded & set(HEAVY)
+    if argv[0] == "sources":
+        assert not any(name.startswith("openfootprint.sources.developer") for name in loaded)
+    assert min(run["seconds"] for run in runs) < BUDGET
@@ -0,0 +1,90 @@
+import json
+from pathlib import Path
+
+from openfootprint.core.inputs import LookupInputs
+from openfootprint.core.pipeline import run_lookup
+from openfootprint.core.schema import Entity, Finding, Identifier
+from openfootprint.sources.base import RequestSpec, Source
+from openfootprint.sources.registry import SourceRegistry
+from openfootprint.storage.index import IdentityIndex
+
+
+def _finding(source_id: str, username: str, url: str) -> dict:
+    entity = Entity(
+        entity_id=f"{source_id}:{username}",
+        display_name=None,
+        profile_urls=[url],
+        identifiers=[Identifier("username", username)],
+    )
+    return Finding(source_id=source_id, type="profile", entity=entity).to_dict()
+
+
+def _manifest(run_id: str, started_at: str) -> dict:
+    return {"run_id": run_id, "inputs": {"username": "alice"}, "started_at": started_at, "finished_at": started_at}
+
+
+def test_index_finds_identifiers_and_urls_across_runs(tmp_path: Path):
+    index = IdentityIndex(tmp_path / "identity.sqlite", runs_dir=tmp_path)
+    github = _finding("github", "Alice", "https://github.com/Alice")
+    gitlab = _finding("gitlab", "alice", "https://gitlab.com/alice")
+    index.index_run(_manifest("run1", "2024-01-01T00:00:00Z"), [github])
+    index.index_run(_manifest("run2", "2024-02-01T00:00:00Z"), [gitlab])
+
+    rows = index.search("ALICE", kind="username")
+    assert [(row["run_id"], row["source_id"]) for row in rows] == [("run2", "gitlab"), ("run1", "github")]
+    assert [row["run_id"] for row in index.search("alice", source_id="github")] == ["run1"]
+    assert [row["run_id"] for row in index.search("http://www.github.com/alice/")] == ["run1"]
+    assert [row["kind"] for row in index.search("github:Alice")] == ["entity"]
+
+    index.index_run(_manifest("run1", "2024-01-01T00:00:00Z"), [])
+    assert [row["run_id"] for row in index.search("alice", kind="username")] == ["run2"]
+    index.close()
+
+
+def test_index_rebuild_reads_existing_and_batch_runs(tmp_path: Path):
+    run_dir = tmp_path / "20240101T000000Z"
+    run_dir.mkdir()
+    (run_dir / "manifest.json").write_text(json.dumps(_manifest(run_dir.name, "2024-01-01T00:00:00Z")))
+    report = {"findings": [_finding("github", "bob", "https://github.com/bob")]}
+    (run_dir / "report.json").write_text(json.dumps(report))
+    subject_dir = tmp_path / "batch-20240102T000000Z" / "runs" / "0000000"
+    subject_dir.mkdir(parents=True)
+    (subject_dir / "manifest.json").write_text(json.dumps(_manifest("0000000", "2024-01-02T00:00:00Z")))
+    finding = _finding("reddit", "bob", "https://reddit.com/u/bob")
+    (subject_dir / "findings.ndjson").write_text(json.dumps(finding) + "\n")
+
+    index = IdentityIndex(tmp_path / ".index" / "identity.sqlite", runs_dir=tmp_path)
+    assert index.rebuild() == 2
+    assert index.rebuild() == 0
+    assert [row["run_id"] for row in index.search("bob", kind="username")] == [
+        "batch-20240102T000000Z/runs/0000000",
+        "20240101T000000Z",
+    ]
+    index.close()
+
+
+def test_run_lookup_updates_index(tmp_path: Path, fake_http):
+    def parse(result, inputs, _raw):
+        entity = Entity("example:alice", None, [result.url], [Identifier("username", inputs.username)])
+        return [Finding(source_id="example", type="profile", entity=entity)]
+
+    source = Source(
+        source_id="example",
+        name="Example",
+        category="developer",
+        supported_inputs={"username"},
+        build_requests=lambda _inputs: [RequestSpec(url="https://example.com/alice", input_type="username")],
+        parse=parse,
+    )
+
+    config = {
+        "http": {"user_agent": "UA", "timeout_seconds": 1},
+        "rate_limit": {"min_interval_seconds": 0},
+        "output": {"runs_dir": str(tmp_path)},
+        "index": {"enabled": True},
+    }
+    results = run_lookup(LookupInputs.from_raw("alice", None, None, None), SourceRegistry([source]), config)
+
+    index = IdentityIndex(tmp_path / ".index" / "identity.sqlite", runs_dir=tmp_path)
+    assert [row["run_id"] for row in index.search("https://example.com/alice")] == [results["run_id"]]
+    index.close()
@@ -18,7 +18,7 @@ def test_integration_with_fixture(tmp_path: Path, monkeypatch):
     def fake_http_get(_url, _headers, _timeout):
         return FakeResponse()
 
-    def fake_robots(_url):
+    def fake_robots(_url, _headers, _timeout):
         return "User-agent: *\nAllow: /"
 
     from openfootprint.core import pipeline
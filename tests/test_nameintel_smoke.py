@@ -2,12 +2,24 @@ import subprocess
 import sys
 
 
-def test_nameintel_dry_run_exits_zero():
+def test_nameintel_dry_run_exits_zero(tmp_path):
     proc = subprocess.run(
-        [sys.executable, "-m", "openfootprint", "nameintel", "--first", "John", "--last", "Doe", "--dry-run"],
+        [
+            sys.executable,
+            "-m",
+            "openfootprint",
+            "nameintel",
+            "--first",
+            "John",
+            "--last",
+            "Doe",
+            "--dry-run",
+            "--output",
+            str(tmp_path / "runs"),
+        ],
         capture_output=True,
         text=True,
     )
     assert proc.returncode == 0
     assert "permutations" in (proc.stdout + proc.stderr).lower()
-
+    assert any((tmp_path / "runs").iterdir())
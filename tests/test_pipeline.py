@@ -2,7 +2,7 @@ from pathlib import Path
 
 from openfootprint.core.inputs import LookupInputs
 from openfootprint.core.pipeline import run_lookup
-from openfootprint.sources.base import Source, RequestSpec
+from openfootprint.sources.base import RequestSpec, Source
 from openfootprint.sources.registry import SourceRegistry
 
 
@@ -34,7 +34,7 @@ def test_pipeline_runs_with_fake_source(tmp_path: Path, monkeypatch):
     def fake_http_get(_url, _headers, _timeout):
         return FakeResponse()
 
-    def fake_robots(_url):
+    def fake_robots(_url, _headers, _timeout):
         return "User-agent: *\nAllow: /"
 
     from openfootprint.core import pipeline
@@ -1,9 +1,10 @@
+import time
 from pathlib import Path
 
 from openfootprint.core.inputs import LookupInputs
 from openfootprint.core.pipeline import run_lookup
 from openfootprint.core.schema import Entity, Finding, Identifier
-from openfootprint.sources.base import Source, RequestSpec
+from openfootprint.sources.base import RequestSpec, Source
 from openfootprint.sources.registry import SourceRegistry
 
 
@@ -56,3 +57,58 @@ def test_pipeline_executes_tool_source(tmp_path: Path, monkeypatch):
     result = run_lookup(inputs, registry, config)
     assert called["ran"] is True
     assert result["findings"]
+
+
+def test_pipeline_runs_tools_in_parallel_with_http(tmp_path: Path, fake_http):
+    def make_tool(source_id):
+        def build(_inputs):
+            return [RequestSpec(url=f"tool://{source_id}", input_type="username", transport="tool")]
+
+        def execute(_request, inputs, _run_paths, _config, _runner):
+            time.sleep(0.3)
+            entity = Entity(entity_id=f"{source_id}:alice", display_name="alice")
+            return [Finding(source_id=source_id, type="profile", entity=entity)]
+
+        return Source(
+            source_id=source_id,
+            name=source_id,
+            category="tools",
+            supported_inputs={"username"},
+            build_requests=build,
+            parse=lambda *_args: [],
+            execute=execute,
+        )
+
+    def http_build(_inputs):
+        return [RequestSpec(url="https://example.com/alice", input_type="username")]
+
+    def http_parse(_result, _inputs, _raw):
+        entity = Entity(entity_id="http:alice", display_name="alice")
+        return [Finding(source_id="http", type="profile", entity=entity)]
+
+    def slow_answer(_url):
+        time.sleep(0.3)
+        return 200, {}, b""
+
+    fake_http.route(slow_answer)
+
+    registry = SourceRegistry(
+        [
+            make_tool("sherlock"),
+            Source("http", "HTTP", "developer", {"username"}, http_build, http_parse),
+            make_tool("maigret"),
+            make_tool("whatsmyname"),
+        ]
+    )
+    config = {
+        "http": {"user_agent": "UA", "timeout_seconds": 1},
+        "rate_limit": {"min_interval_seconds": 0},
+        "output": {"runs_dir": str(tmp_path)},
+        "tools": {"max_parallel": 3},
+    }
+    started = time.monotonic()
+    result = run_lookup(LookupInputs.from_raw("alice", None, None, None), registry, config)
+    elapsed = time.monotonic() - started
+
+    assert [finding.source_id for finding in result["findings"]] == ["sherlock", "http", "maigret", "whatsmyname"]
+    assert elapsed < 0.9
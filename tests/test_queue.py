@@ -0,0 +1,148 @@
+import multiprocessing
+from pathlib import Path
+
+import pytest
+
+from openfootprint.core.cassette import Cassette
+from openfootprint.core.worker import run_worker, worker_config
+from openfootprint.policies.rate_limit import SharedHostThrottle
+from openfootprint.storage.blobs import BlobStore
+from openfootprint.storage.index import IdentityIndex
+from openfootprint.storage.queue import JobQueue, LeaseLost
+from openfootprint.storage.rundb import RunDatabase
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_claim_leases_each_job_once(tmp_path: Path):
+    queue = JobQueue(tmp_path / "jobs.sqlite")
+    first = queue.enqueue("lookup", {"username": "alice"})
+    second = queue.enqueue("lookup", {"username": "bob"})
+    assert queue.claim("w1", 60)["job_id"] == first
+    assert queue.claim("w2", 60)["job_id"] == second
+    assert queue.claim("w3", 60) is None
+    queue.complete(first, "w1", {"run_id": "r1"})
+    job = queue.get(first)
+    assert job["status"] == "succeeded"
+    assert job["run_id"] == "r1"
+    assert job["result"] == {"run_id": "r1"}
+    assert queue.stats() == {"queued": 0, "leased": 1, "succeeded": 1, "failed": 0}
+
+
+def test_abandoned_lease_is_retried_then_failed(tmp_path: Path):
+    clock = Clock()
+    queue = JobQueue(tmp_path / "jobs.sqlite", max_attempts=2, clock=clock)
+    job_id = queue.enqueue("lookup", {"username": "alice"})
+    assert queue.claim("w1", 30)["attempts"] == 1
+    clock.now += 20
+    queue.heartbeat(job_id, "w1", 30)
+    clock.now += 20
+    assert queue.claim("w2", 30) is None  # heartbeat kept the lease alive
+
+    clock.now += 31
+    retried = queue.claim("w2", 30)
+    assert retried["job_id"] == job_id
+    assert retried["attempts"] == 2
+    with pytest.raises(LeaseLost):
+        queue.complete(job_id, "w1", {"run_id": "stale"})
+
+    clock.now += 31
+    assert queue.claim("w3", 30) is None
+    job = queue.get(job_id)
+    assert job["status"] == "failed"
+    assert job["error"] == "lease expired"
+
+
+def test_fail_requeues_until_attempts_run_out(tmp_path: Path):
+    queue = JobQueue(tmp_path / "jobs.sqlite", max_attempts=2)
+    job_id = queue.enqueue("lookup", {"username": "alice"})
+    queue.claim("w1", 60)
+    queue.fail(job_id, "w1", "boom")
+    assert queue.get(job_id)["status"] == "queued"
+    queue.claim("w1", 60)
+    queue.fail(job_id, "w1", "boom again")
+    job = queue.get(job_id)
+    assert job["status"] == "failed"
+    assert job["error"] == "boom again"
+
+
+def _claim_all(path: str, worker_id: str, results) -> None:
+    queue = JobQueue(Path(path))
+    claimed = []
+    while (job := queue.claim(worker_id, 60)) is not None:
+        claimed.append(job["job_id"])
+    queue.close()
+    results.put(claimed)
+
+
+def test_concurrent_processes_never_share_a_job(tmp_path: Path):
+    path = tmp_path / "jobs.sqlite"
+    queue = JobQueue(path)
+    expected = {queue.enqueue("lookup", {"username": f"user{index}"}) for index in range(60)}
+    queue.close()
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    workers = [context.Process(target=_claim_all, args=(str(path), f"w{index}", results)) for index in range(4)]
+    for worker in workers:
+        worker.start()
+    claimed = [job_id for _ in workers for job_id in results.get(timeout=60)]
+    for worker in workers:
+        worker.join(timeout=60)
+    assert len(claimed) == len(expected)
+    assert set(claimed) == expected
+
+
+def test_queue_uses_a_rollback_journal_for_shared_filesystems(tmp_path: Path):
+    # Workers on other hosts reach the queue over a network filesystem, where WAL cannot work.
+    path = tmp_path / "jobs.sqlite"
+    first, second = JobQueue(path), JobQueue(path)
+    assert first._db.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+    job_id = first.enqueue("lookup", {"username": "alice"})
+    assert second.claim("w1", 60)["job_id"] == job_id
+    assert not path.with_name(path.name + "-wal").exists()
+    first.close()
+    second.close()
+
+
+def test_every_store_uses_a_rollback_journal(tmp_path: Path):
+    # Run output, blobs and cassettes can live on the same shared filesystem as the queue.
+    stores = [
+        BlobStore(tmp_path / "blobs", codec="gzip"),
+        IdentityIndex(tmp_path / "index.sqlite"),
+        RunDatabase(tmp_path / "runs.sqlite"),
+        Cassette(tmp_path / "cassette.sqlite", "record"),
+        SharedHostThrottle(tmp_path / "hosts.sqlite"),
+    ]
+    for store in stores:
+        assert store._db.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+
+
+def test_worker_drains_queue_into_runs(tmp_path: Path, fake_http, example_registry):
+    config = {
+        "http": {"user_agent": "UA", "timeout_seconds": 1},
+        "rate_limit": {"min_interval_seconds": 0},
+        "output": {"runs_dir": str(tmp_path / "runs")},
+    }
+    queue = JobQueue(tmp_path / "queue" / "jobs.sqlite", max_attempts=1)
+    ok = queue.enqueue("lookup", {"username": "alice"})
+    broken = queue.enqueue("lookup", {"username": "broken"})
+    invalid = queue.enqueue("lookup", {})
+    config = worker_config(config, queue)
+    assert config["rate_limit"]["shared_path"] == str(tmp_path / "queue" / "hosts.sqlite")
+
+    processed = run_worker(queue, example_registry(), config, worker_id="w1", drain=True, log=lambda _line: None)
+
+    assert processed == 3
+    done = queue.get(ok)
+    assert done["status"] == "succeeded"
+    assert done["result"]["finding_count"] == 1
+    assert (tmp_path / "runs" / done["run_id"] / "report.json").exists()
+    assert queue.get(broken)["status"] == "failed"
+    assert "parser exploded" in queue.get(broken)["error"]
+    assert queue.get(invalid)["error"] == "lookup needs at least one of username, email, phone, name"
@@ -1,4 +1,15 @@
-from openfootprint.policies.rate_limit import RateLimiter
+import asyncio
+import threading
+
+import pytest
+
+from openfootprint.policies.rate_limit import (
+    BucketRule,
+    RateLimiter,
+    SharedHostThrottle,
+    build_rate_limiter,
+    parse_retry_after,
+)
 
 
 def test_rate_limit_sleeps():
@@ -17,3 +28,132 @@ def test_rate_limit_sleeps():
     limiter.wait("github")
 
     assert slept and slept[0] >= 0.9
+
+
+class _Clock:
+    def __init__(self):
+        self.value = 0.0
+
+    def __call__(self):
+        return self.value
+
+
+def test_rate_limit_allows_burst_then_paces():
+    clock = _Clock()
+    limiter = RateLimiter(min_interval=1.0, now=clock, sleeper=lambda _s: None, burst=3)
+    assert [limiter.reserve("example.com") for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert limiter.reserve("example.com") == 1.0
+    assert limiter.reserve("other.example") == 0.0
+
+
+def test_rate_limit_uses_host_then_source_rules():
+    clock = _Clock()
+    limiter = RateLimiter(
+        min_interval=1.0,
+        now=clock,
+        sleeper=lambda _s: None,
+        hosts={"api.openalex.org": BucketRule(rate=10, burst=1)},
+        sources={"mastodon": BucketRule(rate=0.5, burst=1)},
+    )
+    limiter.reserve("api.openalex.org", "openalex")
+    assert limiter.reserve("api.openalex.org", "openalex") == 0.1
+    limiter.reserve("mastodon.social", "mastodon")
+    assert limiter.reserve("mastodon.social", "mastodon") == 2.0
+    assert limiter.reserve("fosstodon.org", "mastodon") == 0.0
+
+
+def test_rate_limit_source_rule_holds_whichever_source_reaches_a_host_first():
+    clock = _Clock()
+    limiter = RateLimiter(
+        min_interval=1.0,
+        now=clock,
+        sleeper=lambda _s: None,
+        sources={"gravatar": BucketRule(rate=0.25, burst=1)},
+    )
+    limiter.reserve("example.com", "github")
+    limiter.reserve("example.com", "gravatar")
+    assert limiter.reserve("example.com", "gravatar") == 4.0
+    assert limiter.reserve("example.com", "github") == 1.0
+
+    limiter.feedback("example.com", 429, "30", "github")
+    # A throttled host holds back every source using it.
+    assert limiter.reserve("example.com", "gravatar") == 30.0
+
+
+def test_rate_limit_honours_retry_after_and_recovers():
+    clock = _Clock()
+    limiter = RateLimiter(min_interval=1.0, now=clock, sleeper=lambda _s: None)
+    limiter.reserve("example.com")
+    limiter.feedback("example.com", 429, "30")
+    clock.value = 5.0
+    assert limiter.reserve("example.com") == 25.0
+    assert limiter.buckets[("example.com", None)].penalty == 2.0
+
+    limiter.feedback("example.com", 200)
+    assert limiter.buckets[("example.com", None)].penalty < 2.0
+    metrics = limiter.metrics()["example.com"]
+    assert metrics["throttled"] == 1
+    assert metrics["max_wait_seconds"] == 25.0
+
+
+def test_parse_retry_after_accepts_http_dates():
+    assert parse_retry_after("120") == 120.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT", wall_clock=lambda: 1445412470.0) == 10.0
+    assert parse_retry_after("soon") is None
+
+
+def test_rate_limit_async_acquire_and_threads():
+    limiter = RateLimiter(min_interval=0.01)
+    asyncio.run(limiter.acquire_async("example.com"))
+
+    threads = [threading.Thread(target=limiter.wait, args=("example.com",)) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert limiter.metrics()["example.com"]["requests"] == 6
+
+
+def test_build_rate_limiter_from_config():
+    limiter = build_rate_limiter(
+        {"rate_limit": {"min_interval_seconds": 0.5, "hosts": {"github.com": {"rate_per_second": 4, "burst": 2}}}}
+    )
+    assert limiter.hosts["github.com"] == BucketRule(rate=4.0, burst=2.0)
+    assert limiter.min_interval == 0.5
+    assert limiter.recovery_factor == 0.8
+    assert build_rate_limiter({"rate_limit": {"recovery_factor": 0.5}}).recovery_factor == 0.5
+
+
+def test_shared_throttle_spaces_requests_across_limiters(tmp_path):
+    clock = [100.0]
+    path = tmp_path / "hosts.sqlite"
+    limiters = [
+        RateLimiter(min_interval=1.0, now=lambda: 0.0, shared=SharedHostThrottle(path, clock=lambda: clock[0]))
+        for _ in range(2)
+    ]
+    assert limiters[0].shared._db.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+    # Each limiter on its own would let its first request through at once.
+    assert limiters[0].reserve("example.com") == 0.0
+    assert limiters[1].reserve("example.com") == pytest.approx(1.0)
+    assert limiters[0].reserve("other.example") == 0.0
+
+    limiters[1].feedback("example.com", 429, "30")
+    clock[0] += 2.0
+    # The other process's Retry-After pause holds this one back too.
+    assert limiters[0].reserve("example.com") == pytest.approx(28.0)
+
+
+def test_shared_throttle_is_booked_outside_the_limiter_lock(tmp_path):
+    limiter = RateLimiter(min_interval=1.0, now=lambda: 0.0, shared=SharedHostThrottle(tmp_path / "hosts.sqlite"))
+    booked = limiter.shared.reserve
+    held = []
+
+    def reserve(*args, **kwargs):
+        held.append(limiter.lock.locked())
+        return booked(*args, **kwargs)
+
+    limiter.shared.reserve = reserve
+    limiter.reserve("example.com")
+    limiter.reserve("example.com")
+    assert held == [False, False]
+    assert limiter.metrics()["example.com"]["requests"] == 2
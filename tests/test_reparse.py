@@ -0,0 +1,140 @@
+import json
+import shutil
+from pathlib import Path
+
+from openfootprint.cli import main
+from openfootprint.core.inputs import LookupInputs
+from openfootprint.core.pipeline import run_lookup
+from openfootprint.core.reparse import find_run_dir, reparse_run
+from openfootprint.core.schema import Entity, Evidence, Finding
+from openfootprint.sources.developer.github import SOURCE as GITHUB
+from openfootprint.sources.registry import SourceRegistry
+from openfootprint.sources.tools.maigret import SOURCE as MAIGRET
+from openfootprint.storage.rundb import RunDatabase
+from openfootprint.storage.runs import iter_ndjson
+
+
+def _lookup(tmp_path: Path, registry, blobs: bool) -> tuple[Path, dict]:
+    config = {
+        "http": {"user_agent": "UA", "timeout_seconds": 1},
+        "rate_limit": {"min_interval_seconds": 0},
+        "output": {"runs_dir": str(tmp_path / "runs")},
+        "storage": {"blobs": blobs, "blob_dir": str(tmp_path / "blobs")},
+    }
+    results = run_lookup(LookupInputs.from_raw("alice", None, None, None), registry, config)
+    return Path(results["paths"]["manifest"]).parent, config
+
+
+def test_reparse_rebuilds_findings_from_blobs_with_current_parser(tmp_path: Path, fake_http, example_registry):
+    run_dir, config = _lookup(tmp_path, example_registry("low"), blobs=True)
+    fake_http.offline = True
+
+    result = reparse_run(run_dir, example_registry("high"), config)
+
+    findings = list(iter_ndjson(run_dir / "findings.ndjson"))
+    assert result["findings"] == result["previous"] == 1
+    assert [finding["confidence"] for finding in findings] == ["high"]
+    report = json.loads((run_dir / "report.json").read_text(encoding="utf-8"))
+    assert [finding["confidence"] for finding in report["findings"]] == ["high"]
+    assert result["entities"][0]["entity_id"] == "example:alice"
+
+
+def test_reparse_maps_legacy_raw_copies_back_through_evidence(tmp_path: Path, fake_http, example_registry):
+    run_dir, config = _lookup(tmp_path, example_registry("low"), blobs=False)
+    refs = list(iter_ndjson(run_dir / "raw" / "refs.jsonl"))
+    assert refs[0]["path"].endswith(".bin") and "blob" not in refs[0]
+    # Runs written before per-run copies were listed in refs.jsonl.
+    (run_dir / "raw" / "refs.jsonl").unlink()
+    fake_http.offline = True
+
+    reparse_run(run_dir, example_registry("high"), config)
+
+    findings = list(iter_ndjson(run_dir / "findings.ndjson"))
+    assert [finding["confidence"] for finding in findings] == ["high"]
+    assert findings[0]["entity"]["evidence"][0]["request_url"] == "https://example.com/alice"
+
+
+def test_reparse_keeps_the_original_fetch_time(tmp_path: Path, fake_http):
+    config = {
+        "http": {"user_agent": "UA", "timeout_seconds": 1},
+        "rate_limit": {"min_interval_seconds": 0},
+        "output": {"runs_dir": str(tmp_path / "runs")},
+    }
+    results = run_lookup(LookupInputs.from_raw("alice", None, None, None), SourceRegistry([GITHUB]), config)
+    run_dir = Path(results["paths"]["manifest"]).parent
+    refs_path = run_dir / "raw" / "refs.jsonl"
+    refs = list(iter_ndjson(refs_path))
+    assert refs[0]["fetched_at"] == results["findings"][0].entity.evidence[0].fetched_at
+    refs[0]["fetched_at"] = "2020-01-01T00:00:00Z"
+    refs_path.write_text(json.dumps(refs[0]) + "\n", encoding="utf-8")
+    fake_http.offline = True
+
+    reparse_run(run_dir, SourceRegistry([GITHUB]), config)
+
+    findings = list(iter_ndjson(run_dir / "findings.ndjson"))
+    assert [item["fetched_at"] for item in findings[0]["entity"]["evidence"]] == ["2020-01-01T00:00:00Z"]
+
+
+def test_reparse_reads_tool_outputs_and_keeps_unknown_sources(tmp_path: Path):
+    run_dir = tmp_path / "runs" / "20240101T000000Z-00000000"
+    tool_dir = run_dir / "raw" / "tools" / "maigret"
+    tool_dir.mkdir(parents=True)
+    shutil.copy("tests/fixtures/maigret_simple.json", tool_dir / "report_alice_simple.json")
+    manifest = {
+        "run_id": run_dir.name,
+        "inputs": {"username": "alice", "email": None, "phone": None, "name": None},
+        "sources": ["maigret", "retired"],
+        "started_at": "2024-01-01T00:00:00Z",
+        "finished_at": "2024-01-01T00:00:01Z",
+        "config": {},
+    }
+    (run_dir / "manifest.json").write_text(json.dumps(manifest), encoding="utf-8")
+    url = "https://retired.test/alice"
+    evidence = Evidence("retired", url, "", "", "retired.profile", None, "2024-01-01T00:00:00Z")
+    retired = Finding("retired", "profile", Entity("retired:alice", "Alice", [url], [], [evidence]))
+    (run_dir / "findings.ndjson").write_text(json.dumps(retired.to_dict()) + "\n", encoding="utf-8")
+    registry = SourceRegistry([MAIGRET])
+
+    result = reparse_run(run_dir, registry, {"output": {"runs_dir": str(tmp_path / "runs")}})
+
+    sources = [finding["source_id"] for finding in iter_ndjson(run_dir / "findings.ndjson")]
+    assert sources[-1] == "retired"
+    assert sources.count("maigret") == result["findings"] - 1 > 0
+    assert (run_dir / "report.md").exists()
+
+
+def test_cli_reparse_all_runs_in_a_process_pool(tmp_path: Path, fake_http):
+    fake_http.respond(Path("tests/fixtures/github.html").read_bytes())
+    config_path = tmp_path / "openfootprint.toml"
+    config_path.write_text(
+        "[sources]\nenabled = ['github']\n[rate_limit]\nmin_interval_seconds = 0\n[cache]\nenabled = false\n"
+        "[storage]\nbackend = 'both'\n",
+        encoding="utf-8",
+    )
+    runs_dir = tmp_path / "runs"
+    common = ["--config", str(config_path), "--output", str(runs_dir)]
+    for username in ("alice", "bob"):
+        assert main(["lookup", "--username", username, *common]) == 0
+    run_dirs = sorted(path.parent for path in runs_dir.glob("*/manifest.json"))
+    before = {path: (path / "findings.ndjson").read_text(encoding="utf-8") for path in run_dirs}
+    assert all(before.values())
+    for run_dir in run_dirs:
+        (run_dir / "findings.ndjson").write_text("", encoding="utf-8")
+        (run_dir / "report.json").unlink()
+    fake_http.offline = True
+
+    assert main(["reparse", "--all", "--workers", "2", *common]) == 0
+
+    for run_dir in run_dirs:
+        after = list(iter_ndjson(run_dir / "findings.ndjson"))
+        expected = [json.loads(line) for line in before[run_dir].splitlines()]
+        assert after
+        assert [finding["entity"]["profile_urls"] for finding in after] == [
+            finding["entity"]["profile_urls"] for finding in expected
+        ]
+        assert (run_dir / "report.json").exists()
+    database = RunDatabase(runs_dir / ".db" / "runs.sqlite", runs_dir=runs_dir)
+    assert database.get_run(run_dirs[0].name)["finding_count"] == len(expected)
+    database.close()
+    assert find_run_dir(runs_dir, run_dirs[1].name) == run_dirs[1]
+    assert main(["reparse", "20000101T000000Z-missing", *common]) == 1
@@ -1,4 +1,10 @@
-from openfootprint.policies.robots import RobotsPolicy
+import threading
+import time
+from pathlib import Path
+
+from openfootprint.core.fetcher import Fetcher
+from openfootprint.policies.rate_limit import RateLimiter
+from openfootprint.policies.robots import RobotsPolicy, RobotsResponse, RobotsStore
 
 
 def test_robots_disallow():
@@ -8,3 +14,91 @@ def test_robots_disallow():
         return "User-agent: *\nDisallow: /"
 
     assert policy.allows("https://example.com/private", "OpenFootprint", fetcher) is False
+
+
+def test_robots_caches_404_as_allow_and_5xx_as_disallow():
+    policy = RobotsPolicy()
+
+    def missing(_url):
+        return RobotsResponse(status_code=404, text="<html>not found</html>")
+
+    def broken(_url):
+        return RobotsResponse(status_code=503, text="")
+
+    assert policy.allows("https://a.example/x", "OpenFootprint", missing) is True
+    assert policy.allows("https://b.example/x", "OpenFootprint", broken) is False
+
+
+def test_robots_network_error_disallows_until_error_ttl():
+    clock = {"now": 0.0}
+    policy = RobotsPolicy(error_ttl_seconds=60, now=lambda: clock["now"])
+    calls = []
+
+    def flaky(_url):
+        calls.append(_url)
+        if len(calls) == 1:
+            raise OSError("connection reset")
+        return "User-agent: *\nAllow: /"
+
+    assert policy.allows("https://example.com/x", "OpenFootprint", flaky) is False
+    assert policy.allows("https://example.com/y", "OpenFootprint", flaky) is False
+    clock["now"] = 61.0
+    assert policy.allows("https://example.com/y", "OpenFootprint", flaky) is True
+    assert len(calls) == 2
+
+
+def test_robots_respects_max_age_and_persists_across_policies(tmp_path: Path):
+    clock = {"now": 0.0}
+    store = RobotsStore(tmp_path)
+    calls = []
+
+    def fetcher(_url):
+        calls.append(_url)
+        return RobotsResponse(status_code=200, text="User-agent: *\nDisallow: /private", headers={"Cache-Control": "max-age=30"})
+
+    first = RobotsPolicy(store=store, now=lambda: clock["now"])
+    assert first.allows("https://example.com/private", "OpenFootprint", fetcher) is False
+
+    second = RobotsPolicy(store=store, now=lambda: clock["now"])
+    assert second.allows("https://example.com/public", "OpenFootprint", fetcher) is True
+    assert len(calls) == 1
+
+    clock["now"] = 31.0
+    assert second.allows("https://example.com/public", "OpenFootprint", fetcher) is True
+    assert len(calls) == 2
+
+
+def test_robots_coalesces_concurrent_fetches():
+    policy = RobotsPolicy()
+    calls = []
+
+    def slow(_url):
+        calls.append(_url)
+        time.sleep(0.05)
+        return "User-agent: *\nAllow: /"
+
+    threads = [
+        threading.Thread(target=policy.allows, args=(f"https://example.com/{i}", "OpenFootprint", slow))
+        for i in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+
+
+def test_fetcher_sends_user_agent_to_robots_fetch():
+    seen = {}
+
+    def robots_fetcher(url, headers, timeout):
+        seen.update(url=url, headers=headers, timeout=timeout)
+        return "User-agent: *\nAllow: /"
+
+    def http_get(url, _headers, _timeout):
+        return type("R", (), {"status_code": 200, "content": b"", "headers": {}})()
+
+    limiter = RateLimiter(min_interval=0.0, now=lambda: 0.0, sleeper=lambda _s: None)
+    fetcher = Fetcher("UA/1", 10, RobotsPolicy(), limiter, http_get, robots_fetcher, robots_timeout_seconds=3)
+    fetcher.get("https://example.com/alice", "example")
+    assert seen == {"url": "https://example.com/robots.txt", "headers": {"User-Agent": "UA/1"}, "timeout": 3}
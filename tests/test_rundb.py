@@ -0,0 +1,74 @@
+import shutil
+from pathlib import Path
+
+from openfootprint.cli import main
+from openfootprint.core.inputs import LookupInputs
+from openfootprint.core.pipeline import run_lookup
+from openfootprint.core.reparse import reparse_run
+from openfootprint.storage.rundb import RunDatabase
+
+
+def _run(tmp_path: Path, registry, backend: str) -> dict:
+    config = {
+        "http": {"user_agent": "UA", "timeout_seconds": 1},
+        "rate_limit": {"min_interval_seconds": 0},
+        "output": {"runs_dir": str(tmp_path / "runs")},
+        "storage": {"backend": backend, "blobs": True, "blob_dir": str(tmp_path / "blobs")},
+    }
+    return run_lookup(LookupInputs.from_raw("alice", None, None, None), registry, config)
+
+
+def test_export_reproduces_file_layout(tmp_path: Path, fake_http, example_registry):
+    results = _run(tmp_path, example_registry(), "both")
+    run_dir = Path(results["paths"]["manifest"]).parent
+
+    database = RunDatabase(Path(results["paths"]["database"]), runs_dir=tmp_path / "runs")
+    exported = database.export_run(results["run_id"], tmp_path / "export")
+    database.close()
+
+    for name in ("manifest.json", "report.json", "report.md", "findings.ndjson", "raw/refs.jsonl"):
+        assert (exported / name).read_bytes() == (run_dir / name).read_bytes(), name
+
+    # The bodies come along, so the export reparses without the blob store it was recorded with.
+    shutil.rmtree(tmp_path / "blobs")
+    before = (exported / "findings.ndjson").read_text(encoding="utf-8")
+    reparse_run(exported, example_registry(), {"output": {"runs_dir": str(tmp_path / "export")}})
+    assert (exported / "findings.ndjson").read_text(encoding="utf-8") == before
+
+
+def test_imported_runs_get_their_entities_back(tmp_path: Path, fake_http, example_registry):
+    results = _run(tmp_path, example_registry(), "files")
+    run_dir = Path(results["paths"]["manifest"]).parent
+
+    database = RunDatabase(tmp_path / "runs.sqlite", runs_dir=tmp_path / "runs")
+    run_id = database.import_run_dir(run_dir)
+    assert [entity["entity_id"] for entity in database.get_run(run_id)["entities"]] == ["example:alice"]
+    database.close()
+
+
+def test_database_backend_skips_report_files_and_answers_queries(tmp_path: Path, fake_http, example_registry):
+    results = _run(tmp_path, example_registry(), "database")
+    run_dir = Path(results["paths"]["findings"]).parent
+    assert not (run_dir / "report.json").exists()
+
+    database = RunDatabase(Path(results["paths"]["database"]), runs_dir=tmp_path / "runs")
+    assert [run["run_id"] for run in database.list_runs(source_id="example")] == [results["run_id"]]
+    assert [run["run_id"] for run in database.list_runs(identifier="ALICE")] == [results["run_id"]]
+    assert database.list_runs(source_id="other") == []
+    assert database.list_runs(since="2999-01-01") == []
+    run = database.get_run(results["run_id"])
+    assert run["findings_by_source"] == {"example": 1}
+    assert run["entities"][0]["display_name"] == "Alice"
+    database.close()
+
+
+def test_runs_commands(tmp_path: Path, fake_http, example_registry, capsys):
+    results = _run(tmp_path, example_registry(), "both")
+    runs_dir = str(tmp_path / "runs")
+
+    assert main(["runs", "list", "--output", runs_dir]) == 0
+    assert results["run_id"] in capsys.readouterr().out
+    assert main(["runs", "show", results["run_id"], "--output", runs_dir]) == 0
+    assert "example\t1" in capsys.readouterr().out
+    assert main(["runs", "export", "--all", "--dest", str(tmp_path / "out"), "--output", runs_dir]) == 0
+    assert (tmp_path / "out" / results["run_id"] / "report.json").exists()
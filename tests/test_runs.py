@@ -8,3 +8,8 @@ def test_run_dir_and_raw_artifact(tmp_path: Path):
     raw_path = save_raw_artifact(run_dir, "https://example.com", b"hello")
     assert raw_path.exists()
     assert "raw" in raw_path.parts
+
+
+def test_run_ids_do_not_collide_within_a_second(tmp_path: Path):
+    names = {create_run_dir(tmp_path).run_dir.name for _ in range(50)}
+    assert len(names) == 50
@@ -1,4 +1,7 @@
-from openfootprint.core.schema import Evidence, Identifier
+import pickle
+from pathlib import Path
+
+from openfootprint.core.schema import Artifact, Entity, Evidence, Finding, Identifier
 
 
 def test_evidence_to_dict():
@@ -17,3 +20,57 @@ def test_evidence_to_dict():
 def test_identifier_to_dict():
     ident = Identifier(type="username", value="alice", evidence=[])
     assert ident.to_dict()["type"] == "username"
+
+
+def test_records_are_slotted_and_share_repeated_strings():
+    def evidence(site: str) -> Evidence:
+        return Evidence(
+            source_id="".join(["mai", "gret"]),  # noqa: FLY002 - built at runtime, so not the interned literal
+            request_url=f"https://{site}.example/alice",
+            raw_path=str(Path("raw") / "maigret.json"),
+            raw_hash="ab" * 32,
+            parser_id=f"{'maigret'}.json",
+            match_excerpt=site,
+            fetched_at="2026-01-14T00:00:00Z",
+        )
+
+    first, second = evidence("one"), evidence("two")
+    assert not hasattr(first, "__dict__")
+    for name in ("source_id", "raw_path", "parser_id", "fetched_at"):
+        assert getattr(first, name) is getattr(second, name)
+
+    finding = Finding(
+        source_id="maigret",
+        type="profile",
+        entity=Entity(
+            "maigret:alice:one", "alice", ["https://one.example/alice"], [Identifier("username", "alice", [first])], [first]
+        ),
+    )
+    assert not hasattr(finding, "__dict__")
+    assert not hasattr(finding.entity, "__dict__")
+    assert pickle.loads(pickle.dumps(finding)) == finding
+    assert finding.to_dict() == {
+        "source_id": "maigret",
+        "type": "profile",
+        "entity": {
+            "entity_id": "maigret:alice:one",
+            "display_name": "alice",
+            "profile_urls": ["https://one.example/alice"],
+            "identifiers": [{"type": "username", "value": "alice", "evidence": [first.to_dict()]}],
+            "evidence": [first.to_dict()],
+        },
+        "artifacts": [],
+        "confidence": "medium",
+    }
+
+
+def test_finding_round_trips_through_dict():
+    ev = Evidence("github", "https://github.com/alice", "raw/a.bin", "ab", "github.profile", None, "2026-01-14T00:00:00Z")
+    finding = Finding(
+        source_id="github",
+        type="profile",
+        entity=Entity("github:alice", "Alice", ["https://github.com/alice"], [Identifier("username", "alice", [ev])], [ev]),
+        artifacts=[Artifact("https://github.com/alice", "Alice", None, [ev])],
+        confidence="high",
+    )
+    assert Finding.from_dict(finding.to_dict()) == finding
@@ -0,0 +1,105 @@
+import json
+import threading
+import time
+from pathlib import Path
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+import pytest
+
+from openfootprint.service import JobManager, make_server
+
+
+@pytest.fixture
+def service(tmp_path: Path, fake_http, example_registry):
+    config = {
+        "http": {"user_agent": "UA", "timeout_seconds": 1},
+        "rate_limit": {"min_interval_seconds": 0},
+        "output": {"runs_dir": str(tmp_path)},
+    }
+    manager = JobManager(config, example_registry(), workers=2)
+    server = make_server(manager, "127.0.0.1", 0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    yield base, fake_http
+    server.shutdown()
+    server.server_close()
+    manager.close()
+
+
+def _post(url: str, payload: dict) -> dict:
+    request = Request(url, data=json.dumps(payload).encode("utf-8"), headers={"Content-Type": "application/json"})
+    with urlopen(request, timeout=5) as response:
+        return json.loads(response.read())
+
+
+def _get(url: str):
+    with urlopen(url, timeout=5) as response:
+        return response.status, response.read()
+
+
+def _wait(base: str, job_id: str) -> dict:
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        _status, body = _get(f"{base}/jobs/{job_id}")
+        job = json.loads(body)
+        if job["status"] in ("succeeded", "failed"):
+            return job
+        time.sleep(0.02)
+    raise AssertionError("job did not finish")
+
+
+def test_lookup_jobs_share_warm_state(service):
+    base, http = service
+    jobs = [_post(f"{base}/jobs/lookup", {"username": name}) for name in ("alice", "bob", "carol")]
+    finished = [_wait(base, job["job_id"]) for job in jobs]
+
+    assert [job["status"] for job in finished] == ["succeeded"] * 3
+    assert len({job["run_id"] for job in finished}) == 3
+    assert len(http.robots_requests) == 1
+
+    status, body = _get(f"{base}/jobs/{jobs[0]['job_id']}/result")
+    result = json.loads(body)
+    assert status == 200
+    assert result["entities"][0]["entity_id"] == "example:alice"
+
+    status, body = _get(f"{base}/jobs/{jobs[1]['job_id']}/findings?stream=1")
+    lines = [json.loads(line) for line in body.decode("utf-8").splitlines()]
+    assert [line["entity"]["entity_id"] for line in lines] == ["example:bob"]
+
+
+def test_findings_are_read_back_from_the_run_by_position(service, tmp_path: Path):
+    base, _http = service
+    job = _wait(base, _post(f"{base}/jobs/lookup", {"username": "alice"})["job_id"])
+    assert job["finding_count"] == 1
+
+    _status, body = _get(f"{base}/jobs/{job['job_id']}/findings")
+    page = json.loads(body)
+    assert [finding["entity"]["entity_id"] for finding in page["findings"]] == ["example:alice"]
+    assert page["next"] == 1 and page["done"] is True
+    # Served from the run's findings.ndjson, not from a copy the service keeps.
+    assert page["findings"][0] == json.loads((tmp_path / job["run_id"] / "findings.ndjson").read_text())
+    _status, body = _get(f"{base}/jobs/{job['job_id']}/findings?since=1")
+    assert json.loads(body) == {"findings": [], "next": 1, "done": True}
+
+    for since in ("abc", "-1"):
+        with pytest.raises(HTTPError) as bad:
+            _get(f"{base}/jobs/{job['job_id']}/findings?since={since}")
+        assert bad.value.code == 400
+
+
+def test_nameintel_job_and_bad_requests(service):
+    base, _http = service
+    job = _post(f"{base}/jobs/nameintel", {"first": "John", "last": "Doe", "dry_run": True})
+    finished = _wait(base, job["job_id"])
+    assert finished["status"] == "succeeded"
+    _status, body = _get(f"{base}/jobs/{job['job_id']}/result")
+    assert "john.doe" in json.loads(body)["payload"]["nameintel"]["permutations"]
+
+    with pytest.raises(HTTPError) as bad:
+        _post(f"{base}/jobs/lookup", {})
+    assert bad.value.code == 400
+    with pytest.raises(HTTPError) as missing:
+        _get(f"{base}/jobs/nope")
+    assert missing.value.code == 404
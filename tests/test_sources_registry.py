@@ -1,5 +1,6 @@
-from openfootprint.sources.base import Source, RequestSpec
-from openfootprint.sources.registry import SourceRegistry
+from openfootprint.sources.base import RequestSpec, Source
+from openfootprint.sources.manifest import BUILTIN_SOURCES, SourceSpec
+from openfootprint.sources.registry import SourceRegistry, default_registry
 
 
 def test_registry_filters_by_input():
@@ -52,3 +53,38 @@ def test_registry_filters_by_config():
 
     disabled_only = registry.filtered(enabled=[], disabled=["beta"])
     assert [source.source_id for source in disabled_only.sources] == ["alpha"]
+
+
+def test_manifest_matches_source_implementations():
+    registry = default_registry()
+    assert len({spec.source_id for spec in BUILTIN_SOURCES}) == len(BUILTIN_SOURCES)
+    for spec in BUILTIN_SOURCES:
+        source = registry.get(spec.source_id)
+        assert (source.source_id, source.name, source.category) == (spec.source_id, spec.name, spec.category)
+        assert set(source.supported_inputs) == set(spec.supported_inputs)
+
+
+def test_registry_loads_sources_on_first_use(monkeypatch):
+    loads = []
+    spec = SourceSpec("alpha", "Alpha", "developer", frozenset({"username"}), "example.module:SOURCE")
+    source = Source("alpha", "Alpha", "developer", {"username"}, lambda _inputs: [], lambda *_args: [])
+    monkeypatch.setattr(SourceSpec, "load", lambda self: loads.append(self.source_id) or source)
+    registry = SourceRegistry([spec]).filtered(enabled=["alpha"], disabled=[])
+    assert [entry.name for entry in registry.list_sources()] == ["Alpha"]
+    assert registry.for_inputs({"name"}) == []
+    assert loads == []
+    assert registry.get("alpha") is source
+    assert registry.for_inputs({"username"}) == [source]
+    assert loads == ["alpha"]
+
+
+def test_plugins_listed_in_config_join_the_registry(tmp_path, monkeypatch):
+    (tmp_path / "footprint_plugin.py").write_text(
+        "from openfootprint.sources.manifest import SourceSpec\n"
+        "SOURCES = [SourceSpec('extra', 'Extra', 'social', frozenset({'email'}), 'footprint_plugin_impl:SOURCE')]\n",
+        encoding="utf-8",
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    registry = default_registry({"plugins": ["footprint_plugin"]})
+    assert registry.entry("extra").category == "social"
+    assert registry.entry("github") is not None
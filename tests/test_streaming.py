@@ -0,0 +1,126 @@
+import json
+import threading
+from pathlib import Path
+
+import pytest
+
+from openfootprint.core import pipeline
+from openfootprint.core.inputs import LookupInputs
+from openfootprint.core.schema import Entity, Evidence, Finding, Identifier
+from openfootprint.reporting.json_report import (
+    COMPACT_FORMAT,
+    json_report_writer,
+    orjson,
+    render_json,
+    write_compact_json_report,
+    write_json_report,
+)
+from openfootprint.reporting.markdown_report import (
+    render_markdown,
+    write_markdown_report,
+)
+from openfootprint.sources.base import RequestSpec, Source
+from openfootprint.sources.registry import SourceRegistry
+from openfootprint.storage.runs import expand_compact_report, read_run_findings
+
+
+def _finding(source_id, display_name=None):
+    evidence = Evidence(
+        source_id=source_id,
+        request_url=f"https://{source_id}.example/alice",
+        raw_path="raw/x.bin",
+        raw_hash="abc",
+        parser_id=f"{source_id}.profile",
+        match_excerpt="Alice",
+        fetched_at="2026-01-14T00:00:00Z",
+    )
+    entity = Entity(
+        entity_id=f"{source_id}:alice",
+        display_name=display_name,
+        profile_urls=[evidence.request_url],
+        identifiers=[Identifier("username", "alice", [evidence])],
+        evidence=[evidence],
+    )
+    return Finding(source_id=source_id, type="profile", entity=entity)
+
+
+def test_streaming_reports_match_in_memory_renderers(tmp_path: Path):
+    for findings in ([], [_finding("github", "Alice")], [_finding("github"), _finding("gitlab", "A")]):
+        for sources in ([], ["github", "gitlab"]):
+            json_path = write_json_report(tmp_path / "r.json", (f.to_dict() for f in findings), sources, "run-1")
+            md_path = write_markdown_report(tmp_path / "r.md", (f.to_dict() for f in findings), sources, "run-1")
+            assert json_path.read_text(encoding="utf-8") == render_json(findings, sources, "run-1")
+            assert md_path.read_text(encoding="utf-8") == render_markdown(findings, sources, "run-1")
+
+
+def test_stream_lookup_yields_before_later_sources_finish(tmp_path: Path, fake_http):
+    release_tool = threading.Event()
+
+    def make_source(source_id, transport="http"):
+        def build(_inputs):
+            return [RequestSpec(url=f"https://{source_id}.example/alice", input_type="username", transport=transport)]
+
+        def parse(_result, _inputs, _raw):
+            return [_finding(source_id)]
+
+        def execute(_request, _inputs, _run_paths, _config, _runner):
+            assert release_tool.wait(5)
+            return [_finding(source_id)]
+
+        return Source(
+            source_id=source_id,
+            name=source_id,
+            category="developer",
+            supported_inputs={"username"},
+            build_requests=build,
+            parse=parse,
+            execute=execute if transport == "tool" else None,
+        )
+
+    registry = SourceRegistry([make_source("github"), make_source("tool", transport="tool")])
+    config = {
+        "http": {"user_agent": "UA", "timeout_seconds": 1},
+        "rate_limit": {"min_interval_seconds": 0},
+        "output": {"runs_dir": str(tmp_path)},
+    }
+    stream = pipeline.stream_lookup(LookupInputs.from_raw("alice", None, None, None), registry, config)
+    iterator = iter(stream)
+    first = next(iterator)
+    assert first.source_id == "github"
+    lines = stream.findings_path.read_text(encoding="utf-8").splitlines()
+    assert json.loads(lines[0])["source_id"] == "github"
+
+    release_tool.set()
+    rest = list(iterator)
+    assert [finding.source_id for finding in rest] == ["tool"]
+    assert stream.finding_count == 2
+    report = json.loads(Path(stream.paths["report_json"]).read_text(encoding="utf-8"))
+    assert [item["source_id"] for item in report["findings"]] == ["github", "tool"]
+
+
+def test_compact_report_writes_each_evidence_record_once(tmp_path: Path):
+    findings = [_finding("github", "Alice"), _finding("gitlab"), _finding("github", "Alice")]
+    dicts = [finding.to_dict() for finding in findings]
+    outputs = {}
+    for backend in ("json", "orjson") if orjson is not None else ("json",):
+        for indent in (None, 2):
+            path = write_compact_json_report(tmp_path / "c.json", iter(dicts), ["github"], "run-1", indent, backend)
+            outputs[(backend, indent)] = path.read_bytes()
+            payload = json.loads(outputs[(backend, indent)])
+            assert len(payload["evidence"]) == 2
+            assert payload["findings"][0]["entity"]["evidence"] == [0]
+            assert expand_compact_report(payload) == json.loads(render_json(findings, ["github"], "run-1"))
+    # Both backends produce the same bytes, so switching backend never changes a report.
+    assert len({data for (_backend, indent), data in outputs.items() if indent is None}) == 1
+    assert len({data for (_backend, indent), data in outputs.items() if indent == 2}) == 1
+    assert b"\n" not in outputs[("json", None)]
+
+
+def test_json_report_writer_follows_config(tmp_path: Path):
+    assert json_report_writer({}) is write_json_report
+    writer = json_report_writer({"reporting": {"json_format": "compact", "json_indent": 0}})
+    path = writer(tmp_path / "report.json", [_finding("github").to_dict()], ["github"], "run-1")
+    assert json.loads(path.read_text(encoding="utf-8"))["format"] == COMPACT_FORMAT
+    assert list(read_run_findings(tmp_path)) == [_finding("github").to_dict()]
+    with pytest.raises(ValueError):
+        json_report_writer({"reporting": {"json_format": "yaml"}})
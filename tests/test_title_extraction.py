@@ -0,0 +1,74 @@
+from pathlib import Path
+
+import pytest
+
+from openfootprint.sources import parsers
+from openfootprint.sources.parsers import TITLE_BACKENDS, extract_title, scan_head_title
+
+FIXTURES = Path(__file__).parent / "fixtures"
+PAGES = sorted((FIXTURES / "pages").glob("*.html")) + [FIXTURES / "github.html", FIXTURES / "reddit.html"]
+
+TRICKY = [
+    "<html><head><title>Alice</title></head></html>",
+    "<html><head><title>   </title></head></html>",
+    "<html><head><title></title></head></html>",
+    "<html><head><title>a &foo; b</title></head></html>",
+    "<html><head><title>a &amp b</title></head></html>",
+    "<html><head><title>&#128; &#99999999; &#x27;</title></head></html>",
+    "<html><head><title>a & b &nbsp;</title></head></html>",
+    "<html><head><title>a <b>bold</b> c</title></head></html>",
+    "<html><head><title/><title>second</title></head></html>",
+    "<html><head><script>var t = '</head>';</script><title>late</title></head></html>",
+    "<html><head><meta content='<title>fake</title>'><title>real</title></head></html>",
+    "<html><head><meta content=\"unbalanced><title>x</title></head></html>",
+    "<html><head><textarea><title>no</title></textarea><title>yes</title></head></html>",
+    "<html><head><title>unterminated</head><body></body></html>",
+    "<html><head></head><body><title>in body</title></body></html>",
+    "<html><head><TITLE lang=\"en\">Upper</TITLE ></head></html>",
+    "<html><head><script></script ><style>p{}</style><title>after raw</title></head></html>",
+    "<html><head><? xml ?><!DOCTYPE html><title>pi</title></head></html>",
+    "<html><head><!-- <title>hidden</title> --><title>shown</title></head></html>",
+    "<html><head><!-- a -- b --><title>dashes</title></head></html>",
+    "<html><head><!--><title>odd</title>--></head></html>",
+    "plain text, no markup",
+    "",
+]
+
+
+@pytest.mark.parametrize("path", PAGES, ids=lambda path: path.name)
+def test_fast_path_matches_beautifulsoup_on_saved_pages(path: Path):
+    raw = path.read_bytes()
+    assert extract_title(raw) == TITLE_BACKENDS["bs4"](raw)
+    assert extract_title(raw.decode("utf-8")) == TITLE_BACKENDS["bs4"](raw)
+
+
+@pytest.mark.parametrize("html", TRICKY)
+def test_fast_path_matches_beautifulsoup_on_tricky_documents(html: str):
+    assert extract_title(html) == TITLE_BACKENDS["bs4"](html)
+    assert extract_title(html.encode("utf-8")) == TITLE_BACKENDS["bs4"](html)
+
+
+@pytest.mark.parametrize(
+    "backend",
+    ["bs4", pytest.param("selectolax", marks=pytest.mark.skipif(parsers._LexborParser is None, reason="needs selectolax"))],
+)
+def test_full_parsers_agree_on_empty_titles(backend: str):
+    # No </head>, so the scanner defers to the full parser.
+    assert TITLE_BACKENDS[backend]("<html><body><title>   </title></body></html>") == ""
+    assert TITLE_BACKENDS[backend]("<html><body><title></title></body></html>") is None
+    assert TITLE_BACKENDS[backend]("<html><body><title> Alice </title></body></html>") == "Alice"
+
+
+def test_scanner_handles_common_profile_pages_without_full_parse():
+    for name in ("github_profile.html", "reddit_profile.html", "gitlab_profile.html", "mastodon_profile.html"):
+        assert scan_head_title((FIXTURES / "pages" / name).read_bytes())
+
+
+def test_scanner_does_not_read_past_head():
+    html = b"<html><head><title>Alice</title></head><body>" + b"<p" * 10000 + b"\xff\xfe"
+    assert scan_head_title(html) == "Alice"
+
+
+def test_set_title_backend_rejects_unknown_names():
+    with pytest.raises(ValueError):
+        parsers.set_title_backend("nope")
@@ -0,0 +1,58 @@
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from openfootprint.core.transport import (
+    HttpTransport,
+    reset_shared_transport,
+    shared_transport,
+)
+
+
+def test_transport_mounts_pooled_adapters():
+    transport = HttpTransport(pool_connections=4, pool_maxsize=3)
+    adapter = transport.session.get_adapter("https://example.com")
+    assert adapter is transport.session.get_adapter("http://example.com")
+    assert adapter._pool_connections == 4
+    assert adapter._pool_maxsize == 3
+    transport.close()
+
+
+def test_shared_transport_is_reused():
+    reset_shared_transport()
+    first = shared_transport({"pool_maxsize": 5})
+    assert shared_transport() is first
+    assert first.pool_maxsize == 5
+    reset_shared_transport()
+    assert shared_transport() is not first
+    reset_shared_transport()
+
+
+def test_transport_does_not_carry_cookies_between_requests():
+    seen = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            seen.append(self.headers.get("Cookie"))
+            self.send_response(200)
+            self.send_header("Set-Cookie", "session=alice; Path=/")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, _format, *_args):
+            return
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    transport = HttpTransport()
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/"
+        for _attempt in range(2):
+            transport.get(url, timeout=5).close()
+    finally:
+        transport.close()
+        server.shutdown()
+        server.server_close()
+
+    assert seen == [None, None]
+    assert not transport.session.cookies
@@ -1,8 +1,19 @@
+import json
+import threading
+import time
 from pathlib import Path
 
 import requests
 
-from openfootprint.tools.whatsmyname_runner import check_site, evaluate_match, run
+from openfootprint.core.transport import HttpTransport
+from openfootprint.sources.tools.whatsmyname import parse_whatsmyname_report
+from openfootprint.tools.whatsmyname_runner import (
+    check_compiled_site,
+    check_site,
+    evaluate_match,
+    run,
+)
+from openfootprint.tools.wmn_index import compile_site
 
 
 def test_evaluate_match_prefers_match_code():
@@ -15,12 +26,26 @@ def test_check_site_returns_none_on_request_error(monkeypatch):
     def boom(*_args, **_kwargs):
         raise requests.RequestException("network down")
 
-    monkeypatch.setattr(requests, "get", boom)
+    monkeypatch.setattr(HttpTransport, "get", boom)
 
     site = {"uri_check": "https://example.com/{account}"}
     assert check_site(site, "alice", 1) is None
 
 
+def test_check_site_uses_given_transport():
+    calls = []
+
+    class FakeTransport:
+        def get(self, url, headers=None, timeout=None, **kwargs):
+            calls.append(url)
+            return type("R", (), {"status_code": 200, "text": "", "content": b""})()
+
+    site = {"uri_check": "https://example.com/{account}", "m_code": 200}
+    item = check_site(site, "alice", 1, FakeTransport())
+    assert item and item["status_code"] == 200
+    assert calls == ["https://example.com/alice"]
+
+
 def test_run_creates_parent_dir(tmp_path: Path):
     data_path = tmp_path / "data.json"
     data_path.write_text("{\"sites\": []}", encoding="utf-8")
@@ -29,3 +54,151 @@ def test_run_creates_parent_dir(tmp_path: Path):
     run(data_path, "alice", output_path, 1)
 
     assert output_path.exists()
+
+
+class _SlowTransport:
+    def __init__(self, delays):
+        self.delays = delays
+        self.active = {}
+        self.peak = {}
+        self.lock = threading.Lock()
+
+    def get(self, url, headers=None, timeout=None, **kwargs):
+        host = url.split("/")[2]
+        with self.lock:
+            self.active[host] = self.active.get(host, 0) + 1
+            self.peak[host] = max(self.peak.get(host, 0), self.active[host])
+        time.sleep(self.delays.get(host, 0.05))
+        with self.lock:
+            self.active[host] -= 1
+        return type("R", (), {"status_code": 200, "text": "", "content": b""})()
+
+
+def _write_sites(path: Path, hosts):
+    sites = [{"name": f"site{i}", "uri_check": f"https://{host}/{{account}}", "m_code": 200} for i, host in enumerate(hosts)]
+    path.write_text(json.dumps({"sites": sites}), encoding="utf-8")
+
+
+def test_run_checks_sites_concurrently_with_domain_caps(tmp_path: Path):
+    data_path = tmp_path / "data.json"
+    _write_sites(data_path, ["a.example"] * 4 + [f"h{i}.example" for i in range(8)])
+    transport = _SlowTransport({})
+    output_path = tmp_path / "report.json"
+    jsonl_path = tmp_path / "matches.jsonl"
+
+    started = time.monotonic()
+    run(data_path, "alice", output_path, 1, transport=transport, workers=16, per_domain=1, jsonl_path=jsonl_path)
+    elapsed = time.monotonic() - started
+
+    assert elapsed < 12 * 0.05
+    assert transport.peak["a.example"] == 1
+    report = json.loads(output_path.read_text(encoding="utf-8"))
+    assert [item["site_name"] for item in report["results"]] == [f"site{i}" for i in range(12)]
+    assert "partial" not in report
+    assert len(jsonl_path.read_text(encoding="utf-8").splitlines()) == 12
+
+
+def test_run_writes_partial_results_at_deadline(tmp_path: Path):
+    data_path = tmp_path / "data.json"
+    _write_sites(data_path, ["fast.example", "slow.example"])
+    transport = _SlowTransport({"fast.example": 0.0, "slow.example": 1.0})
+    output_path = tmp_path / "report.json"
+
+    run(data_path, "alice", output_path, 1, transport=transport, workers=2, deadline=0.3)
+
+    report = json.loads(output_path.read_text(encoding="utf-8"))
+    assert report["partial"] is True
+    assert [item["site_name"] for item in report["results"]] == ["site0"]
+    assert parse_whatsmyname_report(output_path, "alice", "whatsmyname")
+
+
+class _TimeoutTransport:
+    def __init__(self, delay):
+        self.delay = delay
+        self.timeouts = []
+
+    def get(self, url, headers=None, timeout=None, **kwargs):
+        # Like a socket read, give up once the request's own timeout runs out.
+        self.timeouts.append(timeout)
+        time.sleep(min(self.delay, timeout))
+        raise requests.Timeout(url)
+
+
+def test_run_caps_in_flight_checks_to_the_deadline(tmp_path: Path):
+    data_path = tmp_path / "data.json"
+    _write_sites(data_path, [f"h{i}.example" for i in range(4)])
+    transport = _TimeoutTransport(delay=5.0)
+
+    started = time.monotonic()
+    run(data_path, "alice", tmp_path / "report.json", 15, transport=transport, workers=4, deadline=0.2)
+    # Workers are joined at interpreter exit, so they must not outlive the deadline by much either.
+    while any(thread.name.startswith("wmn-check") for thread in threading.enumerate()):
+        assert time.monotonic() - started < 2
+        time.sleep(0.01)
+
+    assert transport.timeouts and all(timeout <= 0.2 for timeout in transport.timeouts)
+
+
+class _ChunkedResponse:
+    def __init__(self, status_code, chunks):
+        self.status_code = status_code
+        self.chunks = chunks
+        self.served = 0
+        self.closed = False
+
+    def iter_content(self, chunk_size=None):
+        for chunk in self.chunks:
+            self.served += 1
+            yield chunk
+
+    def close(self):
+        self.closed = True
+
+
+class _ChunkedTransport:
+    def __init__(self, response):
+        self.response = response
+        self.kwargs = None
+
+    def get(self, url, headers=None, timeout=None, **kwargs):
+        self.kwargs = kwargs
+        return self.response
+
+
+def test_check_compiled_site_decides_on_status_without_reading_body():
+    site = compile_site(0, {"uri_check": "https://a.example/{account}", "m_code": 200, "e_code": 404})
+    response = _ChunkedResponse(200, [b"x" * 10])
+    transport = _ChunkedTransport(response)
+
+    result = check_compiled_site(site, "alice", 1, transport)
+
+    assert result["matched"] is True
+    assert transport.kwargs == {"stream": True}
+    assert response.served == 0
+    assert response.closed
+
+
+def test_check_compiled_site_stops_at_marker_split_across_chunks():
+    site = compile_site(0, {"uri_check": "https://a.example/{account}", "m_string": "profile-card"})
+    response = _ChunkedResponse(200, [b"<html>profile-", b"card</html>", b"never read"])
+
+    assert check_compiled_site(site, "alice", 1, _ChunkedTransport(response))["matched"] is True
+    assert response.served == 2
+
+
+def test_check_compiled_site_honours_byte_cap():
+    site = compile_site(0, {"uri_check": "https://a.example/{account}", "m_string": "found"})
+    response = _ChunkedResponse(200, [b"a" * 8, b"found", b"more"])
+
+    assert check_compiled_site(site, "alice", 1, _ChunkedTransport(response), max_bytes=8) is None
+    assert response.served == 1
+    assert response.closed
+
+
+def test_check_compiled_site_keeps_match_string_precedence_over_error_code():
+    site = compile_site(
+        0, {"uri_check": "https://a.example/{account}", "m_string": "found", "e_code": 404, "e_string": "missing"}
+    )
+    response = _ChunkedResponse(404, [b"missing", b" but found"])
+
+    assert check_compiled_site(site, "alice", 1, _ChunkedTransport(response)) is not None
@@ -0,0 +1,141 @@
+import json
+import os
+import time
+from pathlib import Path
+
+from openfootprint.tools import wmn_index
+from openfootprint.tools.whatsmyname_runner import evaluate_match, match_streaming
+from openfootprint.tools.wmn_index import compile_site, load_site_index
+
+DATA = {
+    "sites": [
+        {"name": "Alpha", "cat": "coding", "uri_check": "https://alpha.example/u/{account}", "m_code": 200},
+        {"name": "NoCheck", "cat": "coding"},
+        {
+            "name": "Beta",
+            "cat": "social",
+            "uri_check": "https://api.beta.example/lookup",
+            "uri_pretty": "https://beta.example/{account}",
+            "post_body": '{"user": "{account}"}',
+            "m_string": "\"found\": true",
+            "e_string": "not found",
+        },
+        {"name": "Gamma", "cat": "Social", "uri_check": "https://alpha.example/g/{account}/x", "e_code": 404},
+    ]
+}
+
+
+def _write(tmp_path: Path, payload=DATA) -> Path:
+    path = tmp_path / "wmn-data.json"
+    path.write_text(json.dumps(payload), encoding="utf-8")
+    return path
+
+
+def test_compile_site_pre_splits_templates():
+    site = compile_site(0, DATA["sites"][2])
+    assert site.url("alice") == "https://api.beta.example/lookup"
+    assert site.pretty_url("alice") == "https://beta.example/alice"
+    assert site.post_body("alice") == '{"user": "alice"}'
+    assert site.host == "api.beta.example"
+    assert site.m_string == b'"found": true'
+
+
+def test_index_groups_and_filters(tmp_path: Path):
+    index = load_site_index(_write(tmp_path))
+    assert [site.name for site in index.sites] == ["Alpha", "Beta", "Gamma"]
+    assert index.by_host["alpha.example"] == [0, 2]
+    assert [site.name for site in index.select(categories=["social"])] == ["Beta", "Gamma"]
+    assert [site.name for site in index.select(sites=["alpha"])] == ["Alpha"]
+    assert [site.name for site in index.select(categories=["coding"], sites=["gamma"])] == ["Alpha", "Gamma"]
+
+
+def test_index_is_cached_on_disk_by_size_and_mtime(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(wmn_index, "_memory", {})
+    data_path = _write(tmp_path)
+    cache_dir = tmp_path / "cache"
+    first = load_site_index(data_path, cache_dir)
+    cached_files = list(cache_dir.glob("wmn-index-*.marshal"))
+    assert len(cached_files) == 1 and first.digest[:24] in cached_files[0].name
+
+    monkeypatch.setattr(wmn_index, "_memory", {})
+    monkeypatch.setattr(wmn_index, "compile_index", lambda *_args: (_ for _ in ()).throw(AssertionError("recompiled")))
+    monkeypatch.setattr(Path, "read_bytes", _refuse_data_reads(data_path))
+    second = load_site_index(data_path, cache_dir)
+    assert second.sites == first.sites
+    assert second.by_host == first.by_host
+    monkeypatch.undo()
+
+    # A rewritten data file gets a new mtime (and here a new size) and is compiled again.
+    monkeypatch.setattr(wmn_index, "_memory", {})
+    payload = {"sites": DATA["sites"][:1]}
+    _write(tmp_path, payload)
+    os.utime(data_path, ns=(time.time_ns(), time.time_ns() + 1_000_000_000))
+    rewritten = load_site_index(data_path, cache_dir)
+    assert [site.name for site in rewritten.sites] == ["Alpha"]
+    # The index of the old data file is dropped, so the cache does not grow with every update.
+    assert [path.name for path in cache_dir.glob("wmn-index-*.marshal")] == [
+        f"wmn-index-v{wmn_index.INDEX_VERSION}-{rewritten.digest[:24]}.marshal"
+    ]
+
+
+def _refuse_data_reads(data_path: Path):
+    read_bytes = Path.read_bytes
+
+    def guarded(path):
+        if path == data_path:
+            raise AssertionError("warm start read the data file")
+        return read_bytes(path)
+
+    return guarded
+
+
+def test_warm_index_loads_faster_than_parsing_the_data_file(tmp_path: Path, monkeypatch):
+    sites = [
+        {
+            "name": f"Site{i}",
+            "cat": "social",
+            "uri_check": f"https://host{i}.example/api/users/{{account}}?format=json",
+            "uri_pretty": f"https://host{i}.example/{{account}}",
+            "e_code": 404,
+            "e_string": "This page does not exist",
+            "m_string": "profile-header",
+            "headers": {"Accept": "application/json"},
+        }
+        for i in range(3000)
+    ]
+    data_path = _write(tmp_path, {"sites": sites})
+    cache_dir = tmp_path / "cache"
+    load_site_index(data_path, cache_dir)
+
+    def best(func) -> float:
+        timings = []
+        for _attempt in range(5):
+            monkeypatch.setattr(wmn_index, "_memory", {})
+            started = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
+
+    warm = best(lambda: load_site_index(data_path, cache_dir))
+    parsed = best(lambda: wmn_index.compile_index(data_path.read_bytes(), ""))
+    assert warm < parsed / 2
+
+
+class _Body:
+    def __init__(self, body: bytes) -> None:
+        self.body = body
+
+    def iter_content(self, chunk_size=None):
+        # Three-byte chunks split every marker in DATA across reads.
+        return (self.body[start : start + 3] for start in range(0, len(self.body), 3))
+
+
+def test_match_streaming_agrees_with_evaluate_match():
+    for raw in DATA["sites"]:
+        if not raw.get("uri_check"):
+            continue
+        site = compile_site(0, raw)
+        for status in (200, 404, 500):
+            for body in ("", '{"found": true}', "user not found", 'not found, then "found": true'):
+                streamed = match_streaming(site, status, _Body(body.encode("utf-8")))
+                assert streamed == evaluate_match(raw, status, body)